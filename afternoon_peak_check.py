@@ -1,13 +1,13 @@
 #!/usr/bin/env python
 """Wrapper script for 14:00 afternoon peak-window boost decision."""
 
-import asyncio
 import os
 import sys
 import traceback
 from datetime import datetime
 
 from src.app_afternoon_peak_check import main
+from src.utils import run_async
 
 # Add project root to path
 project_root = os.path.dirname(os.path.abspath(__file__))
@@ -15,7 +15,7 @@ sys.path.insert(0, project_root)
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        run_async(main())
     except Exception as e:
         with open("logs/afternoon-peak-check-fatal.log", "a") as f:
             f.write(f"{datetime.now()}\n")
@@ -4,14 +4,22 @@ spa_api_probe.py
 
 Standalone probe for SPA3000TL BL inverter via GrowattServer legacy API.
 Logs in, discovers plant_id and device_sn, then calls a suite of test functions.
+
+The discovered IDs and session cookies are cached in ~/.cache/growatt-probe.json
+for an hour so repeated probes skip the login/plant discovery round-trips.
 """
 
+import json
 import logging
 import os
 import random
 import string
+import time
+
+import requests
 
-import growattServer
+CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "growatt-probe.json")
+CACHE_TTL_SECONDS = 3600
 
 
 def setup_logger():
@@ -56,33 +64,94 @@ def test_look_for_spa_system_status(api, device_sn, plant_id, logger):
         logger.error(f"SPA/AC system status test failed: {e}")
 
 
-def main():
-    logger = setup_logger()
+def load_discovery_cache(api, username, logger):
+    """
+    Restore a fresh discovery result and session cookies from disk.
 
-    # credentials from env
-    username = os.getenv("GROWATT_USERNAME")
-    password = os.getenv("GROWATT_PASSWORD")
-    if not username or not password:
-        logger.error("Please set GROWATT_USERNAME & GROWATT_PASSWORD")
-        return
+    Returns:
+        (plant_id, device_sn) tuple, or None if there is no usable cache entry
+    """
+    try:
+        with open(CACHE_FILE, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
 
-    # random UA just like your main script
-    rand_id = "".join(
-        random.choices(string.ascii_uppercase + string.digits, k=random.randint(10, 50))
-    )
-    api = growattServer.GrowattApi(agent_identifier=rand_id)
-    api.server_url = "https://server.growatt.com/"
+    if cache.get("username") != username or time.time() - cache.get("ts", 0) > CACHE_TTL_SECONDS:
+        return None
+
+    plant_id, device_sn = cache.get("plant_id"), cache.get("device_sn")
+    if not plant_id or not device_sn:
+        return None
+
+    api.session.cookies = requests.utils.cookiejar_from_dict(cache.get("cookies", {}))
+    logger.info(f"Using cached discovery from {CACHE_FILE}")
+    return plant_id, device_sn
+
+
+def clear_discovery_cache(api):
+    """Forget the cached discovery and drop its cookies from the session."""
+    api.session.cookies.clear()
+    try:
+        os.remove(CACHE_FILE)
+    except FileNotFoundError:
+        pass
+
+
+def session_accepted(api, plant_id, logger):
+    """
+    Check that restored session cookies are still accepted.
+
+    An expired Growatt session answers with a login page (or 401) rather than JSON.
+    """
+    try:
+        response = api.session.get(
+            api.get_url("newTwoPlantAPI.do"),
+            params={"op": "getAllDeviceListTwo", "plantId": plant_id, "pageNum": 1, "pageSize": 1},
+        )
+        response.raise_for_status()
+        response.json()
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.info(f"Cached session rejected ({e}), logging in again")
+        return False
+    return True
+
+
+def save_discovery_cache(api, username, plant_id, device_sn, logger):
+    """Persist discovered IDs and session cookies (owner-readable only)."""
+    cache = {
+        "ts": time.time(),
+        "username": username,
+        "plant_id": plant_id,
+        "device_sn": device_sn,
+        "cookies": requests.utils.dict_from_cookiejar(api.session.cookies),
+    }
+    try:
+        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+        fd = os.open(CACHE_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+    except OSError as e:
+        logger.warning(f"Could not write discovery cache: {e}")
 
+
+def discover(api, username, password, logger):
+    """
+    Log in and discover the first plant and storage device.
+
+    Returns:
+        (plant_id, device_sn) tuple, or None if discovery failed
+    """
     logger.info("Logging in to Growatt")
     try:
         login_resp = api.login(username, password)
     except Exception as e:
         logger.error(f"Login failed outright: {e}")
-        return
+        return None
 
     if not login_resp.get("success"):
         logger.error(f"Login rejected: {login_resp}")
-        return
+        return None
 
     user_id = login_resp["user"]["id"]
 
@@ -90,7 +159,7 @@ def main():
     plants = api.plant_list(user_id)
     if not plants.get("data"):
         logger.error(f"No plants found for user {user_id}: {plants}")
-        return
+        return None
     plant_id = plants["data"][0]["plantId"]
     logger.info(f"Found Plant ID: {plant_id}")
 
@@ -99,10 +168,45 @@ def main():
     storage_list = plant_info.get("storageList") or []
     if not storage_list:
         logger.error(f"No storage devices in plant {plant_id}: {plant_info}")
-        return
+        return None
     device_sn = storage_list[0]["deviceSn"]
     logger.info(f"Found Device SN: {device_sn}")
 
+    save_discovery_cache(api, username, plant_id, device_sn, logger)
+    return plant_id, device_sn
+
+
+def main():
+    logger = setup_logger()
+
+    # credentials from env
+    username = os.getenv("GROWATT_USERNAME")
+    password = os.getenv("GROWATT_PASSWORD")
+    if not username or not password:
+        logger.error("Please set GROWATT_USERNAME & GROWATT_PASSWORD")
+        return
+
+    # Imported here so the module can be loaded (e.g. for the cache helpers)
+    # without pulling in the Growatt client
+    import growattServer
+
+    # random UA just like your main script
+    rand_id = "".join(
+        random.choices(string.ascii_uppercase + string.digits, k=random.randint(10, 50))
+    )
+    api = growattServer.GrowattApi(agent_identifier=rand_id)
+    api.server_url = "https://server.growatt.com/"
+
+    discovered = load_discovery_cache(api, username, logger)
+    if discovered and not session_accepted(api, discovered[0], logger):
+        clear_discovery_cache(api)
+        discovered = None
+    if not discovered:
+        discovered = discover(api, username, password, logger)
+    if not discovered:
+        return
+    plant_id, device_sn = discovered
+
     # Run the probe tests
     test_look_for_spa_system_status(api, device_sn, plant_id, logger)
 
@@ -1,3 +1,12 @@
+"""
+Sunset probe: log today's SOC and generation, then push tomorrow's charge schedule.
+
+Not runnable in this tree. It imports compute_scaled_soc and get_forecast_for_date
+from modules.forecast and get_sunset_time/update_sunset_job from modules.sunset, and
+none of them exist, so the import fails. Its log_run_to_csv call also predates the
+current signature.
+"""
+
 from datetime import datetime, timedelta
 
 from modules.forecast import compute_scaled_soc, get_forecast_for_date
@@ -314,11 +314,9 @@ class InverterStatusChecker:
     ) -> None:
         """Append a status record to output/inverter_status_checks.csv."""
         csv_path = os.path.join(self.output_dir, "inverter_status_checks.csv")
-        file_exists = os.path.isfile(csv_path)
-
         with open(csv_path, mode="a", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
-            if not file_exists:
+            if f.tell() == 0:
                 writer.writerow(
                     [
                         "Check Time",
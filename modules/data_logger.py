@@ -1,14 +1,84 @@
 """Enhanced data logging for forecast accuracy tracking and optimization."""
 
+import atexit
 import csv
 import os
+import queue
+import threading
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+
+class _UnsortedHistoryError(Exception):
+    """Raised when a history CSV is found not to be in date order."""
 
 
 class DataLogger:
     """Handles CSV logging of predictions, actuals, and performance metrics."""
 
+    # Column headers for predictions.csv
+    PREDICTIONS_HEADER = (
+        "Prediction Date",
+        "Logged At",
+        "Forecast (Wh)",
+        "Forecast (kWh)",
+        "Solar Coverage (%)",
+        "Current SOC (%)",
+        "Target SOC (%)",
+        "Expected SOC Increase (%)",
+        "Charge Rate Set (%)",
+        "Off-Peak Window",
+        "Battery Capacity (Wh)",
+        "Avg Load (W)",
+        "Daily Consumption (Wh)",
+        "Provider Used",
+        "Alternative Forecasts",
+    )
+
+    # Column headers for actuals.csv
+    ACTUALS_HEADER = (
+        "Date",
+        "Logged At",
+        "Actual Generation (Wh)",
+        "Actual Generation (kWh)",
+        "SOC at Evening (%)",
+        "SOC at Morning (%)",
+        "Actual SOC Increase (%)",
+        "Charge Energy (Wh)",
+        "Charge Energy (kWh)",
+        "Notes",
+    )
+
+    # Column headers for provider_comparison.csv
+    PROVIDER_COMPARISON_HEADER = (
+        "Date",
+        "Logged At",
+        "Primary Provider",
+        "Primary Forecast (kWh)",
+        "Solcast Forecast (kWh)",
+        "ForecastSolar Forecast (kWh)",
+        "Variance (kWh)",
+        "Variance (%)",
+    )
+
+    # Column headers for performance_summary.csv
+    SUMMARY_HEADER = (
+        "Date",
+        "Forecast (kWh)",
+        "Actual (kWh)",
+        "Accuracy (%)",
+        "Error (kWh)",
+        "Solar Coverage Predicted (%)",
+        "Target SOC (%)",
+        "Expected SOC Increase (%)",
+        "Actual SOC Increase (%)",
+        "Charge Rate Set (%)",
+        "Charge Energy (kWh)",
+        "Charge Efficiency (%)",
+        "SOC at Evening (%)",
+        "Performance",
+    )
+
     def __init__(self, output_dir: str = "output"):
         """
         Initialize the data logger.
@@ -23,6 +93,141 @@ class DataLogger:
         self.actuals_file = os.path.join(output_dir, "actuals.csv")
         self.summary_file = os.path.join(output_dir, "performance_summary.csv")
         self.provider_comparison_file = os.path.join(output_dir, "provider_comparison.csv")
+        self._headers: Dict[str, Tuple[str, ...]] = {
+            self.predictions_file: self.PREDICTIONS_HEADER,
+            self.actuals_file: self.ACTUALS_HEADER,
+            self.provider_comparison_file: self.PROVIDER_COMPARISON_HEADER,
+        }
+
+        # Long-lived append handles, opened lazily on first write so that log
+        # maintenance can still rewrite the files after construction. Only the
+        # background writer thread touches them while it is running.
+        self._handles: Dict[str, IO[str]] = {}
+        self._writers: Dict[str, Any] = {}
+
+        # Rows are queued and written by a background thread so callers don't
+        # wait on disk I/O; started on the first write
+        self._queue: "queue.Queue[Tuple[str, Any, Any]]" = queue.Queue()
+        self._writer_thread: Optional[threading.Thread] = None
+        self._writer_error: Optional[BaseException] = None
+
+        # History files are appended in date order; the summary streams them
+        # and only falls back to sorting if a file turns out to be unordered
+        self.assume_sorted = True
+
+    def __enter__(self) -> "DataLogger":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _get_writer(self, path: str) -> Any:
+        """
+        Return a persistent buffered csv writer for a file.
+
+        The file is opened once in append mode and kept open until close().
+        The header is checked only on that first open, and written only if the
+        file has no content yet.
+
+        Args:
+            path: CSV file to append to (one of the files in self._headers)
+
+        Returns:
+            csv writer bound to the open file handle
+        """
+        writer = self._writers.get(path)
+        if writer is None:
+            fh = open(path, mode="a", newline="", buffering=1 << 16, encoding="utf-8")
+            writer = csv.writer(fh)
+            # Checking the size rather than existence also covers files that
+            # were pre-created empty (e.g. touched by a deploy script)
+            if fh.tell() == 0:
+                writer.writerow(self._headers[path])
+            self._handles[path] = fh
+            self._writers[path] = writer
+        return writer
+
+    def _enqueue_row(self, path: str, row: List[Any]) -> None:
+        """
+        Queue a row for the background writer thread.
+
+        Args:
+            path: CSV file to append to
+            row: Row values
+        """
+        if self._writer_thread is None:
+            self._writer_thread = threading.Thread(
+                target=self._writer_loop, name="DataLoggerWriter", daemon=True
+            )
+            self._writer_thread.start()
+            # Drain the queue even if the caller never calls close()
+            atexit.register(self.close)
+        self._queue.put(("row", path, row))
+
+    def _writer_loop(self) -> None:
+        """Write queued rows until a stop request, flushing whenever the queue runs dry."""
+        while True:
+            kind, path, payload = self._queue.get()
+            if kind == "row":
+                self._write_queued_row(path, payload)
+                continue
+
+            # Flush/stop request: payload is the event the caller is waiting on
+            try:
+                self._flush_handles()
+                if kind == "stop":
+                    for fh in self._handles.values():
+                        fh.close()
+                    self._handles.clear()
+                    self._writers.clear()
+            except Exception as e:
+                self._writer_error = self._writer_error or e
+            finally:
+                payload.set()
+
+            if kind == "stop":
+                return
+
+    def _write_queued_row(self, path: str, row: List[Any]) -> None:
+        """Write one queued row; errors are kept and re-raised by flush()/close()."""
+        try:
+            self._get_writer(path).writerow(row)
+            if self._queue.empty():
+                self._flush_handles()
+        except Exception as e:
+            self._writer_error = self._writer_error or e
+
+    def _flush_handles(self) -> None:
+        """Flush all open CSV handles to the OS."""
+        for fh in self._handles.values():
+            fh.flush()
+
+    def _request(self, kind: str) -> None:
+        """Send a flush/stop request to the writer thread and wait for it."""
+        done = threading.Event()
+        self._queue.put((kind, "", done))
+        done.wait()
+
+    def _raise_writer_error(self) -> None:
+        """Re-raise (once) the first error hit by the writer thread."""
+        error, self._writer_error = self._writer_error, None
+        if error is not None:
+            raise error
+
+    def flush(self) -> None:
+        """Wait for queued rows to be written and flush them to disk."""
+        if self._writer_thread is not None:
+            self._request("flush")
+        self._raise_writer_error()
+
+    def close(self) -> None:
+        """Write any queued rows, then stop the writer thread and close all CSV handles."""
+        if self._writer_thread is not None:
+            self._request("stop")
+            self._writer_thread.join()
+            self._writer_thread = None
+            atexit.unregister(self.close)
+        self._raise_writer_error()
 
     def log_prediction(
         self,
@@ -58,66 +263,41 @@ class DataLogger:
             provider_used: Name of provider used for decision
             all_provider_forecasts: Dict of all provider forecasts for comparison
         """
-        file_exists = os.path.isfile(self.predictions_file)
-
-        with open(self.predictions_file, mode="a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-
-            if not file_exists:
-                writer.writerow(
-                    [
-                        "Prediction Date",
-                        "Logged At",
-                        "Forecast (Wh)",
-                        "Forecast (kWh)",
-                        "Solar Coverage (%)",
-                        "Current SOC (%)",
-                        "Target SOC (%)",
-                        "Expected SOC Increase (%)",
-                        "Charge Rate Set (%)",
-                        "Off-Peak Window",
-                        "Battery Capacity (Wh)",
-                        "Avg Load (W)",
-                        "Daily Consumption (Wh)",
-                        "Provider Used",
-                        "Alternative Forecasts",
-                    ]
-                )
-
-            logged_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            soc_increase = (
-                expected_soc_increase if expected_soc_increase else (target_soc - current_soc)
-            )
-            daily_consumption = average_load_w * 24
-
-            # Format alternative forecasts as JSON-like string
-            alt_forecasts = ""
-            if all_provider_forecasts and len(all_provider_forecasts) > 1:
-                alt_list = []
-                for prov, fc in all_provider_forecasts.items():
-                    if prov != provider_used and fc is not None:
-                        alt_list.append(f"{prov}:{fc:.0f}")
-                alt_forecasts = "; ".join(alt_list)
-
-            writer.writerow(
-                [
-                    prediction_date,
-                    logged_at,
-                    int(forecast_wh),
-                    round(forecast_wh / 1000, 2),
-                    round(solar_coverage_pct, 1),
-                    round(current_soc, 1),
-                    target_soc,
-                    round(soc_increase, 1),
-                    charge_rate_pct,
-                    f"{off_peak_start}-{off_peak_end}",
-                    battery_capacity_wh,
-                    average_load_w,
-                    int(daily_consumption),
-                    provider_used or "unknown",
-                    alt_forecasts,
-                ]
-            )
+        logged_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        soc_increase = (
+            expected_soc_increase if expected_soc_increase else (target_soc - current_soc)
+        )
+        daily_consumption = average_load_w * 24
+
+        # Format alternative forecasts as JSON-like string
+        alt_forecasts = ""
+        if all_provider_forecasts and len(all_provider_forecasts) > 1:
+            alt_list = []
+            for prov, fc in all_provider_forecasts.items():
+                if prov != provider_used and fc is not None:
+                    alt_list.append(f"{prov}:{fc:.0f}")
+            alt_forecasts = "; ".join(alt_list)
+
+        self._enqueue_row(
+            self.predictions_file,
+            [
+                prediction_date,
+                logged_at,
+                int(forecast_wh),
+                round(forecast_wh / 1000, 2),
+                round(solar_coverage_pct, 1),
+                round(current_soc, 1),
+                target_soc,
+                round(soc_increase, 1),
+                charge_rate_pct,
+                f"{off_peak_start}-{off_peak_end}",
+                battery_capacity_wh,
+                average_load_w,
+                int(daily_consumption),
+                provider_used or "unknown",
+                alt_forecasts,
+            ],
+        )
 
     def log_actual(
         self,
@@ -141,46 +321,26 @@ class DataLogger:
             actual_soc_increase: Actual SOC increase from charging
             notes: Any additional notes
         """
-        file_exists = os.path.isfile(self.actuals_file)
-
-        with open(self.actuals_file, mode="a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-
-            if not file_exists:
-                writer.writerow(
-                    [
-                        "Date",
-                        "Logged At",
-                        "Actual Generation (Wh)",
-                        "Actual Generation (kWh)",
-                        "SOC at Evening (%)",
-                        "SOC at Morning (%)",
-                        "Actual SOC Increase (%)",
-                        "Charge Energy (Wh)",
-                        "Charge Energy (kWh)",
-                        "Notes",
-                    ]
-                )
-
-            logged_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            soc_change = actual_soc_increase
-            if soc_change is None and soc_at_sunset is not None and soc_at_morning is not None:
-                soc_change = round(soc_at_sunset - soc_at_morning, 1)
-
-            writer.writerow(
-                [
-                    actual_date,
-                    logged_at,
-                    int(actual_generation_wh),
-                    round(actual_generation_wh / 1000, 2),
-                    round(soc_at_sunset, 1) if soc_at_sunset else "",
-                    round(soc_at_morning, 1) if soc_at_morning else "",
-                    round(soc_change, 1) if soc_change else "",
-                    int(charge_energy_wh) if charge_energy_wh else "",
-                    round(charge_energy_wh / 1000, 2) if charge_energy_wh else "",
-                    notes,
-                ]
-            )
+        logged_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        soc_change = actual_soc_increase
+        if soc_change is None and soc_at_sunset is not None and soc_at_morning is not None:
+            soc_change = round(soc_at_sunset - soc_at_morning, 1)
+
+        self._enqueue_row(
+            self.actuals_file,
+            [
+                actual_date,
+                logged_at,
+                int(actual_generation_wh),
+                round(actual_generation_wh / 1000, 2),
+                round(soc_at_sunset, 1) if soc_at_sunset else "",
+                round(soc_at_morning, 1) if soc_at_morning else "",
+                round(soc_change, 1) if soc_change else "",
+                int(charge_energy_wh) if charge_energy_wh else "",
+                round(charge_energy_wh / 1000, 2) if charge_energy_wh else "",
+                notes,
+            ],
+        )
 
     def log_provider_forecasts(
         self, date: str, all_forecasts: Dict[str, float], primary_provider: str
@@ -193,190 +353,311 @@ class DataLogger:
             all_forecasts: Dict mapping provider name to forecast (Wh)
             primary_provider: Name of primary provider used for decision
         """
-        file_exists = os.path.isfile(self.provider_comparison_file)
+        logged_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        with open(self.provider_comparison_file, mode="a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
+        # Get forecasts for each provider (handle None values)
+        primary_fc = all_forecasts.get(primary_provider)
+        primary_fc_kwh = (primary_fc / 1000) if primary_fc is not None else 0
 
-            if not file_exists:
-                writer.writerow(
-                    [
-                        "Date",
-                        "Logged At",
-                        "Primary Provider",
-                        "Primary Forecast (kWh)",
-                        "Solcast Forecast (kWh)",
-                        "ForecastSolar Forecast (kWh)",
-                        "Variance (kWh)",
-                        "Variance (%)",
-                    ]
-                )
+        solcast_fc = all_forecasts.get("solcast")
+        solcast_fc_kwh = (solcast_fc / 1000) if solcast_fc is not None else 0
 
-            logged_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        forecast_solar_fc = all_forecasts.get("forecast.solar")
+        forecast_solar_fc_kwh = (forecast_solar_fc / 1000) if forecast_solar_fc is not None else 0
 
-            # Get forecasts for each provider (handle None values)
-            primary_fc = all_forecasts.get(primary_provider)
-            primary_fc_kwh = (primary_fc / 1000) if primary_fc is not None else 0
+        # Calculate variance between providers (only if both are available)
+        if solcast_fc_kwh > 0 and forecast_solar_fc_kwh > 0:
+            variance_kwh = abs(solcast_fc_kwh - forecast_solar_fc_kwh)
+            avg_fc = (solcast_fc_kwh + forecast_solar_fc_kwh) / 2
+            variance_pct = (variance_kwh / avg_fc * 100) if avg_fc > 0 else 0
+        else:
+            variance_kwh = 0
+            variance_pct = 0
+
+        self._enqueue_row(
+            self.provider_comparison_file,
+            [
+                date,
+                logged_at,
+                primary_provider,
+                round(primary_fc_kwh, 2) if primary_fc_kwh > 0 else "N/A",
+                round(solcast_fc_kwh, 2) if solcast_fc_kwh > 0 else "N/A",
+                round(forecast_solar_fc_kwh, 2) if forecast_solar_fc_kwh > 0 else "N/A",
+                round(variance_kwh, 2) if variance_kwh > 0 else "N/A",
+                round(variance_pct, 1) if variance_pct > 0 else "N/A",
+            ],
+        )
 
-            solcast_fc = all_forecasts.get("solcast")
-            solcast_fc_kwh = (solcast_fc / 1000) if solcast_fc is not None else 0
+    def generate_performance_summary(self) -> None:
+        """
+        Generate a performance summary by matching predictions with actuals.
+        Creates a combined CSV showing forecast accuracy and performance.
+        """
+        # Make sure rows still sitting in the write buffers are visible
+        self.flush()
+
+        # Combine and calculate metrics. Written to a temporary file so the
+        # streaming pass can be redone if the history is out of order.
+        tmp_file = self.summary_file + ".tmp"
+        try:
+            self._write_summary(tmp_file, assume_sorted=self.assume_sorted)
+        except _UnsortedHistoryError:
+            self._write_summary(tmp_file, assume_sorted=False)
+        os.replace(tmp_file, self.summary_file)
+
+    def _write_summary(self, path: str, assume_sorted: bool) -> None:
+        """
+        Write the performance summary CSV to the given path.
 
-            forecast_solar_fc = all_forecasts.get("forecast.solar")
-            forecast_solar_fc_kwh = (
-                (forecast_solar_fc / 1000) if forecast_solar_fc is not None else 0
-            )
+        Args:
+            path: File to write
+            assume_sorted: Stream the history files instead of sorting them in memory
+        """
+        with open(path, mode="w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(self.SUMMARY_HEADER)
+            writer.writerows(self._iter_summary_rows(assume_sorted))
 
-            # Calculate variance between providers (only if both are available)
-            if solcast_fc_kwh > 0 and forecast_solar_fc_kwh > 0:
-                variance_kwh = abs(solcast_fc_kwh - forecast_solar_fc_kwh)
-                avg_fc = (solcast_fc_kwh + forecast_solar_fc_kwh) / 2
-                variance_pct = (variance_kwh / avg_fc * 100) if avg_fc > 0 else 0
-            else:
-                variance_kwh = 0
-                variance_pct = 0
+    def _iter_summary_rows(self, assume_sorted: bool = True) -> Iterator[Tuple[Any, ...]]:
+        """
+        Yield one performance summary row per predicted date.
+
+        Both files are appended in date order, so they are streamed side by
+        side (merge-join) instead of being loaded into memory.
+
+        Args:
+            assume_sorted: Stream the files; raises _UnsortedHistoryError if
+                either turns out to be out of order. If False, sort in memory.
+
+        Yields:
+            Summary row tuples in the column order of performance_summary.csv
+        """
+        iter_rows = self._iter_rows_by_date if assume_sorted else self._iter_rows_sorted
+        predictions = iter_rows(self.predictions_file, "Prediction Date")
+        actuals = iter_rows(self.actuals_file, "Date")
+        actual_date, actual_row = next(actuals, (None, None))
+
+        # Every prediction row shares the file header, so resolve the
+        # charge-rate column (old and new names) once
+        charge_rate_key = None
+
+        for date, pred in predictions:
+            # Skip actuals for days that were never predicted
+            while actual_date is not None and actual_date < date:
+                actual_date, actual_row = next(actuals, (None, None))
+            actual = actual_row if actual_date == date else None
+
+            if charge_rate_key is None:
+                charge_rate_key = (
+                    "Charge Rate Set (%)" if "Charge Rate Set (%)" in pred else "Charge Rate (%)"
+                )
+
+            forecast_kwh_str = pred["Forecast (kWh)"]
+            coverage = pred["Solar Coverage (%)"]
+            target_soc = pred["Target SOC (%)"]
+            expected_increase_str = pred.get("Expected SOC Increase (%)", "")
+            charge_rate = pred[charge_rate_key]
 
-            writer.writerow(
-                [
+            if not actual:
+                # Prediction exists but no actual data yet
+                yield (
                     date,
-                    logged_at,
-                    primary_provider,
-                    round(primary_fc_kwh, 2) if primary_fc_kwh > 0 else "N/A",
-                    round(solcast_fc_kwh, 2) if solcast_fc_kwh > 0 else "N/A",
-                    round(forecast_solar_fc_kwh, 2) if forecast_solar_fc_kwh > 0 else "N/A",
-                    round(variance_kwh, 2) if variance_kwh > 0 else "N/A",
-                    round(variance_pct, 1) if variance_pct > 0 else "N/A",
-                ]
+                    forecast_kwh_str,
+                    "N/A",
+                    "N/A",
+                    "N/A",
+                    coverage,
+                    target_soc,
+                    expected_increase_str,
+                    "N/A",
+                    charge_rate,
+                    "N/A",
+                    "N/A",
+                    "N/A",
+                    "Pending",
+                )
+                continue
+
+            actual_kwh_str = actual["Actual Generation (kWh)"]
+            actual_increase_str = actual.get("Actual SOC Increase (%)", "")
+
+            forecast_kwh = float(forecast_kwh_str)
+            actual_kwh = float(actual_kwh_str)
+
+            accuracy = (actual_kwh / forecast_kwh * 100) if forecast_kwh > 0 else 0
+            error = actual_kwh - forecast_kwh
+
+            # Calculate charge efficiency
+            expected_soc_increase = float(expected_increase_str or 0)
+            actual_soc_increase = float(actual_increase_str) if actual_increase_str else None
+            charge_efficiency = None
+            if expected_soc_increase > 0 and actual_soc_increase:
+                charge_efficiency = actual_soc_increase / expected_soc_increase * 100
+
+            # Determine performance rating
+            if accuracy >= 95:
+                performance = "Excellent"
+            elif accuracy >= 85:
+                performance = "Good"
+            elif accuracy >= 75:
+                performance = "Fair"
+            else:
+                performance = "Poor"
+
+            yield (
+                date,
+                forecast_kwh_str,
+                actual_kwh_str,
+                round(accuracy, 1),
+                round(error, 2),
+                coverage,
+                target_soc,
+                expected_increase_str,
+                actual_increase_str,
+                charge_rate,
+                actual.get("Charge Energy (kWh)", ""),
+                round(charge_efficiency, 1) if charge_efficiency else "",
+                actual.get("SOC at Evening (%)", ""),
+                performance,
             )
 
-    def generate_performance_summary(self) -> None:
+    @staticmethod
+    def _iter_rows_by_date(path: str, date_column: str) -> Iterator[Tuple[str, Dict[str, str]]]:
         """
-        Generate a performance summary by matching predictions with actuals.
-        Creates a combined CSV showing forecast accuracy and performance.
+        Stream (date, row) pairs from a date-ordered CSV file.
+
+        Consecutive rows for the same date are collapsed so the last one wins,
+        matching a re-run on the same evening overwriting the earlier entry.
+
+        Args:
+            path: CSV file to read
+            date_column: Name of the column holding the YYYY-MM-DD date
+
+        Yields:
+            Tuples of (date, row dict)
+
+        Raises:
+            _UnsortedHistoryError: If a date is earlier than the one before it
         """
-        # Read predictions
-        predictions = {}
-        if os.path.isfile(self.predictions_file):
-            with open(self.predictions_file, mode="r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    date = row["Prediction Date"]
-                    predictions[date] = row
-
-        # Read actuals
-        actuals = {}
-        if os.path.isfile(self.actuals_file):
-            with open(self.actuals_file, mode="r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    date = row["Date"]
-                    actuals[date] = row
-
-        # Combine and calculate metrics
-        with open(self.summary_file, mode="w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
+        if not os.path.isfile(path):
+            return
+
+        with open(path, mode="r", encoding="utf-8") as f:
+            pending = None
+            for row in csv.DictReader(f):
+                date = row[date_column]
+                if pending is not None and pending[0] != date:
+                    if date < pending[0]:
+                        raise _UnsortedHistoryError(path)
+                    yield pending
+                pending = (date, row)
+            if pending is not None:
+                yield pending
+
+    @staticmethod
+    def _iter_rows_sorted(path: str, date_column: str) -> Iterator[Tuple[str, Dict[str, str]]]:
+        """
+        Yield (date, row) pairs from a CSV file in date order, whatever the file order.
 
-            writer.writerow(
-                [
-                    "Date",
-                    "Forecast (kWh)",
-                    "Actual (kWh)",
-                    "Accuracy (%)",
-                    "Error (kWh)",
-                    "Solar Coverage Predicted (%)",
-                    "Target SOC (%)",
-                    "Expected SOC Increase (%)",
-                    "Actual SOC Increase (%)",
-                    "Charge Rate Set (%)",
-                    "Charge Energy (kWh)",
-                    "Charge Efficiency (%)",
-                    "SOC at Evening (%)",
-                    "Performance",
-                ]
-            )
+        Loads the whole file; used only when the history is not append-ordered.
+        The last row for each date wins.
+
+        Args:
+            path: CSV file to read
+            date_column: Name of the column holding the YYYY-MM-DD date
+
+        Yields:
+            Tuples of (date, row dict)
+        """
+        if not os.path.isfile(path):
+            return
+
+        rows = {}
+        with open(path, mode="r", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                rows[row[date_column]] = row
+        yield from sorted(rows.items())
+
+    @staticmethod
+    def _iter_lines_reversed(
+        f: IO[bytes], stop: int = 0, chunk_size: int = 1 << 16
+    ) -> Iterator[str]:
+        """
+        Yield the non-empty lines of a binary file from last to first.
+
+        Args:
+            f: File opened in binary mode
+            stop: Byte offset to stop at (e.g. the end of the header line)
+            chunk_size: Number of bytes read per backwards step
+
+        Yields:
+            Decoded lines without line terminators
+        """
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        remainder = b""
+        while position > stop:
+            read_size = min(chunk_size, position - stop)
+            position -= read_size
+            f.seek(position)
+            lines = (f.read(read_size) + remainder).split(b"\n")
+            # The first piece may be a partial line; keep it for the next chunk
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                line = line.rstrip(b"\r")
+                if line:
+                    yield line.decode("utf-8")
+        remainder = remainder.rstrip(b"\r")
+        if remainder:
+            yield remainder.decode("utf-8")
+
+    @classmethod
+    def find_last_row(cls, path: str, date_column: str, date: str) -> Optional[Dict[str, str]]:
+        """
+        Find the last row for a date in an append-ordered CSV file.
 
-            for date in sorted(predictions.keys()):
-                pred = predictions[date]
-                actual = actuals.get(date)
-
-                if actual:
-                    forecast_kwh = float(pred["Forecast (kWh)"])
-                    actual_kwh = float(actual["Actual Generation (kWh)"])
-
-                    accuracy = (actual_kwh / forecast_kwh * 100) if forecast_kwh > 0 else 0
-                    error = actual_kwh - forecast_kwh
-
-                    # Calculate charge efficiency
-                    expected_soc_increase = float(pred.get("Expected SOC Increase (%)", 0))
-                    actual_soc_increase = (
-                        float(actual.get("Actual SOC Increase (%)", 0))
-                        if actual.get("Actual SOC Increase (%)")
-                        else None
-                    )
-                    charge_efficiency = None
-                    if expected_soc_increase > 0 and actual_soc_increase:
-                        charge_efficiency = actual_soc_increase / expected_soc_increase * 100
-
-                    # Determine performance rating
-                    if accuracy >= 95:
-                        performance = "Excellent"
-                    elif accuracy >= 85:
-                        performance = "Good"
-                    elif accuracy >= 75:
-                        performance = "Fair"
-                    else:
-                        performance = "Poor"
-
-                    # Handle both old and new column names
-                    charge_rate_key = (
-                        "Charge Rate Set (%)"
-                        if "Charge Rate Set (%)" in pred
-                        else "Charge Rate (%)"
-                    )
-
-                    writer.writerow(
-                        [
-                            date,
-                            pred["Forecast (kWh)"],
-                            actual["Actual Generation (kWh)"],
-                            round(accuracy, 1),
-                            round(error, 2),
-                            pred["Solar Coverage (%)"],
-                            pred["Target SOC (%)"],
-                            pred.get("Expected SOC Increase (%)", ""),
-                            actual.get("Actual SOC Increase (%)", ""),
-                            pred[charge_rate_key],
-                            actual.get("Charge Energy (kWh)", ""),
-                            round(charge_efficiency, 1) if charge_efficiency else "",
-                            actual.get("SOC at Evening (%)", ""),
-                            performance,
-                        ]
-                    )
-                else:
-                    # Prediction exists but no actual data yet
-                    charge_rate_key = (
-                        "Charge Rate Set (%)"
-                        if "Charge Rate Set (%)" in pred
-                        else "Charge Rate (%)"
-                    )
-
-                    writer.writerow(
-                        [
-                            date,
-                            pred["Forecast (kWh)"],
-                            "N/A",
-                            "N/A",
-                            "N/A",
-                            pred["Solar Coverage (%)"],
-                            pred["Target SOC (%)"],
-                            pred.get("Expected SOC Increase (%)", ""),
-                            "N/A",
-                            pred[charge_rate_key],
-                            "N/A",
-                            "N/A",
-                            "N/A",
-                            "Pending",
-                        ]
-                    )
+        Rows are appended as they happen, so the wanted row is normally near
+        the end; the file is read backwards and the scan stops at the first
+        match, which is also the latest re-run for that date.
+
+        Args:
+            path: CSV file to read
+            date_column: Name of the column holding the YYYY-MM-DD date
+            date: Date to look for
+
+        Returns:
+            Row dict, or None if the file or date is missing
+        """
+        try:
+            f = open(path, mode="rb")
+        except FileNotFoundError:
+            return None
+
+        with f:
+            header = next(csv.reader([f.readline().decode("utf-8")]), None)
+            if not header or date_column not in header:
+                return None
+            date_idx = header.index(date_column)
+
+            for line in cls._iter_lines_reversed(f, stop=f.tell()):
+                row = next(csv.reader([line]))
+                if len(row) > date_idx and row[date_idx] == date:
+                    return dict(zip(header, row))
+
+        return None
+
+    def get_prediction(self, prediction_date: str) -> Optional[Dict[str, str]]:
+        """
+        Get the latest prediction logged for a date.
+
+        Args:
+            prediction_date: Date in YYYY-MM-DD format
+
+        Returns:
+            Prediction row dict, or None if there is none
+        """
+        self.flush()
+        return self.find_last_row(self.predictions_file, "Prediction Date", prediction_date)
 
     def get_recent_accuracy(self, days: int = 7) -> Optional[float]:
         """
@@ -394,14 +675,25 @@ class DataLogger:
         accuracies = []
         cutoff_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
 
-        with open(self.summary_file, mode="r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row["Date"] >= cutoff_date and row["Accuracy (%)"] != "N/A":
+        # The summary is written in date order, so read it from the end and
+        # stop at the first row older than the cutoff.
+        with open(self.summary_file, mode="rb") as f:
+            header = next(csv.reader([f.readline().decode("utf-8")]), None)
+            if not header or "Date" not in header or "Accuracy (%)" not in header:
+                return None
+            date_idx = header.index("Date")
+            accuracy_idx = header.index("Accuracy (%)")
+
+            for line in self._iter_lines_reversed(f, stop=f.tell()):
+                row = next(csv.reader([line]))
+                if len(row) <= max(date_idx, accuracy_idx):
+                    continue
+                if row[date_idx] < cutoff_date:
+                    break
+                if row[accuracy_idx] != "N/A":
                     try:
-                        accuracy = float(row["Accuracy (%)"])
-                        accuracies.append(accuracy)
-                    except (ValueError, KeyError):
+                        accuracies.append(float(row[accuracy_idx]))
+                    except ValueError:
                         continue
 
         if accuracies:
@@ -1,7 +1,28 @@
 """Solar forecast calculations and SOC target determination."""
 
+import time
+from bisect import bisect_right
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Solar coverage (%) breakpoints and the SOC offset applied in each band.
+# Bands below _COVERAGE_MAX_BANDS are relative to maximum_charge_pct, the rest
+# to minimum_charge_pct. These thresholds can be tuned based on your data collection.
+_COVERAGE_BREAKS = (40, 60, 80, 100, 120, 150)
+_COVERAGE_SOC_OFFSETS = (
+    0,  # < 40%: very poor solar day
+    -10,  # >= 40%: poor solar day
+    50,  # >= 60%: moderate solar day
+    40,  # >= 80%: decent solar day
+    30,  # >= 100%: good solar day (covers all needs)
+    20,  # >= 120%: very good solar day
+    10,  # >= 150%: excellent solar day
+)
+_COVERAGE_MAX_BANDS = 2
+
+# Forecast (Wh) breakpoints and target SOC for get_scaled_soc_target_simple
+_FORECAST_BREAKS = (4000, 5000, 6000, 7000, 8000, 10000)
+_FORECAST_SOC_TARGETS = (95, 80, 70, 60, 50, 40, 30)
 
 
 def get_scaled_soc_target(
@@ -11,6 +32,7 @@ def get_scaled_soc_target(
     maximum_charge_pct: int,
     average_load_w: float,
     confidence: float = 0.8,
+    daily_consumption_wh: Optional[float] = None,
 ) -> int:
     """
     Calculate optimal SOC target based on forecasted solar yield.
@@ -26,6 +48,7 @@ def get_scaled_soc_target(
         maximum_charge_pct: Maximum allowed charge percentage
         average_load_w: Average household load in watts
         confidence: Confidence factor to apply to forecast (0-1)
+        daily_consumption_wh: Precomputed daily consumption (defaults to average_load_w * 24)
 
     Returns:
         Target SOC percentage (constrained by min/max settings)
@@ -35,30 +58,24 @@ def get_scaled_soc_target(
 
     # Calculate what percentage of daily consumption the forecast will cover
     # Assuming 24-hour consumption
-    daily_consumption_wh = average_load_w * 24
+    if daily_consumption_wh is None:
+        daily_consumption_wh = average_load_w * 24
 
     # How much of daily needs will solar cover?
     solar_coverage_pct = (adjusted_forecast_wh / daily_consumption_wh) * 100
 
     # Determine target SOC based on expected solar coverage
-    # These thresholds can be tuned based on your data collection
-    if solar_coverage_pct >= 150:  # Excellent solar day
-        target_soc = minimum_charge_pct + 10
-    elif solar_coverage_pct >= 120:  # Very good solar day
-        target_soc = minimum_charge_pct + 20
-    elif solar_coverage_pct >= 100:  # Good solar day (covers all needs)
-        target_soc = minimum_charge_pct + 30
-    elif solar_coverage_pct >= 80:  # Decent solar day
-        target_soc = minimum_charge_pct + 40
-    elif solar_coverage_pct >= 60:  # Moderate solar day
-        target_soc = minimum_charge_pct + 50
-    elif solar_coverage_pct >= 40:  # Poor solar day
-        target_soc = maximum_charge_pct - 10
-    else:  # Very poor solar day
+    band = bisect_right(_COVERAGE_BREAKS, solar_coverage_pct)
+    base_pct = maximum_charge_pct if band < _COVERAGE_MAX_BANDS else minimum_charge_pct
+    target_soc = base_pct + _COVERAGE_SOC_OFFSETS[band]
+
+    # Constrain to configured limits (plain comparisons instead of nested min/max calls).
+    # Two separate ifs rather than if/elif, so the minimum still wins if the limits
+    # overlap, as max(min, min(max, x)) did.
+    if target_soc > maximum_charge_pct:
         target_soc = maximum_charge_pct
-
-    # Constrain to configured limits
-    target_soc = max(minimum_charge_pct, min(maximum_charge_pct, target_soc))
+    if target_soc < minimum_charge_pct:
+        target_soc = minimum_charge_pct
 
     return int(target_soc)
 
@@ -74,20 +91,8 @@ def get_scaled_soc_target_simple(total_forecast_wh: float) -> int:
     Returns:
         Target SOC percentage
     """
-    if total_forecast_wh >= 10000:
-        return 30
-    elif total_forecast_wh >= 8000:
-        return 40
-    elif total_forecast_wh >= 7000:
-        return 50
-    elif total_forecast_wh >= 6000:
-        return 60
-    elif total_forecast_wh >= 5000:
-        return 70
-    elif total_forecast_wh >= 4000:
-        return 80
-    else:
-        return 95  # low forecast, fill almost fully
+    # Low forecast falls into the first band: fill almost fully
+    return _FORECAST_SOC_TARGETS[bisect_right(_FORECAST_BREAKS, total_forecast_wh)]
 
 
 def calculate_charge_rate(
@@ -163,6 +168,36 @@ class ForecastCalculator:
         self.forecast_manager = forecast_manager
         self.config = config
 
+        # Assuming 24-hour consumption, shared by target and coverage calculations
+        self._daily_consumption_wh = config.growatt.average_load_w * 24
+
+        # Per-date memo of forecast lookups: (kind, YYYY-MM-DD) -> (fetched_at, value)
+        self._memo: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+        cache_config = getattr(config, "cache", None)
+        self._memo_ttl_seconds = getattr(cache_config, "ttl_hours", 4.0) * 3600
+
+    def _memoized(self, kind: str, target_date: datetime, fetch: Callable[[], Any]) -> Any:
+        """
+        Return a cached forecast lookup for a date, fetching it if missing or expired.
+
+        Args:
+            kind: Lookup type ("daily" or "hourly")
+            target_date: Date the forecast is for
+            fetch: Callable performing the provider lookup
+
+        Returns:
+            Cached or freshly fetched value
+        """
+        key = (kind, target_date.strftime("%Y-%m-%d"))
+        cached = self._memo.get(key)
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < self._memo_ttl_seconds:
+            return cached[1]
+
+        value = fetch()
+        self._memo[key] = (now, value)
+        return value
+
     def get_tomorrow_forecast(self) -> float:
         """
         Get tomorrow's solar generation forecast from primary provider.
@@ -171,7 +206,9 @@ class ForecastCalculator:
             Forecasted generation in Wh
         """
         tomorrow = datetime.now() + timedelta(days=1)
-        forecast_wh, provider_used = self.forecast_manager.get_forecast_for_date(tomorrow)
+        forecast_wh, provider_used = self._memoized(
+            "daily", tomorrow, lambda: self.forecast_manager.get_forecast_for_date(tomorrow)
+        )
         return forecast_wh
 
     def get_all_tomorrow_forecasts(self) -> Dict[str, float]:
@@ -192,7 +229,11 @@ class ForecastCalculator:
             Dictionary mapping hour to forecasted watts
         """
         tomorrow = datetime.now() + timedelta(days=1)
-        hourly, provider_used = self.forecast_manager.get_hourly_forecast_for_date(tomorrow)
+        hourly, provider_used = self._memoized(
+            "hourly",
+            tomorrow,
+            lambda: self.forecast_manager.get_hourly_forecast_for_date(tomorrow),
+        )
         return hourly
 
     def calculate_optimal_charge_plan(
@@ -216,42 +257,72 @@ class ForecastCalculator:
         if forecast_wh is None:
             forecast_wh = self.get_tomorrow_forecast()
 
-        growatt_config = self.config.growatt
-        tariff_config = self.config.tariff
-
-        # Calculate target SOC
-        target_soc = get_scaled_soc_target(
-            total_forecast_wh=forecast_wh,
-            battery_capacity_wh=growatt_config.battery_capacity_wh,
-            minimum_charge_pct=growatt_config.minimum_charge_pct,
-            maximum_charge_pct=growatt_config.maximum_charge_pct,
-            average_load_w=growatt_config.average_load_w,
-            confidence=self.config.forecast.confidence,
-        )
+        return self.calculate_optimal_charge_plan_batch([current_soc], [forecast_wh])[0]
 
-        # Calculate off-peak duration
-        start = datetime.strptime(tariff_config.off_peak_start_time, "%H:%M")
-        end = datetime.strptime(tariff_config.off_peak_end_time, "%H:%M")
-        off_peak_hours = (end - start).seconds / 3600
-
-        # Calculate required charge rate
-        charge_rate_pct = calculate_charge_rate(
-            target_soc=target_soc,
-            current_soc=current_soc,
-            battery_capacity_wh=growatt_config.battery_capacity_wh,
-            maximum_charge_rate_w=growatt_config.maximum_charge_rate_w,
-            off_peak_duration_hours=off_peak_hours,
-            average_load_w=growatt_config.average_load_w,
-        )
+    def calculate_optimal_charge_plan_batch(
+        self, current_socs: Sequence[float], forecasts_wh: Sequence[float]
+    ) -> List[Dict[str, Any]]:
+        """
+        Calculate charging plans for many (current SOC, forecast) pairs in one pass.
+
+        Intended for backtesting over historical days: config lookups are done
+        once for the whole batch instead of once per day.
 
-        # Calculate solar coverage
-        daily_consumption_wh = growatt_config.average_load_w * 24
-        solar_coverage_pct = (forecast_wh / daily_consumption_wh) * 100
-
-        return {
-            "target_soc": target_soc,
-            "charge_rate_pct": charge_rate_pct,
-            "forecast_wh": forecast_wh,
-            "solar_coverage_pct": solar_coverage_pct,
-            "off_peak_hours": off_peak_hours,
-        }
+        Args:
+            current_socs: Battery charge percentage for each day
+            forecasts_wh: Forecasted generation in Wh for each day
+
+        Returns:
+            List of plan dictionaries, in input order, with the same keys as
+            calculate_optimal_charge_plan
+        """
+        if len(current_socs) != len(forecasts_wh):
+            raise ValueError("current_socs and forecasts_wh must be the same length")
+
+        growatt_config = self.config.growatt
+        battery_capacity_wh = growatt_config.battery_capacity_wh
+        minimum_charge_pct = growatt_config.minimum_charge_pct
+        maximum_charge_pct = growatt_config.maximum_charge_pct
+        maximum_charge_rate_w = growatt_config.maximum_charge_rate_w
+        average_load_w = growatt_config.average_load_w
+        confidence = self.config.forecast.confidence
+        daily_consumption_wh = self._daily_consumption_wh
+
+        # Off-peak duration is precomputed when the tariff config is loaded
+        off_peak_hours = self.config.tariff.off_peak_hours
+
+        plans = []
+        for current_soc, forecast_wh in zip(current_socs, forecasts_wh):
+            # Calculate target SOC
+            target_soc = get_scaled_soc_target(
+                total_forecast_wh=forecast_wh,
+                battery_capacity_wh=battery_capacity_wh,
+                minimum_charge_pct=minimum_charge_pct,
+                maximum_charge_pct=maximum_charge_pct,
+                average_load_w=average_load_w,
+                confidence=confidence,
+                daily_consumption_wh=daily_consumption_wh,
+            )
+
+            # Calculate required charge rate
+            charge_rate_pct = calculate_charge_rate(
+                target_soc=target_soc,
+                current_soc=current_soc,
+                battery_capacity_wh=battery_capacity_wh,
+                maximum_charge_rate_w=maximum_charge_rate_w,
+                off_peak_duration_hours=off_peak_hours,
+                average_load_w=average_load_w,
+            )
+
+            plans.append(
+                {
+                    "target_soc": target_soc,
+                    "charge_rate_pct": charge_rate_pct,
+                    "forecast_wh": forecast_wh,
+                    # Calculate solar coverage
+                    "solar_coverage_pct": (forecast_wh / daily_consumption_wh) * 100,
+                    "off_peak_hours": off_peak_hours,
+                }
+            )
+
+        return plans
@@ -1,15 +1,21 @@
 """Weather forecast API client using Forecast.Solar."""
 
 from datetime import datetime
-from typing import Any, Dict
+from types import SimpleNamespace
+from typing import Any, Dict, Tuple
 
-import requests
+from modules.forecast_providers.forecast_solar import ForecastSolarProvider
 
 
 class ForecastSolarAPI:
-    """Client for Forecast.Solar API."""
+    """
+    Client for Forecast.Solar API.
+
+    Compatibility wrapper around ForecastSolarProvider, so both entry points
+    share the same HTTP session, response caches and API usage tracking.
+    """
 
-    BASE_URL = "https://api.forecast.solar"
+    BASE_URL = ForecastSolarProvider.BASE_URL
 
     def __init__(
         self,
@@ -38,6 +44,18 @@ class ForecastSolarAPI:
         self.kwp = kwp
         self.damping = damping
 
+        self._provider = ForecastSolarProvider(
+            SimpleNamespace(
+                latitude=lat,
+                longitude=lon,
+                declination=declination,
+                azimuth=azimuth,
+                kwp=kwp,
+                damping=damping,
+                arrays=None,
+            )
+        )
+
     def get_forecast(self) -> Dict[str, Any]:
         """
         Get solar generation forecast.
@@ -46,23 +64,9 @@ class ForecastSolarAPI:
             Dictionary containing forecast data with timestamps and watt-hours
 
         Raises:
-            requests.exceptions.RequestException: If API call fails
+            NetworkError: If API call fails
         """
-        # Build URL: /estimate/:lat/:lon/:dec/:az/:kwp
-        url = (
-            f"{self.BASE_URL}/estimate/"
-            f"{self.lat}/{self.lon}/"
-            f"{self.declination}/{self.azimuth}/{self.kwp}"
-        )
-
-        params = {}
-        if self.damping:
-            params["damping"] = self.damping
-
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-
-        return response.json()
+        return self._provider.get_forecast()
 
     def get_forecast_for_date(self, target_date: datetime) -> float:
         """
@@ -74,18 +78,7 @@ class ForecastSolarAPI:
         Returns:
             Total forecasted generation in watt-hours for that date
         """
-        forecast_data = self.get_forecast()
-
-        # The API returns 'result' with 'watt_hours_day' containing daily totals
-        watt_hours_day = forecast_data.get("result", {}).get("watt_hours_day", {})
-
-        # Format date as YYYY-MM-DD to match API response format
-        date_str = target_date.strftime("%Y-%m-%d")
-
-        # Get the forecast for the target date
-        forecast_wh = watt_hours_day.get(date_str, 0)
-
-        return float(forecast_wh)
+        return self._provider.get_forecast_for_date(target_date)
 
     def get_hourly_forecast_for_date(self, target_date: datetime) -> Dict[datetime, float]:
         """
@@ -97,23 +90,19 @@ class ForecastSolarAPI:
         Returns:
             Dictionary mapping datetime to watt-hours for each hour
         """
-        forecast_data = self.get_forecast()
-
-        # The API returns 'result' with 'watts' containing hourly data
-        watts = forecast_data.get("result", {}).get("watts", {})
-
-        hourly_forecast = {}
-        target_date_str = target_date.strftime("%Y-%m-%d")
+        return self._provider.get_hourly_forecast_for_date(target_date)
 
-        for timestamp_str, watts_value in watts.items():
-            # Parse timestamp (format: "2025-10-08 14:00:00")
-            timestamp = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
+    def get_day_summary(self, target_date: datetime) -> Tuple[float, Dict[datetime, float]]:
+        """
+        Get both the daily total and hourly forecast from a single API response.
 
-            # Only include hours for the target date
-            if timestamp.strftime("%Y-%m-%d") == target_date_str:
-                hourly_forecast[timestamp] = float(watts_value)
+        Args:
+            target_date: Date to get forecast for
 
-        return hourly_forecast
+        Returns:
+            Tuple of (total watt-hours, hourly watt-hours by datetime)
+        """
+        return self._provider.get_day_summary(target_date)
 
 
 def get_forecast_data_from_config(config) -> ForecastSolarAPI:
@@ -3,13 +3,69 @@
 import hashlib
 import json
 import logging
+import threading
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Hashable, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 
+class MemoryTTLCache:
+    """
+    Thread-safe in-process cache with per-entry expiry.
+
+    Sits in front of ForecastCache so repeated lookups within one process
+    skip both the network and the cache file. Oldest entries are evicted
+    once maxsize is reached.
+    """
+
+    def __init__(self, maxsize: int = 8, ttl_seconds: float = 900.0):
+        """
+        Initialize the in-process cache.
+
+        Args:
+            maxsize: Maximum number of entries held
+            ttl_seconds: How long an entry remains valid
+        """
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Hashable, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        hit = self.get_with_age(key)
+        return hit[0] if hit is not None else None
+
+    def get_with_age(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        """Return (value, age in seconds) for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            age = time.monotonic() - stored_at
+            if age > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            return value, age
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the oldest entry if full."""
+        with self._lock:
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.maxsize:
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = (time.monotonic(), value)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+
 class ForecastCache:
     """
     File-based cache for forecast API responses.
@@ -108,8 +164,9 @@ class ForecastCache:
             expiry = cached_time + timedelta(hours=ttl)
 
             if datetime.now() > expiry:
+                # Keep the file: get_latest() serves it if the next fetch fails.
+                # LogMaintenance sweeps files past cache_max_age_days.
                 self.logger.debug(f"Cache expired: {cache_key} (cached at {cached_time})")
-                cache_path.unlink()  # Remove expired cache
                 return None
 
             age_minutes = (datetime.now() - cached_time).total_seconds() / 60
@@ -124,6 +181,56 @@ class ForecastCache:
             cache_path.unlink(missing_ok=True)
             return None
 
+    def get_latest(
+        self,
+        provider: str,
+        array_config: Optional[Dict] = None,
+        max_age_hours: Optional[float] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve the most recently cached forecast, even if past its TTL.
+
+        Used as a fallback when the provider cannot be reached, so a stale
+        forecast is preferred over none at all.
+
+        Args:
+            provider: Provider name
+            array_config: Array configuration (must match the cached entry)
+            max_age_hours: Ignore entries cached longer ago than this
+
+        Returns:
+            Newest cached data dict or None if nothing usable is cached
+        """
+        if not self.enabled:
+            return None
+
+        config_hash = self._hash_config(array_config) if array_config else None
+        oldest = None if max_age_hours is None else datetime.now() - timedelta(hours=max_age_hours)
+        latest = None
+
+        for cache_path in self.cache_dir.glob(f"{provider}_*.json"):
+            try:
+                with open(cache_path, "r", encoding="utf-8") as f:
+                    cached = json.load(f)
+                if cached.get("config_hash") != config_hash:
+                    continue
+                cached_time = datetime.fromisoformat(cached["cached_at"])
+            except (OSError, json.JSONDecodeError, KeyError, ValueError) as e:
+                self.logger.debug(f"Skipping unreadable cache file {cache_path.name}: {e}")
+                continue
+
+            if oldest is not None and cached_time < oldest:
+                continue
+            if latest is None or cached_time > latest[0]:
+                latest = (cached_time, cached["data"])
+
+        if latest is None:
+            return None
+
+        age_hours = (datetime.now() - latest[0]).total_seconds() / 3600
+        self.logger.warning(f"Using stale {provider} forecast from cache (age: {age_hours:.1f}h)")
+        return latest[1]
+
     def set(
         self,
         provider: str,
@@ -4,6 +4,10 @@ from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import Dict, Optional
 
+import requests
+
+from ..http_session import loads_json
+
 
 class ForecastProvider(ABC):
     """Abstract base class for forecast providers."""
@@ -63,13 +67,29 @@ class ForecastProvider(ABC):
             "requires_api_key": getattr(self, "requires_api_key", False),
         }
 
-    def test_connection(self) -> bool:
+    def has_cached_forecast(self) -> bool:
+        """
+        Check whether a fresh forecast is available without an API call.
+
+        Returns:
+            True if a cached forecast is available, False otherwise
+        """
+        return False
+
+    def test_connection(self, allow_cached: bool = True) -> bool:
         """
         Test if the provider can successfully connect and fetch data.
 
+        Args:
+            allow_cached: If True, a fresh cached forecast counts as success
+                and no API call is made
+
         Returns:
             True if connection successful, False otherwise
         """
+        if allow_cached and self.has_cached_forecast():
+            return True
+
         try:
             # Try to get tomorrow's forecast as a test
             tomorrow = datetime.now().replace(hour=12, minute=0, second=0, microsecond=0)
@@ -90,7 +110,12 @@ class ForecastProviderError(Exception):
 class RateLimitError(ForecastProviderError):
     """Raised when API rate limit is exceeded."""
 
-    pass
+    def __init__(
+        self, message: str, provider: Optional[str] = None, retry_after: Optional[float] = None
+    ):
+        # Seconds the server asked us to wait (Retry-After), if it said
+        self.retry_after = retry_after
+        super().__init__(message, provider)
 
 
 class AuthenticationError(ForecastProviderError):
@@ -102,4 +127,26 @@ class AuthenticationError(ForecastProviderError):
 class NetworkError(ForecastProviderError):
     """Raised when network request fails."""
 
-    pass
+    def __init__(
+        self, message: str, provider: Optional[str] = None, status_code: Optional[int] = None
+    ):
+        # HTTP status of the failed response; None for timeouts and connection errors
+        self.status_code = status_code
+        super().__init__(message, provider)
+
+
+def decode_json(response, provider: str) -> Dict:
+    """
+    Decode an API response body, using orjson when it is installed.
+
+    Args:
+        response: requests.Response object
+        provider: Provider name for error messages
+
+    Raises:
+        NetworkError: If the body is not valid JSON
+    """
+    try:
+        return loads_json(response.content)
+    except requests.exceptions.JSONDecodeError as e:
+        raise NetworkError(f"Invalid JSON response: {e}", provider) from e
@@ -1,23 +1,115 @@
 """Forecast.Solar forecast provider."""
 
 import logging
+import threading
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 
-from ..api_usage_tracker import can_make_calls, record_api_call
-from ..forecast_cache import ForecastCache
+from ..api_usage_tracker import can_make_calls, get_quota_status, record_api_call
+from ..forecast_cache import ForecastCache, MemoryTTLCache
+from ..http_session import RETRY_STATUSES, make_retrying_session
 from .base import (
     ForecastProvider,
     ForecastProviderError,
     NetworkError,
     RateLimitError,
+    decode_json,
 )
 
 # Don't create module-level logger - get it in __init__ instead
 # logger = logging.getLogger(__name__)
 
+# Parsed API responses shared by every ForecastSolarProvider in this process
+# (including those wrapped by the legacy ForecastSolarAPI)
+FORECAST_MEMO = MemoryTTLCache(maxsize=8, ttl_seconds=3600)
+
+# Set on stale responses served from the file cache after a failed fetch
+_STALE_KEY = "_stale"
+
+# Hourly watts of the most recently parsed response, grouped by date
+# (see _index_watts_by_date); holds the response itself to compare by identity
+_watts_index: Tuple[Optional[Dict], Dict[str, List[Tuple[datetime, float]]]] = (None, {})
+_watts_index_lock = threading.Lock()
+
+# Shared HTTP session so repeat requests reuse the keep-alive TLS connection.
+# Transient 5xx responses and connection errors are retried with exponential
+# backoff; 429 is not retried since every attempt counts against the quota.
+HTTP_SESSION = make_retrying_session(
+    pool_maxsize=4,
+    backoff_factor=0.3,
+    status_forcelist=[status for status in RETRY_STATUSES if status != 429],
+    allowed_methods=("GET",),
+)
+
+
+def parse_daily_total(forecast_data: Dict, target_date: datetime) -> float:
+    """
+    Extract the total forecast generation for a date from a Forecast.Solar response.
+
+    Args:
+        forecast_data: Parsed API response
+        target_date: Date to get forecast for
+
+    Returns:
+        Total forecasted generation in watt-hours (0 if the date is missing)
+    """
+    # The API returns 'result' with 'watt_hours_day' containing daily totals
+    watt_hours_day = forecast_data.get("result", {}).get("watt_hours_day", {})
+
+    # Format date as YYYY-MM-DD to match API response format
+    date_str = target_date.strftime("%Y-%m-%d")
+
+    # Get the forecast for the target date
+    forecast_wh = watt_hours_day.get(date_str, 0)
+
+    return float(forecast_wh)
+
+
+def parse_hourly_forecast(forecast_data: Dict, target_date: datetime) -> Dict[datetime, float]:
+    """
+    Extract the hourly forecast for a date from a Forecast.Solar response.
+
+    Args:
+        forecast_data: Parsed API response
+        target_date: Date to get forecast for
+
+    Returns:
+        Dictionary mapping datetime to watts for each hour
+    """
+    index = _index_watts_by_date(forecast_data)
+    return dict(index.get(target_date.strftime("%Y-%m-%d"), ()))
+
+
+def _index_watts_by_date(forecast_data: Dict) -> Dict[str, List[Tuple[datetime, float]]]:
+    """
+    Group a response's hourly watts by date, parsing each timestamp once.
+
+    The index for the most recent response is kept, so lookups for several
+    dates from the same (memoized) response reuse it.
+    """
+    global _watts_index
+
+    with _watts_index_lock:
+        source, index = _watts_index
+    if source is forecast_data:
+        return index
+
+    # The API returns 'result' with 'watts' containing hourly data
+    watts = forecast_data.get("result", {}).get("watts", {})
+
+    index = {}
+    for timestamp_str, watts_value in watts.items():
+        # Timestamp format: "2025-10-08 14:00:00"; the first 10 characters are the date
+        index.setdefault(timestamp_str[:10], []).append(
+            (datetime.fromisoformat(timestamp_str), float(watts_value))
+        )
+
+    with _watts_index_lock:
+        _watts_index = (forecast_data, index)
+    return index
+
 
 class ForecastSolarProvider(ForecastProvider):
     """Forecast.Solar API forecast provider with multi-array support."""
@@ -26,6 +118,19 @@ class ForecastSolarProvider(ForecastProvider):
     version = "2.0.0"
     requires_api_key = False
 
+    # Shortest soft TTL (see _soft_ttl_seconds). In-process data older than the soft
+    # TTL is reloaded through the file cache, which only calls the API once its own
+    # entry has expired.
+    SOFT_TTL_SECONDS = 300
+
+    # Newest cached response served when the API cannot be reached; older ones
+    # no longer cover the dates being asked for
+    STALE_MAX_AGE_HOURS = 24
+
+    # Fetches in progress, keyed like FORECAST_MEMO; other callers wait on the event
+    _inflight: Dict[Tuple, threading.Event] = {}
+    _inflight_lock = threading.Lock()
+
     def __init__(self, config, cache: Optional[ForecastCache] = None):
         """
         Initialize Forecast.Solar provider with support for multiple arrays.
@@ -64,61 +169,167 @@ class ForecastSolarProvider(ForecastProvider):
                 "Latitude and longitude must be configured", "Forecast.Solar"
             )
 
-    def get_forecast(self) -> Dict:
+    def get_forecast(self, force_refresh: bool = False) -> Dict:
         """
         Get solar generation forecast from Forecast.Solar.
         Get forecast, using cache if available.
 
         Supports both single-array (uses declination/azimuth/kwp) and
         multi-array configurations (uses arrays list). Each array query
-        counts as one API call.
+        counts as one API call. In-process data older than the soft TTL is
+        reloaded from the file cache, or from the API if that has expired too.
+        If the API cannot be reached, the newest cached forecast is returned
+        regardless of age.
+
+        Args:
+            force_refresh: Skip the in-process and file caches and query the API
 
         Returns:
             Dictionary containing forecast data (combined if multi-array)
 
         Raises:
-            NetworkError: If API call fails
-            RateLimitError: If quota exhausted
+            NetworkError: If API call fails and nothing is cached
+            RateLimitError: If quota exhausted and nothing is cached
         """
+        # In-process cache first: repeated calls within a run skip disk and network
+        memo_key = self._memo_key()
+        hit = None if force_refresh else FORECAST_MEMO.get_with_age(memo_key)
+        if hit is not None:
+            data, age = hit
+            if age < self._soft_ttl_seconds():
+                self.logger.debug(f"Using in-process Forecast.Solar data (age: {age:.0f}s)")
+                return data
+            try:
+                return self._fetch_single_flight(memo_key, force_refresh=False)
+            except ForecastProviderError as e:
+                self.logger.warning(f"Forecast.Solar reload failed ({e}); using in-process data")
+                return data
+
+        return self._fetch_single_flight(memo_key, force_refresh)
+
+    def _fetch_single_flight(self, memo_key: Tuple, force_refresh: bool) -> Dict:
+        """Run _load_forecast, letting concurrent callers for the same site share one load."""
+        # Single-flight: concurrent misses for the same site wait for one fetch
+        while True:
+            with self._inflight_lock:
+                event = self._inflight.get(memo_key)
+                is_leader = event is None
+                if is_leader:
+                    event = self._inflight[memo_key] = threading.Event()
+
+            if is_leader:
+                break
+
+            event.wait()
+            data = FORECAST_MEMO.get(memo_key)
+            if data is not None:
+                return data
+            # The other fetch failed; try again (possibly as the leader)
 
+        try:
+            return self._load_forecast(memo_key, force_refresh)
+        finally:
+            with self._inflight_lock:
+                del self._inflight[memo_key]
+            event.set()
+
+    def _load_forecast(self, memo_key: Tuple, force_refresh: bool) -> Dict:
+        """Load the forecast from the file cache or the API and store it in FORECAST_MEMO."""
         target_date = datetime.now()  # or tomorrow depending on your logic
 
-        # Try cache first
-        if self.cache:
-            # Build array config for cache key
-            array_config = None
-            if self.arrays:
-                array_config = {
-                    "arrays": [
-                        {"declination": a.declination, "azimuth": a.azimuth, "kwp": a.kwp}
-                        for a in self.arrays
-                    ]
-                }
+        array_config = self._array_config()
+
+        # Try cache next
+        if self.cache and not force_refresh:
             cached = self.cache.get("forecast.solar", target_date, array_config)
             if cached:
                 self.logger.info("Using cached Forecast.Solar data")
+                FORECAST_MEMO.set(memo_key, cached)
                 return cached
 
-        # Fetch from API
-        if self.arrays:
-            data = self._get_multi_array_forecast()
-        else:
-            data = self._get_single_array_forecast()
+        # Fetch from API, falling back to the last cached response on failure
+        try:
+            if self.arrays:
+                data = self._get_multi_array_forecast()
+            else:
+                data = self._get_single_array_forecast()
+        except ForecastProviderError as e:
+            stale = None
+            if self.cache:
+                stale = self.cache.get_latest(
+                    "forecast.solar", array_config, max_age_hours=self.STALE_MAX_AGE_HOURS
+                )
+            if stale is None:
+                raise
+            self.logger.warning(f"Forecast.Solar fetch failed ({e}); using cached values")
+            # Marked so date lookups can refuse dates it doesn't cover (see _forecast_covering)
+            stale = {**stale, _STALE_KEY: True}
+            FORECAST_MEMO.set(memo_key, stale)
+            return stale
 
         # Store in cache
         if self.cache:
-            array_config = None
-            if self.arrays:
-                array_config = {
-                    "arrays": [
-                        {"declination": a.declination, "azimuth": a.azimuth, "kwp": a.kwp}
-                        for a in self.arrays
-                    ]
-                }
             self.cache.set("forecast.solar", target_date, data, array_config)
+        FORECAST_MEMO.set(memo_key, data)
 
         return data
 
+    def _soft_ttl_seconds(self) -> float:
+        """
+        Soft TTL stretched to fit the remaining API quota.
+
+        Spreads the calls left in the quota window evenly over it, so in-process
+        data is reloaded less often as the budget depletes instead of exhausting it.
+        """
+        status = get_quota_status("forecast.solar")
+        window_seconds = status["window_hours"] * 3600
+        return max(self.SOFT_TTL_SECONDS, window_seconds / max(status["quota_remaining"], 1))
+
+    def get_provider_info(self) -> Dict[str, Any]:
+        """Get provider metadata, including the current quota and soft TTL."""
+        info = super().get_provider_info()
+        status = get_quota_status("forecast.solar")
+        info["quota_remaining"] = status["quota_remaining"]
+        info["quota_limit"] = status["quota_limit"]
+        info["soft_ttl_seconds"] = self._soft_ttl_seconds()
+        return info
+
+    def _array_config(self) -> Optional[Dict]:
+        """Build the array config used in file cache keys (None for single-array)."""
+        if not self.arrays:
+            return None
+        return {
+            "arrays": [
+                {"declination": a.declination, "azimuth": a.azimuth, "kwp": a.kwp}
+                for a in self.arrays
+            ]
+        }
+
+    def has_cached_forecast(self) -> bool:
+        """Check for an unexpired forecast in the in-process or file cache."""
+        if FORECAST_MEMO.get(self._memo_key()) is not None:
+            return True
+        if self.cache:
+            return (
+                self.cache.get("forecast.solar", datetime.now(), self._array_config()) is not None
+            )
+        return False
+
+    def _memo_key(self) -> Tuple:
+        """Build the in-process cache key from the site and array parameters."""
+        arrays = None
+        if self.arrays:
+            arrays = tuple((a.declination, a.azimuth, a.kwp) for a in self.arrays)
+        return (
+            self.latitude,
+            self.longitude,
+            self.declination,
+            self.azimuth,
+            self.kwp,
+            self.damping,
+            arrays,
+        )
+
     @staticmethod
     def _safe_int(value, default):
         try:
@@ -148,6 +359,12 @@ class ForecastSolarProvider(ForecastProvider):
         """Fetch forecast for single array configuration."""
         self.logger.debug("Fetching single-array forecast")
 
+        # PRE-FLIGHT CHECK: raising here lets get_forecast serve the cached copy
+        can_proceed, reason = can_make_calls("forecast.solar")
+        if not can_proceed:
+            self.logger.warning(f"Skipping Forecast.Solar fetch: {reason}")
+            raise RateLimitError(reason, "Forecast.Solar")
+
         url = (
             f"{self.BASE_URL}/estimate/"
             f"{self.latitude}/{self.longitude}/"
@@ -160,9 +377,9 @@ class ForecastSolarProvider(ForecastProvider):
 
         try:
             self.logger.debug(f"Fetching single-array forecast from {url}")
-            response = requests.get(url, params=params, timeout=10)
+            response = HTTP_SESSION.get(url, params=params, timeout=10)
             response.raise_for_status()
-            data = response.json()
+            data = decode_json(response, "Forecast.Solar")
 
             # Record API call for rate limit tracking
             try:
@@ -280,12 +497,12 @@ class ForecastSolarProvider(ForecastProvider):
             params["damping"] = self.damping
 
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = HTTP_SESSION.get(url, params=params, timeout=10)
             response.raise_for_status()
-            data = response.json()
+            data = decode_json(response, "Forecast.Solar")
 
-            self.logger.debug(f"DEBUG: url: {url} params: {params} ")
-            self.logger.debug(f"DEBUG: Data: {data}")
+            self.logger.debug("url: %s params: %s", url, params)
+            self.logger.debug("Data: %s", data)
 
             # Record API call for rate limit tracking
             try:
@@ -386,6 +603,25 @@ class ForecastSolarProvider(ForecastProvider):
 
         return combined
 
+    def _forecast_covering(self, target_date: datetime) -> Dict:
+        """
+        Get the forecast response to read target_date from.
+
+        Raises:
+            NetworkError: If the API could not be reached and the stale cached
+                response served instead has no forecast for target_date, so the
+                caller can fall back to another provider rather than read 0 Wh
+        """
+        forecast_data = self.get_forecast()
+        if forecast_data.get(_STALE_KEY):
+            date_str = target_date.strftime("%Y-%m-%d")
+            if date_str not in forecast_data.get("result", {}).get("watt_hours_day", {}):
+                raise NetworkError(
+                    f"API unavailable and cached forecast has no data for {date_str}",
+                    "Forecast.Solar",
+                )
+        return forecast_data
+
     def get_forecast_for_date(self, target_date: datetime) -> float:
         """
         Get total forecast generation for a specific date in Wh.
@@ -396,18 +632,7 @@ class ForecastSolarProvider(ForecastProvider):
         Returns:
             Total forecasted generation in watt-hours
         """
-        forecast_data = self.get_forecast()
-
-        # The API returns 'result' with 'watt_hours_day' containing daily totals
-        watt_hours_day = forecast_data.get("result", {}).get("watt_hours_day", {})
-
-        # Format date as YYYY-MM-DD to match API response format
-        date_str = target_date.strftime("%Y-%m-%d")
-
-        # Get the forecast for the target date
-        forecast_wh = watt_hours_day.get(date_str, 0)
-
-        return float(forecast_wh)
+        return parse_daily_total(self._forecast_covering(target_date), target_date)
 
     def get_hourly_forecast_for_date(self, target_date: datetime) -> Dict[datetime, float]:
         """
@@ -419,20 +644,20 @@ class ForecastSolarProvider(ForecastProvider):
         Returns:
             Dictionary mapping datetime to watts for each hour
         """
-        forecast_data = self.get_forecast()
-
-        # The API returns 'result' with 'watts' containing hourly data
-        watts = forecast_data.get("result", {}).get("watts", {})
-
-        hourly_forecast = {}
-        target_date_str = target_date.strftime("%Y-%m-%d")
+        return parse_hourly_forecast(self._forecast_covering(target_date), target_date)
 
-        for timestamp_str, watts_value in watts.items():
-            # Parse timestamp (format: "2025-10-08 14:00:00")
-            timestamp = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
+    def get_day_summary(self, target_date: datetime) -> Tuple[float, Dict[datetime, float]]:
+        """
+        Get both the daily total and hourly forecast from a single API response.
 
-            # Only include hours for the target date
-            if timestamp.strftime("%Y-%m-%d") == target_date_str:
-                hourly_forecast[timestamp] = float(watts_value)
+        Args:
+            target_date: Date to get forecast for
 
-        return hourly_forecast
+        Returns:
+            Tuple of (total watt-hours, hourly watts by datetime)
+        """
+        forecast_data = self._forecast_covering(target_date)
+        return (
+            parse_daily_total(forecast_data, target_date),
+            parse_hourly_forecast(forecast_data, target_date),
+        )
@@ -1,8 +1,11 @@
 """Forecast provider manager for handling multiple providers."""
 
 import logging
-from datetime import datetime
-from typing import Dict, List, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
 
 from .base import ForecastProvider, ForecastProviderError
 from .forecast_solar import ForecastSolarProvider
@@ -26,6 +29,7 @@ class ForecastManager:
         providers: List[str] = None,
         primary_provider: str = None,
         cache=None,
+        prefetch: bool = False,
     ):
         """
         Initialize forecast manager.
@@ -35,11 +39,16 @@ class ForecastManager:
             providers: List of provider names to use (e.g. ['solcast', 'forecast.solar'])
             primary_provider: Name of primary provider (used for charging decisions)
             cache: Optional ForecastCache instance for caching API responses
+            prefetch: If True, warm the primary provider's caches in a background
+                thread so the first forecast lookup doesn't wait on the network
         """
         self.config = config
         self.providers = {}
         self.primary_provider_name = primary_provider
         self.cache = cache  # Store cache for passing to providers
+        self._forecast_settings = None
+        self._provider_configs = {}
+        self._prefetch_thread = None
 
         # Use module name - automatically inherits from configured root logger
         self.logger = logging.getLogger(__name__)
@@ -50,26 +59,85 @@ class ForecastManager:
         elif not providers:
             providers = ["forecast.solar"]  # Default fallback
 
-        # Initialize requested providers
-        for provider_name in providers:
-            try:
-                self.providers[provider_name] = self._create_provider(provider_name)
-                self.logger.info(f"Initialized forecast provider: {provider_name}")
-            except Exception as e:
-                self.logger.error(f"Failed to initialize provider {provider_name}: {e}")
-
-        if not self.providers:
-            raise ForecastProviderError("No forecast providers could be initialized")
+        # Only the primary is created up front; fallback providers are created
+        # on first use (see _get_provider), since most runs never need them
+        self.provider_names = list(providers)
+        self._failed_providers = set()
 
         # Set primary provider (or first available)
-        if primary_provider and primary_provider in self.providers:
+        if primary_provider in self.provider_names and self._get_provider(primary_provider):
             self.primary_provider_name = primary_provider
         else:
-            self.primary_provider_name = list(self.providers.keys())[0]
+            for provider_name in self.provider_names:
+                if self._get_provider(provider_name):
+                    self.primary_provider_name = provider_name
+                    break
+            else:
+                raise ForecastProviderError("No forecast providers could be initialized")
             self.logger.warning(
                 f"Primary provider not available, using {self.primary_provider_name}"
             )
 
+        if prefetch:
+            self._prefetch_thread = threading.Thread(
+                target=self._prefetch, name="ForecastPrefetch", daemon=True
+            )
+            self._prefetch_thread.start()
+
+    def _prefetch(self) -> None:
+        """Fetch today's and tomorrow's forecast from the primary provider to fill its caches."""
+        provider = self.providers[self.primary_provider_name]
+        today = datetime.now()
+        try:
+            for target_date in (today, today + timedelta(days=1)):
+                provider.get_forecast_for_date(target_date)
+            self.logger.info(f"Prefetched forecast from {self.primary_provider_name}")
+        except Exception as e:
+            self.logger.warning(f"Forecast prefetch from {self.primary_provider_name} failed: {e}")
+
+    def _wait_for_prefetch(self) -> None:
+        """
+        Block until a running prefetch has finished.
+
+        Lookups wait rather than racing the prefetch, which would otherwise
+        spend a second API call on the same forecast.
+        """
+        if self._prefetch_thread is not None:
+            self._prefetch_thread.join()
+
+    def _get_provider(self, provider_name: str) -> Optional[ForecastProvider]:
+        """
+        Get a provider, creating it on first use.
+
+        Args:
+            provider_name: Name of the provider
+
+        Returns:
+            Provider instance, or None if it could not be initialized
+        """
+        provider = self.providers.get(provider_name)
+        if provider is not None or provider_name in self._failed_providers:
+            return provider
+
+        try:
+            provider = self._create_provider(provider_name)
+        except Exception as e:
+            self.logger.error(f"Failed to initialize provider {provider_name}: {e}")
+            self._failed_providers.add(provider_name)
+            return None
+
+        self.providers[provider_name] = provider
+        self.logger.info(f"Initialized forecast provider: {provider_name}")
+        return provider
+
+    def _get_all_providers(self) -> Dict[str, ForecastProvider]:
+        """Create any providers not yet used and return all that initialized."""
+        for provider_name in self.provider_names:
+            self._get_provider(provider_name)
+        return {
+            name: self.providers[name] for name in self.provider_names if name in self.providers
+        }
+
     def _create_provider(self, provider_name: str) -> ForecastProvider:
         """
         Create a provider instance.
@@ -94,48 +162,57 @@ class ForecastManager:
         # Pass cache to provider
         return provider_class(provider_config, cache=self.cache)
 
-    def _get_provider_config(self, provider_name: str):
+    def _get_provider_config(self, provider_name: str) -> SimpleNamespace:
         """
         Get configuration for a specific provider.
 
+        The shared forecast settings are read once and reused for every
+        provider; the composed config is cached per provider name.
+
         Args:
             provider_name: Name of the provider
 
         Returns:
             Configuration object with provider-specific settings
         """
+        if provider_name in self._provider_configs:
+            return self._provider_configs[provider_name]
 
-        # Create a simple config object that combines main forecast config
-        # with provider-specific config
-        class ProviderConfig:
-            pass
+        if self._forecast_settings is None:
+            self._forecast_settings = self._read_forecast_settings()
 
-        config_obj = ProviderConfig()
+        # Combine main forecast config with provider-specific config
+        settings = dict(self._forecast_settings)
+        if provider_name == "solcast" and hasattr(self.config, "solcast"):
+            solcast_cfg = self.config.solcast
+            settings["api_key"] = getattr(solcast_cfg, "api_key", None)
+            settings["resource_id"] = getattr(solcast_cfg, "resource_id", None)
 
-        # Add main forecast config
-        if hasattr(self.config, "forecast"):
-            forecast_cfg = self.config.forecast
+        config_obj = SimpleNamespace(**settings)
+        self._provider_configs[provider_name] = config_obj
+        return config_obj
 
-            # Parse location if it's lat,lon format
-            location = getattr(forecast_cfg, "location", "")
-            if "," in location:
-                lat, lon = map(float, location.split(","))
-                config_obj.latitude = lat
-                config_obj.longitude = lon
+    def _read_forecast_settings(self) -> Dict[str, Any]:
+        """Read the provider-independent settings from the main forecast config."""
+        settings = {}
+        if not hasattr(self.config, "forecast"):
+            return settings
 
-            config_obj.declination = getattr(forecast_cfg, "declination", 30)
-            config_obj.azimuth = getattr(forecast_cfg, "azimuth", 0)
-            config_obj.kwp = getattr(forecast_cfg, "kw_power", 5.8)
-            config_obj.damping = getattr(forecast_cfg, "damping", 0.1)
-            config_obj.arrays = getattr(forecast_cfg, "arrays", None)  # Multi-array support
+        forecast_cfg = self.config.forecast
 
-        # Add provider-specific config
-        if provider_name == "solcast" and hasattr(self.config, "solcast"):
-            solcast_cfg = self.config.solcast
-            config_obj.api_key = getattr(solcast_cfg, "api_key", None)
-            config_obj.resource_id = getattr(solcast_cfg, "resource_id", None)
+        # Parse location if it's lat,lon format
+        location = getattr(forecast_cfg, "location", "")
+        if "," in location:
+            lat, lon = map(float, location.split(","))
+            settings["latitude"] = lat
+            settings["longitude"] = lon
 
-        return config_obj
+        settings["declination"] = getattr(forecast_cfg, "declination", 30)
+        settings["azimuth"] = getattr(forecast_cfg, "azimuth", 0)
+        settings["kwp"] = getattr(forecast_cfg, "kw_power", 5.8)
+        settings["damping"] = getattr(forecast_cfg, "damping", 0.1)
+        settings["arrays"] = getattr(forecast_cfg, "arrays", None)  # Multi-array support
+        return settings
 
     def get_forecast_for_date(
         self, target_date: datetime, use_primary: bool = True
@@ -150,6 +227,7 @@ class ForecastManager:
         Returns:
             Tuple of (forecast_wh, provider_name)
         """
+        self._wait_for_prefetch()
         # Try primary provider first
         if use_primary and self.primary_provider_name:
             try:
@@ -160,10 +238,14 @@ class ForecastManager:
                 self.logger.warning(f"Primary provider {self.primary_provider_name} failed: {e}")
 
         # Try other providers as fallback
-        for name, provider in self.providers.items():
+        for name in self.provider_names:
             if name == self.primary_provider_name:
                 continue  # Already tried
 
+            provider = self._get_provider(name)
+            if provider is None:
+                continue
+
             try:
                 forecast = provider.get_forecast_for_date(target_date)
                 self.logger.info(f"Using fallback provider: {name}")
@@ -177,21 +259,31 @@ class ForecastManager:
         """
         Get forecasts from all providers for comparison.
 
+        Providers are queried concurrently; a failing provider maps to None.
+
         Args:
             target_date: Date to get forecasts for
 
         Returns:
             Dictionary mapping provider name to forecast (Wh)
         """
+        self._wait_for_prefetch()
+        providers = self._get_all_providers()
         forecasts = {}
 
-        for name, provider in self.providers.items():
-            try:
-                forecast = provider.get_forecast_for_date(target_date)
-                forecasts[name] = forecast
-            except Exception as e:
-                self.logger.error(f"Provider {name} failed: {e}")
-                forecasts[name] = None
+        # Providers are independent network calls, so query them in parallel
+        with ThreadPoolExecutor(max_workers=len(providers)) as executor:
+            futures = {
+                name: executor.submit(provider.get_forecast_for_date, target_date)
+                for name, provider in providers.items()
+            }
+
+            for name, future in futures.items():
+                try:
+                    forecasts[name] = future.result()
+                except Exception as e:
+                    self.logger.error(f"Provider {name} failed: {e}")
+                    forecasts[name] = None
 
         return forecasts
 
@@ -207,6 +299,7 @@ class ForecastManager:
         Returns:
             Tuple of (hourly_data, provider_name)
         """
+        self._wait_for_prefetch()
         # Try primary provider
         if self.primary_provider_name:
             try:
@@ -217,10 +310,14 @@ class ForecastManager:
                 self.logger.warning(f"Primary provider {self.primary_provider_name} failed: {e}")
 
         # Fallback
-        for name, provider in self.providers.items():
+        for name in self.provider_names:
             if name == self.primary_provider_name:
                 continue
 
+            provider = self._get_provider(name)
+            if provider is None:
+                continue
+
             try:
                 hourly = provider.get_hourly_forecast_for_date(target_date)
                 self.logger.info(f"Using fallback provider for hourly: {name}")
@@ -230,21 +327,43 @@ class ForecastManager:
 
         raise ForecastProviderError("All forecast providers failed")
 
+    def get_provider_info(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get metadata for all configured providers.
+
+        Returns:
+            Dictionary mapping provider name to its get_provider_info() result
+        """
+        return {
+            name: provider.get_provider_info()
+            for name, provider in self._get_all_providers().items()
+        }
+
     def test_all_providers(self) -> Dict[str, bool]:
         """
         Test connection to all configured providers.
 
+        Providers are tested concurrently.
+
         Returns:
             Dictionary mapping provider name to success status
         """
+        self._wait_for_prefetch()
+        providers = self._get_all_providers()
         results = {}
 
-        for name, provider in self.providers.items():
-            try:
-                results[name] = provider.test_connection()
-                self.logger.info(f"Provider {name}: {'OK' if results[name] else 'FAILED'}")
-            except Exception as e:
-                results[name] = False
-                self.logger.error(f"Provider {name} test failed: {e}")
+        with ThreadPoolExecutor(max_workers=len(providers)) as executor:
+            futures = {
+                name: executor.submit(provider.test_connection)
+                for name, provider in providers.items()
+            }
+
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                    self.logger.info(f"Provider {name}: {'OK' if results[name] else 'FAILED'}")
+                except Exception as e:
+                    results[name] = False
+                    self.logger.error(f"Provider {name} test failed: {e}")
 
         return results
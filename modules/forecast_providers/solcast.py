@@ -1,24 +1,38 @@
 """Solcast solar forecast provider."""
 
 import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Optional
+from heapq import merge
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple
 
 import requests
 
 from ..api_usage_tracker import can_make_calls, record_api_call
-from ..forecast_cache import ForecastCache
+from ..forecast_cache import ForecastCache, MemoryTTLCache
+from ..http_session import parse_retry_after
 from .base import (
     AuthenticationError,
     ForecastProvider,
     ForecastProviderError,
     NetworkError,
     RateLimitError,
+    decode_json,
 )
 
 # Don't create module-level logger - get it in __init__ instead
 # logger = logging.getLogger(__name__)
 
+# Parsed forecasts shared by every SolcastProvider in this process. Solcast
+# publishes PT30M periods, so a 30 minute TTL never hides a newer forecast.
+FORECAST_MEMO = MemoryTTLCache(maxsize=4, ttl_seconds=1800)
+
+# Shared HTTP session so repeat requests reuse the keep-alive TLS connection
+HTTP_SESSION = requests.Session()
+
 
 class SolcastProvider(ForecastProvider):
     """Solcast API forecast provider."""
@@ -27,6 +41,13 @@ class SolcastProvider(ForecastProvider):
     version = "1.0.0"
     requires_api_key = True
 
+    # Retry transient failures with exponential backoff plus jitter. Every
+    # attempt counts against the daily quota, so keep the attempts few and only
+    # wait out a 429 when the server asks for a short Retry-After.
+    MAX_ATTEMPTS = 3
+    RETRY_BACKOFF_SECONDS = 1.0
+    MAX_RETRY_AFTER_SECONDS = 60.0
+
     def __init__(self, config, cache: Optional[ForecastCache] = None):
         """
         Initialize Solcast provider.
@@ -50,6 +71,9 @@ class SolcastProvider(ForecastProvider):
         # Set up API Response cache
         self.cache = cache  # Injected cache instance
 
+        # Periods of the last parsed response grouped by date (see _index_forecast_by_date)
+        self._indexed = (None, {})
+
         # Get Solcast-specific config
         self.api_key = getattr(config, "api_key", None)
         resource_id_str = getattr(config, "resource_id", None)
@@ -114,7 +138,50 @@ class SolcastProvider(ForecastProvider):
 
     def _make_request(self, endpoint: str, params: Dict = None) -> Dict:
         """
-        Make an authenticated request to Solcast API.
+        Make an authenticated request to Solcast API, retrying transient failures.
+
+        Timeouts, connection errors and 5xx responses are retried with exponential backoff
+        and jitter. A 429 is retried only if Retry-After asks for at most
+        MAX_RETRY_AFTER_SECONDS; an exhausted daily quota and authentication
+        failures are raised straight away.
+
+        Args:
+            endpoint: API endpoint path
+            params: Query parameters
+
+        Returns:
+            JSON response
+
+        Raises:
+            Various ForecastProviderError subclasses
+        """
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            try:
+                return self._send_request(endpoint, params)
+            except RateLimitError as e:
+                if (
+                    attempt == self.MAX_ATTEMPTS
+                    or e.retry_after is None
+                    or e.retry_after > self.MAX_RETRY_AFTER_SECONDS
+                ):
+                    raise
+                delay = e.retry_after + random.uniform(0, 1)
+            except NetworkError as e:
+                # Client errors (bad resource ID etc.) will fail the same way again
+                client_error = e.status_code is not None and e.status_code < 500
+                if client_error or attempt == self.MAX_ATTEMPTS:
+                    raise
+                delay = self.RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1) + random.uniform(0, 1)
+
+            self.logger.warning(
+                f"Solcast request to {endpoint} failed (attempt {attempt}/{self.MAX_ATTEMPTS}), "
+                f"retrying in {delay:.1f}s"
+            )
+            time.sleep(delay)
+
+    def _send_request(self, endpoint: str, params: Dict = None) -> Dict:
+        """
+        Make a single authenticated request to Solcast API.
 
         Args:
             endpoint: API endpoint path
@@ -132,7 +199,7 @@ class SolcastProvider(ForecastProvider):
         try:
             # NO QUOTA CHECK HERE - it's done once in get_forecast()
 
-            response = requests.get(url, headers=headers, params=params, timeout=30)
+            response = HTTP_SESSION.get(url, headers=headers, params=params, timeout=30)
 
             # Extract rate limit information from response headers
             quota_limit = self._get_header_int(response, "x-rate-limit-limit")
@@ -181,7 +248,11 @@ class SolcastProvider(ForecastProvider):
                             )
                         except (ValueError, TypeError):
                             pass
-                raise RateLimitError("API rate limit exceeded (10 calls/day)", "Solcast")
+                raise RateLimitError(
+                    "API rate limit exceeded (10 calls/day)",
+                    "Solcast",
+                    retry_after=parse_retry_after(response.headers.get("Retry-After")),
+                )
 
             # Check for authentication errors
             if response.status_code == 401:
@@ -190,13 +261,17 @@ class SolcastProvider(ForecastProvider):
             # Check for other errors
             response.raise_for_status()
 
-            return response.json()
+            return decode_json(response, "Solcast")
 
         except requests.exceptions.Timeout:
             raise NetworkError("Request timeout", "Solcast")
         except requests.exceptions.RequestException as e:
             if isinstance(e, requests.exceptions.HTTPError):
-                raise NetworkError(f"HTTP {response.status_code}: {str(e)}", "Solcast")
+                raise NetworkError(
+                    f"HTTP {response.status_code}: {str(e)}",
+                    "Solcast",
+                    status_code=response.status_code,
+                )
             raise NetworkError(f"Request failed: {str(e)}", "Solcast")
 
     def _get_header_int(self, response, header_name: str) -> Optional[int]:
@@ -305,13 +380,25 @@ class SolcastProvider(ForecastProvider):
             # Silently fail rate limit logging - don't let it break forecast fetching
             self.logger.debug(f"Could not parse Solcast rate limit headers: {str(e)}")
 
-    def get_forecast(self) -> Dict:
+    def has_cached_forecast(self) -> bool:
+        """Check for an unexpired forecast in the in-process or file cache."""
+        if FORECAST_MEMO.get(self._memo_key()) is not None:
+            return True
+        if not self.cache:
+            return False
+        cache_config = {"resource_ids": self.resource_ids} if self.resource_ids else None
+        return self.cache.get("solcast", datetime.now(), cache_config) is not None
+
+    def get_forecast(self, force_refresh: bool = False) -> Dict:
         """
         Get full forecast from Solcast.
         If multiple resource IDs configured, fetches and combines them.
 
         Checks quota before making requests to avoid wasting calls on rate-limited accounts.
 
+        Args:
+            force_refresh: Skip the in-process and file caches and fetch from the API
+
         Returns:
             Raw forecast data from Solcast (combined if multiple resources)
 
@@ -319,8 +406,15 @@ class SolcastProvider(ForecastProvider):
             RateLimitError: If quota exhausted
             ForecastProviderError: If forecast cannot be retrieved
         """
-        # Try cache first
-        if self.cache:
+        # In-process cache first: repeated calls within a run skip disk and network
+        memo_key = self._memo_key()
+        data = None if force_refresh else FORECAST_MEMO.get(memo_key)
+        if data is not None:
+            self.logger.debug("Using in-process Solcast forecast")
+            return data
+
+        # Try cache next
+        if self.cache and not force_refresh:
             # Build config for cache key (resource IDs define the "array config" for Solcast)
             cache_config = {"resource_ids": self.resource_ids} if self.resource_ids else None
             # Use longer TTL for Solcast (7 hours) due to stricter rate limits
@@ -331,6 +425,7 @@ class SolcastProvider(ForecastProvider):
             cached = self.cache.get("solcast", datetime.now(), cache_config)
             if cached:
                 self.logger.info("Using cached Solcast forecast")
+                FORECAST_MEMO.set(memo_key, cached)
                 return cached
 
         # Determine how many calls we need
@@ -365,9 +460,16 @@ class SolcastProvider(ForecastProvider):
         if self.cache:
             cache_config = {"resource_ids": self.resource_ids} if self.resource_ids else None
             self.cache.set("solcast", datetime.now(), data, cache_config)
+        FORECAST_MEMO.set(memo_key, data)
 
         return data
 
+    def _memo_key(self) -> Tuple:
+        """Build the in-process cache key from the resource ids or site parameters."""
+        if self.resource_ids:
+            return tuple(self.resource_ids)
+        return (self.latitude, self.longitude, self.capacity, self.tilt, self.azimuth)
+
     def _get_resource_forecast(self, resource_id: str) -> Dict:
         """Get forecast for a single resource."""
         endpoint = f"rooftop_sites/{resource_id}/forecasts"
@@ -383,72 +485,101 @@ class SolcastProvider(ForecastProvider):
         """
         all_forecasts = []
 
-        # Fetch each resource
-        for resource_id in self.resource_ids:
-            forecast = self._get_resource_forecast(resource_id)
-            all_forecasts.append(forecast.get("forecasts", []))
+        # Fetch each resource concurrently; quota for all of them was checked up front
+        with ThreadPoolExecutor(max_workers=len(self.resource_ids)) as executor:
+            for forecast in executor.map(self._get_resource_forecast, self.resource_ids):
+                all_forecasts.append(forecast.get("forecasts", []))
 
         if not all_forecasts:
             return {"forecasts": []}
 
-        # Combine forecasts by period_end timestamp
-        combined_by_time = {}
-
-        for resource_forecasts in all_forecasts:
-            for entry in resource_forecasts:
-                period_end = entry["period_end"]
-                pv_estimate = entry.get("pv_estimate", 0)
-
-                if period_end in combined_by_time:
-                    # Sum the estimates
-                    combined_by_time[period_end]["pv_estimate"] += pv_estimate
-                else:
-                    # Create new entry
-                    combined_by_time[period_end] = {
-                        "period_end": period_end,
+        # Resources for the same site report identical periods, so sum them positionally
+        first = all_forecasts[0]
+        if all(self._same_periods(first, other) for other in all_forecasts[1:]):
+            combined_forecasts = [
+                {
+                    "period_end": entries[0]["period_end"],
+                    "pv_estimate": sum(entry.get("pv_estimate", 0) for entry in entries),
+                    "period": entries[0].get("period", "PT30M"),
+                }
+                for entries in zip(*all_forecasts)
+            ]
+            return {"forecasts": combined_forecasts}
+
+        # Otherwise merge the (chronologically sorted) resource lists and sum the
+        # estimates of entries that share a period_end
+        combined_forecasts = []
+        for entry in merge(*all_forecasts, key=itemgetter("period_end")):
+            pv_estimate = entry.get("pv_estimate", 0)
+            if combined_forecasts and combined_forecasts[-1]["period_end"] == entry["period_end"]:
+                combined_forecasts[-1]["pv_estimate"] += pv_estimate
+            else:
+                combined_forecasts.append(
+                    {
+                        "period_end": entry["period_end"],
                         "pv_estimate": pv_estimate,
                         "period": entry.get("period", "PT30M"),
                     }
-
-        # Convert back to list
-        combined_forecasts = sorted(combined_by_time.values(), key=lambda x: x["period_end"])
+                )
 
         return {"forecasts": combined_forecasts}
 
-    def get_forecast_for_date(self, target_date: datetime) -> float:
+    @staticmethod
+    def _same_periods(first: List[Dict], other: List[Dict]) -> bool:
+        """Check whether two resources' forecasts cover the same periods in the same order."""
+        return len(first) == len(other) and all(
+            a["period_end"] == b["period_end"] for a, b in zip(first, other)
+        )
+
+    def _index_forecast_by_date(
+        self, forecast_data: Dict
+    ) -> Dict[str, List[Tuple[datetime, float]]]:
         """
-        Get total forecast generation for a specific date in Wh.
+        Group a response's periods by UTC date, parsing each period_end once.
+
+        The index for the most recent response is kept, so daily and hourly
+        lookups for any date from the same (memoized) response reuse it.
 
         Args:
-            target_date: Date to get forecast for
+            forecast_data: Raw forecast data from get_forecast()
 
         Returns:
-            Total forecasted generation in watt-hours
+            Dictionary mapping "YYYY-MM-DD" to (period_end, pv_estimate kW) pairs
         """
-        forecast_data = self.get_forecast()
+        source, index = self._indexed
+        if source is forecast_data:
+            return index
 
         # Solcast returns 'forecasts' array with period_end times and pv_estimate
-        forecasts = forecast_data.get("forecasts", [])
+        index = {}
+        for entry in forecast_data.get("forecasts", []):
+            # Parse period_end: "2025-10-14T00:30:00.0000000Z" (UTC, so the first
+            # 10 characters are its date)
+            period_end_str = entry["period_end"]
+            period_end = datetime.fromisoformat(period_end_str.replace("Z", "+00:00"))
+            index.setdefault(period_end_str[:10], []).append(
+                (period_end, entry.get("pv_estimate", 0))
+            )
 
-        # Format target date for comparison
-        target_date_str = target_date.strftime("%Y-%m-%d")
+        self._indexed = (forecast_data, index)
+        return index
 
-        total_wh = 0
-        for entry in forecasts:
-            # Parse period_end: "2025-10-14T00:30:00.0000000Z"
-            period_end = datetime.fromisoformat(entry["period_end"].replace("Z", "+00:00"))
+    def get_forecast_for_date(self, target_date: datetime) -> float:
+        """
+        Get total forecast generation for a specific date in Wh.
 
-            # Check if this period is on our target date
-            if period_end.strftime("%Y-%m-%d") == target_date_str:
-                # pv_estimate is in kW for the period (typically 30 min periods)
-                pv_kw = entry.get("pv_estimate", 0)
+        Args:
+            target_date: Date to get forecast for
 
-                # Convert to Wh (assuming 30-minute periods)
-                # kW * 0.5 hours = kWh, * 1000 = Wh
-                wh = pv_kw * 0.5 * 1000
-                total_wh += wh
+        Returns:
+            Total forecasted generation in watt-hours
+        """
+        index = self._index_forecast_by_date(self.get_forecast())
+        periods = index.get(target_date.strftime("%Y-%m-%d"), ())
 
-        return total_wh
+        # pv_estimate is in kW for the period (typically 30 min periods)
+        # Convert to Wh (assuming 30-minute periods): kW * 0.5 hours = kWh, * 1000 = Wh
+        return sum(pv_kw * 0.5 * 1000 for _, pv_kw in periods)
 
     def get_hourly_forecast_for_date(self, target_date: datetime) -> Dict[datetime, float]:
         """
@@ -460,29 +591,16 @@ class SolcastProvider(ForecastProvider):
         Returns:
             Dictionary mapping datetime to watts for each hour
         """
-        forecast_data = self.get_forecast()
-        forecasts = forecast_data.get("forecasts", [])
-
-        target_date_str = target_date.strftime("%Y-%m-%d")
-
-        # Aggregate 30-min periods into hourly
-        hourly_data = {}
-
-        for entry in forecasts:
-            period_end = datetime.fromisoformat(entry["period_end"].replace("Z", "+00:00"))
-
-            if period_end.strftime("%Y-%m-%d") == target_date_str:
-                # Round to hour
-                hour_key = period_end.replace(minute=0, second=0, microsecond=0)
-
-                # pv_estimate is in kW
-                pv_kw = entry.get("pv_estimate", 0)
-                pv_w = pv_kw * 1000  # Convert to watts
-
-                # Average the 30-min periods within the hour
-                if hour_key in hourly_data:
-                    hourly_data[hour_key] = (hourly_data[hour_key] + pv_w) / 2
-                else:
-                    hourly_data[hour_key] = pv_w
-
-        return hourly_data
+        index = self._index_forecast_by_date(self.get_forecast())
+        periods = index.get(target_date.strftime("%Y-%m-%d"), ())
+
+        # Aggregate 30-min periods into hourly: (sum of watts, number of periods)
+        totals = {}
+        for period_end, pv_kw in periods:
+            # Round to hour
+            hour_key = period_end.replace(minute=0, second=0, microsecond=0)
+            watts_sum, count = totals.get(hour_key, (0.0, 0))
+            totals[hour_key] = (watts_sum + pv_kw * 1000, count + 1)  # kW -> W
+
+        # Average the periods within each hour
+        return {hour: watts_sum / count for hour, (watts_sum, count) in totals.items()}
@@ -1,21 +1,122 @@
+import atexit
 import csv
 import logging
 import os
+import queue
+import threading
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Sequence
 
 # Get base directory relative to this file
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 LOG_DIR = os.path.join(BASE_DIR, "logs")
 OUTPUT_DIR = os.path.join(BASE_DIR, "output")
 
+SUMMARY_CSV_HEADER = [
+    "Date",
+    "Forecast (Wh)",
+    "Scaled Max SOC (%)",
+    "Target SOC (%)",
+    "Current SOC (%)",
+    "Surplus PV (Wh)",
+    "Grid-Neutral Time",
+    "Required Grid Wh",
+    "Charge Rate (%)",
+    "SOC at Sunset (%)",
+    "Grid Import (Wh)",
+]
+
+
+class CSVAppender:
+    """
+    Append rows to a CSV file, keeping it open between writes.
+
+    The file is opened on the first append and the header is written then
+    if the file is empty, so repeated appends (e.g. a backfill) pay for one
+    open instead of one per row. Rows are buffered until flush() or close().
+    """
+
+    def __init__(self, path: str, header: Sequence[str]):
+        self.path = path
+        self.header = list(header)
+        self._fh = None
+        self._writer = None
+        self._lock = threading.Lock()
+
+    def append(self, row: Sequence) -> None:
+        """Append one row, writing the header first if the file is empty."""
+        with self._lock:
+            if self._fh is None:
+                self._fh = open(self.path, mode="a", newline="", encoding="utf-8")
+                self._writer = csv.writer(self._fh)
+                if self._fh.tell() == 0:
+                    self._writer.writerow(self.header)
+            self._writer.writerow(row)
+
+    def flush(self) -> None:
+        """Push buffered rows to the file."""
+        with self._lock:
+            if self._fh is not None:
+                self._fh.flush()
+
+    def close(self) -> None:
+        """Flush and close the file; a later append reopens it."""
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+                self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+# Appenders shared by the log_* helpers, one per file, closed at exit
+_appenders: Dict[str, CSVAppender] = {}
+_appenders_lock = threading.Lock()
+
+
+def get_csv_appender(path: str, header: Sequence[str]) -> CSVAppender:
+    """
+    Get the shared appender for a CSV file, creating it on first use.
+
+    Args:
+        path: CSV file path
+        header: Column names written when the file is empty
+
+    Returns:
+        CSVAppender kept open for the life of the process
+    """
+    key = os.path.abspath(path)
+    with _appenders_lock:
+        appender = _appenders.get(key)
+        if appender is None:
+            appender = _appenders[key] = CSVAppender(path, header)
+        return appender
+
+
+@atexit.register
+def close_csv_appenders() -> None:
+    """Close every shared CSV appender."""
+    with _appenders_lock:
+        for appender in _appenders.values():
+            appender.close()
+
 
 def setup_logger(name="growatt-charger", max_bytes=1_000_000, backup_count=5):
+    logger = logging.getLogger(name)
+    # Already set up (e.g. called twice): don't add duplicate handlers
+    if logger.handlers:
+        return logger
+
     # Ensure log and output directories exist
     os.makedirs(LOG_DIR, exist_ok=True)
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-    logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
 
     formatter = logging.Formatter("%(asctime)s %(levelname)s: %(message)s")
@@ -23,7 +124,6 @@ def setup_logger(name="growatt-charger", max_bytes=1_000_000, backup_count=5):
     # Console
     sh = logging.StreamHandler()
     sh.setFormatter(formatter)
-    logger.addHandler(sh)
 
     # Rotating file
     log_path = os.path.join(LOG_DIR, f"{name}.log")
@@ -31,7 +131,14 @@ def setup_logger(name="growatt-charger", max_bytes=1_000_000, backup_count=5):
         log_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
     )
     fh.setFormatter(formatter)
-    logger.addHandler(fh)
+
+    # Callers only enqueue records; a listener thread formats and writes them,
+    # and is stopped (draining the queue) at exit
+    log_queue = queue.Queue(-1)
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, sh, fh, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
 
     return logger
 
@@ -40,11 +147,21 @@ def exit_printing(output_string, logger=None):
     now = datetime.now()
     dt_string = now.strftime("%Y-%m-%d %H:%M:%S")
 
-    # Write to latest.txt
+    # Write to latest.txt atomically via a temp file in the same directory, so
+    # readers never see it empty or half-written. A plain open() keeps the usual
+    # umask-based permissions, which os.replace() carries over to latest.txt.
     latest_path = os.path.join(OUTPUT_DIR, "latest.txt")
-    with open(latest_path, "w", encoding="utf-8") as latest_file:
-        for line in output_string:
-            latest_file.write(line + "\n")
+    tmp_path = latest_path + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as latest_file:
+            latest_file.write("".join(line + "\n" for line in output_string))
+        os.replace(tmp_path, latest_path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
 
     # Append to rotating log
     if logger:
@@ -67,37 +184,21 @@ def log_run_to_csv(
     grid_import_wh: float = None,
     csv_path=os.path.join(OUTPUT_DIR, "summary.csv"),
 ):
-    file_exists = os.path.isfile(csv_path)
-    with open(csv_path, mode="a", newline="", encoding="utf-8") as csvfile:
-        writer = csv.writer(csvfile)
-        if not file_exists:
-            writer.writerow(
-                [
-                    "Date",
-                    "Forecast (Wh)",
-                    "Scaled Max SOC (%)",
-                    "Target SOC (%)",
-                    "Current SOC (%)",
-                    "Surplus PV (Wh)",
-                    "Grid-Neutral Time",
-                    "Required Grid Wh",
-                    "Charge Rate (%)",
-                    "SOC at Sunset (%)",
-                    "Grid Import (Wh)",
-                ]
-            )
-        writer.writerow(
-            [
-                date,
-                int(forecast_wh),
-                scaled_max_soc,
-                round(target_soc, 1),
-                round(current_soc, 1),
-                int(surplus_wh),
-                grid_neutral_time,
-                round(required_grid_wh, 1),
-                round(charge_rate_pct, 1),
-                round(sunset_soc, 1) if sunset_soc is not None else "",
-                int(grid_import_wh) if grid_import_wh is not None else "",
-            ]
-        )
+    appender = get_csv_appender(csv_path, SUMMARY_CSV_HEADER)
+    appender.append(
+        [
+            date,
+            int(forecast_wh),
+            scaled_max_soc,
+            round(target_soc, 1),
+            round(current_soc, 1),
+            int(surplus_wh),
+            grid_neutral_time,
+            round(required_grid_wh, 1),
+            round(charge_rate_pct, 1),
+            round(sunset_soc, 1) if sunset_soc is not None else "",
+            int(grid_import_wh) if grid_import_wh is not None else "",
+        ]
+    )
+    # Nightly runs log one row, so make it visible straight away
+    appender.flush()
@@ -4,17 +4,26 @@ from typing import Any, Dict
 
 import requests
 
+from .http_session import loads_json, make_retrying_session
+
+# One session per process so consecutive calls reuse pooled keep-alive connections.
+# Only idempotent requests are retried (urllib3's default allowed_methods), so a
+# schedule push is never sent twice; 429 retries honour the Retry-After header.
+_SESSION = make_retrying_session()
+_SESSION.headers.update({"Accept": "application/json", "Content-Type": "application/json"})
+
 
 def get_session() -> requests.Session:
     """
-    Create a new session for Growatt API calls.
+    Get the shared session for Growatt API calls.
+
+    Calls made one after another (or from several threads) share its
+    connection pool, and transient server errors are retried with backoff.
 
     Returns:
         Session object with default headers
     """
-    session = requests.Session()
-    session.headers.update({"Accept": "application/json", "Content-Type": "application/json"})
-    return session
+    return _SESSION
 
 
 def call_endpoint(
@@ -37,4 +46,4 @@ def call_endpoint(
     """
     response = session.request(method, url, **kwargs)
     response.raise_for_status()
-    return response.json()
+    return loads_json(response.content)
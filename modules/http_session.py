@@ -0,0 +1,122 @@
+"""HTTP helpers shared by the Growatt and forecast API clients."""
+
+import json
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Collection, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:  # Optional: faster JSON decoding for API responses
+    import orjson
+except ImportError:
+    orjson = None
+
+# Statuses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def make_retrying_session(
+    session: Optional[requests.Session] = None,
+    pool_maxsize: int = 8,
+    backoff_factor: float = 0.5,
+    status_forcelist: Collection[int] = RETRY_STATUSES,
+    allowed_methods: Collection[str] = Retry.DEFAULT_ALLOWED_METHODS,
+) -> requests.Session:
+    """
+    Give a session a keep-alive connection pool that retries transient failures.
+
+    Only idempotent requests are retried by default, so a settings push is
+    never sent twice; 429 retries honour the Retry-After header.
+
+    Args:
+        session: Session to configure (a new one is created if omitted)
+        pool_maxsize: Connections kept open per host
+        backoff_factor: urllib3 exponential backoff factor
+        status_forcelist: HTTP statuses to retry
+        allowed_methods: HTTP methods that may be retried
+
+    Returns:
+        The configured session
+    """
+    return _mount_pool(
+        session,
+        pool_maxsize,
+        Retry(
+            total=3,
+            backoff_factor=backoff_factor,
+            status_forcelist=tuple(status_forcelist),
+            allowed_methods=frozenset(allowed_methods),
+        ),
+    )
+
+
+def make_pooled_session(
+    session: Optional[requests.Session] = None, pool_maxsize: int = 8
+) -> requests.Session:
+    """
+    Give a session a keep-alive connection pool that never retries.
+
+    For clients whose callers already retry (e.g. with retry_with_backoff), so
+    that is the only retry layer: no connection or status retries, and a 429
+    reaches the caller with its Retry-After header instead of being slept on.
+
+    Args:
+        session: Session to configure (a new one is created if omitted)
+        pool_maxsize: Connections kept open per host
+
+    Returns:
+        The configured session
+    """
+    return _mount_pool(session, pool_maxsize, Retry(total=0, read=False))
+
+
+def _mount_pool(
+    session: Optional[requests.Session], pool_maxsize: int, max_retries: Retry
+) -> requests.Session:
+    """Mount an HTTPS adapter with the given pool size and retry policy."""
+    if session is None:
+        session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=max_retries),
+    )
+    return session
+
+
+def loads_json(content: bytes) -> Any:
+    """
+    Decode a response body, using orjson when it is installed.
+
+    Raises:
+        requests.exceptions.JSONDecodeError: If the body is not valid JSON, the
+            same error response.json() raises
+    """
+    try:
+        return orjson.loads(content) if orjson is not None else json.loads(content)
+    except json.JSONDecodeError as e:  # orjson.JSONDecodeError subclasses it
+        raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos) from e
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given as delta-seconds or an HTTP-date.
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -52,10 +52,16 @@ class LogMaintenance:
     def _trim_csv_files(self) -> None:
         """Remove rows older than retention_days from all managed CSVs."""
         cutoff = (datetime.now() - timedelta(days=self.retention_days)).strftime("%Y-%m-%d")
+        # List the output directory once rather than checking each managed file
+        try:
+            with os.scandir(self.output_dir) as entries:
+                present = {entry.name for entry in entries if entry.is_file()}
+        except FileNotFoundError:
+            return
         for filename, date_col in self.CSV_DATE_COLUMNS.items():
-            path = os.path.join(self.output_dir, filename)
-            if not os.path.isfile(path):
+            if filename not in present:
                 continue
+            path = os.path.join(self.output_dir, filename)
             try:
                 self._trim_single_csv(path, date_col, cutoff)
             except Exception as e:
@@ -104,20 +110,26 @@ class LogMaintenance:
 
     def _sweep_cache(self) -> None:
         """Delete forecast cache files older than cache_max_age_days."""
-        if not self.cache_dir.exists():
-            return
-
         cutoff_mtime = datetime.now().timestamp() - (self.cache_max_age_days * 86400)
         removed = 0
-        for cache_file in self.cache_dir.glob("*.json"):
-            try:
-                if cache_file.stat().st_mtime < cutoff_mtime:
-                    cache_file.unlink()
-                    removed += 1
-            except Exception as e:
-                logger.warning(
-                    f"Log maintenance: could not remove cache file {cache_file.name}: {e}"
-                )
+        # DirEntry caches the file type from the directory listing (and on
+        # Windows the mtime too), saving stat calls per cache file
+        try:
+            entries = os.scandir(self.cache_dir)
+        except FileNotFoundError:
+            return
+        with entries:
+            for entry in entries:
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    if entry.is_file() and entry.stat().st_mtime < cutoff_mtime:
+                        os.remove(entry.path)
+                        removed += 1
+                except Exception as e:
+                    logger.warning(
+                        f"Log maintenance: could not remove cache file {entry.name}: {e}"
+                    )
 
         if removed:
             logger.info(
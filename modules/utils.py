@@ -17,10 +17,10 @@ def get_grid_neutral_time(
     Returns:
         datetime when generation exceeds load, or None if never grid neutral
     """
-    for hour, forecast in generation_forecast.items():
-        if int(forecast) > average_load_w:
-            return hour
-    return None
+    return next(
+        (hour for hour, forecast in generation_forecast.items() if int(forecast) > average_load_w),
+        None,
+    )
 
 
 def get_grid_neutral_wh(
@@ -35,14 +35,19 @@ def get_grid_neutral_wh(
         average_load_w: Average load in watts
 
     Returns:
-        Watt-hours needed to reach grid neutral
+        Watt-hours needed to reach grid neutral (0 if it is reached before
+        off-peak ends)
     """
-    # Calculate duration on battery
-    duration = datetime.combine(datetime.min, grid_neutral_time.time()) - datetime.combine(
-        datetime.min, today_off_peak_end.time()
-    )
-    hours = duration.seconds / 3600
-    return hours * average_load_w
+    # Calculate duration on battery between the two times of day
+    seconds = _seconds_of_day(grid_neutral_time) - _seconds_of_day(today_off_peak_end)
+    if seconds <= 0:
+        return 0.0
+    return seconds / 3600 * average_load_w
+
+
+def _seconds_of_day(moment: datetime) -> int:
+    """Seconds since midnight for the time of day of a datetime."""
+    return moment.hour * 3600 + moment.minute * 60 + moment.second
 
 
 def get_surplus_generation_for_battery(
@@ -59,14 +64,12 @@ def get_surplus_generation_for_battery(
     Returns:
         Total surplus watt-hours available for battery
     """
-    surplus_generation_for_battery = 0
-    for forecast in generation_forecast.values():
-        if forecast > average_load_w:
-            hour_to_battery = forecast - average_load_w
-            if hour_to_battery > maximum_charge_rate_w:
-                hour_to_battery = maximum_charge_rate_w
-            surplus_generation_for_battery += hour_to_battery
-    return surplus_generation_for_battery
+    # Each hour's surplus over the load, capped at the charge rate
+    return sum(
+        min(forecast - average_load_w, maximum_charge_rate_w)
+        for forecast in generation_forecast.values()
+        if forecast > average_load_w
+    )
 
 
 def get_offpeak_duration(off_peak_start: str, off_peak_end: str) -> float:
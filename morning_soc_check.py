@@ -5,11 +5,13 @@ Runs at 05:00 to capture battery SOC immediately after overnight charging ends.
 Compares actual SOC achieved vs target SOC from last night's prediction.
 """
 
-import csv
 import os
 import sys
 from datetime import datetime
+from typing import Optional, Tuple
 
+from modules.data_logger import DataLogger
+from modules.growatt_logging import get_csv_appender
 from modules.log_maintenance import LogMaintenance
 from src.api import GrowattAPI
 from src.config import ConfigManager
@@ -18,6 +20,36 @@ from src.utils import setup_logging
 # Add to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
 
+MORNING_SOC_CSV_HEADER = [
+    "Date",
+    "Check Time",
+    "Target SOC (%)",
+    "Actual SOC (%)",
+    "Variance (%)",
+    "Charge Rate Set (%)",
+    "Achievement (%)",
+    "Status",
+]
+
+# Largest absolute SOC variance (%) for each status, with its console mark
+VARIANCE_STATUS_THRESHOLDS = ((5, "Excellent", "✓"), (10, "Good", "✓"), (15, "Fair", "⚠"))
+
+
+def variance_status(variance: float) -> Tuple[Optional[int], str, str]:
+    """
+    Classify how close the morning SOC came to its target.
+
+    Args:
+        variance: Difference between actual and target SOC (%)
+
+    Returns:
+        Tuple of (threshold met or None, status name, console mark)
+    """
+    for limit, status, mark in VARIANCE_STATUS_THRESHOLDS:
+        if abs(variance) <= limit:
+            return limit, status, mark
+    return None, "Poor", "✗"
+
 
 def get_last_night_prediction(predictions_file: str, today_date: str):
     """
@@ -30,16 +62,7 @@ def get_last_night_prediction(predictions_file: str, today_date: str):
     Returns:
         Dictionary with prediction data or None
     """
-    if not os.path.isfile(predictions_file):
-        return None
-
-    with open(predictions_file, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if row["Prediction Date"] == today_date:
-                return row
-
-    return None
+    return DataLogger.find_last_row(predictions_file, "Prediction Date", today_date)
 
 
 def log_morning_soc(
@@ -62,55 +85,31 @@ def log_morning_soc(
         variance: Difference between target and actual
     """
     morning_soc_file = os.path.join(output_dir, "morning_soc_checks.csv")
-    file_exists = os.path.isfile(morning_soc_file)
-
-    with open(morning_soc_file, mode="a", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-
-        if not file_exists:
-            writer.writerow(
-                [
-                    "Date",
-                    "Check Time",
-                    "Target SOC (%)",
-                    "Actual SOC (%)",
-                    "Variance (%)",
-                    "Charge Rate Set (%)",
-                    "Achievement (%)",
-                    "Status",
-                ]
-            )
 
-        check_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        # Calculate achievement percentage
-        if target_soc > 0:
-            achievement = (actual_soc / target_soc) * 100
-        else:
-            achievement = 100.0
-
-        # Determine status
-        if abs(variance) <= 5:
-            status = "Excellent"
-        elif abs(variance) <= 10:
-            status = "Good"
-        elif abs(variance) <= 15:
-            status = "Fair"
-        else:
-            status = "Poor"
-
-        writer.writerow(
-            [
-                date,
-                check_time,
-                round(target_soc, 1),
-                round(actual_soc, 1),
-                round(variance, 1),
-                charge_rate_set,
-                round(achievement, 1),
-                status,
-            ]
-        )
+    check_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    # Calculate achievement percentage
+    if target_soc > 0:
+        achievement = (actual_soc / target_soc) * 100
+    else:
+        achievement = 100.0
+
+    status = variance_status(variance)[1]
+
+    appender = get_csv_appender(morning_soc_file, MORNING_SOC_CSV_HEADER)
+    appender.append(
+        [
+            date,
+            check_time,
+            round(target_soc, 1),
+            round(actual_soc, 1),
+            round(variance, 1),
+            charge_rate_set,
+            round(achievement, 1),
+            status,
+        ]
+    )
+    appender.flush()
 
 
 def main():
@@ -216,14 +215,11 @@ def main():
             print(f"Variance: {variance:+.1f}%")
             print(f"Charge Rate Set: {charge_rate_set}%")
 
-            if abs(variance) <= 5:
-                print("Status: ✓ Excellent (within 5%)")
-            elif abs(variance) <= 10:
-                print("Status: ✓ Good (within 10%)")
-            elif abs(variance) <= 15:
-                print("Status: ⚠ Fair (within 15%)")
+            limit, status, mark = variance_status(variance)
+            if limit is None:
+                print(f"Status: {mark} {status} (off by {abs(variance):.1f}%)")
             else:
-                print(f"Status: ✗ Poor (off by {abs(variance):.1f}%)")
+                print(f"Status: {mark} {status} (within {limit}%)")
 
             print(f"{'='*60}\n")
 
@@ -1,34 +1,196 @@
 """Growatt API wrapper with improved error handling and retries."""
 
+import copy
 import logging
-from typing import Any, Dict
+import time
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
 
 import growattServer
+import requests
+
+from modules.http_session import loads_json, make_pooled_session
 
 from ..utils.exceptions import GrowattAPIError, GrowattAuthError, GrowattDeviceError
 from ..utils.retry import retry_with_backoff
 
 logger = logging.getLogger(__name__)
 
+# Common field names for battery percentage, most trusted first
+SOC_FIELDS = (
+    "SOC",
+    "capacity",
+    "soc",
+    "batteryCapacity",
+    "battery_capacity",
+    "bat_capacity",
+    "battery_soc",
+    "bat_soc",
+    "energy_soc",
+    "capacityPercent",
+)
+_SOC_FIELD_PRIORITY = {field: rank for rank, field in enumerate(SOC_FIELDS)}
+
+# spa_ac_charge_time_period params for all three charge slots, disabled.
+# Slot N uses param(3 + 5N)..param(7 + 5N): start hour, start minute,
+# end hour, end minute, enable flag.
+_DISABLED_SLOT_PARAMS: Mapping[str, str] = MappingProxyType(
+    {
+        f"param{start + offset}": ("0" if offset == 4 else "00")
+        for start in (3, 8, 13)
+        for offset in range(5)
+    }
+)
+
+
+def find_soc(data: Dict[str, Any]) -> Optional[float]:
+    """
+    Search a response and its nested dicts for a battery percentage.
+
+    Each dict's own SOC fields are tried (in SOC_FIELDS order) before its
+    nested dicts, which are searched depth-first in order.
+
+    Args:
+        data: Device response
+
+    Returns:
+        Battery percentage, or None if no field holds a number
+    """
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        # Most dicts hold none of the fields, so test membership once per key
+        fields = sorted(
+            (key for key in node if key in _SOC_FIELD_PRIORITY), key=_SOC_FIELD_PRIORITY.get
+        )
+        for field in fields:
+            value = node[field]
+            if value is None:
+                continue
+            try:
+                if isinstance(value, str) and "%" in value:
+                    return float(value.rstrip("%"))
+                return float(value)
+            except (ValueError, TypeError):
+                continue
+
+        stack.extend(value for value in reversed(node.values()) if isinstance(value, dict))
+    return None
+
+
+def _json_response_hook(response: requests.Response, *args, **kwargs) -> None:
+    """Make response.json() decode with loads_json (orjson when it is installed)."""
+    response.json = lambda **_kwargs: loads_json(response.content)
+
 
 class GrowattAPI:
     """Wrapper for Growatt API with improved error handling and retries."""
 
+    # How long responses are reused. Plant and device identity practically never
+    # change; plant info carries live values (SOC, energy) so is only briefly reused.
+    PLANT_TTL_SECONDS = 86400
+    PLANT_INFO_TTL_SECONDS = 60
+    # Growatt web sessions outlive this; logging in again sooner is cheap insurance
+    LOGIN_TTL_SECONDS = 1800
+
     def __init__(self, server_url: str = "https://server.growatt.com/"):
         self.server_url = server_url
         self._api = None
         self._user_id = None
+        # Last successful login, reused until LOGIN_TTL_SECONDS have passed
+        self._credentials: Optional[Tuple[str, str]] = None
+        self._login_response: Optional[Dict[str, Any]] = None
+        self._login_expiry = 0.0
+        # Response cache: key -> (expiry on the monotonic clock, response). Responses
+        # are stored and handed out as deep copies, so callers can modify them freely.
+        self._cache: Dict[Tuple, Tuple[float, Any]] = {}
+        # Device SN -> fallback status method that last returned its SOC
+        self._soc_methods: Dict[str, str] = {}
+
+    def _cache_get(self, key: Tuple) -> Any:
+        """Return a copy of a cached response, or None if missing or expired."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._cache[key]
+            return None
+        return copy.deepcopy(value)
+
+    def _cache_set(self, key: Tuple, value: Any, ttl_seconds: float) -> None:
+        """Cache a copy of a response for ttl_seconds."""
+        self._cache[key] = (time.monotonic() + ttl_seconds, copy.deepcopy(value))
+
+    def invalidate(self) -> None:
+        """Drop all cached responses (e.g. after re-authenticating)."""
+        self._cache.clear()
+        self._soc_methods.clear()
+
+    def close(self) -> None:
+        """Close the client's HTTP session; the next login() starts a new one."""
+        if self._api is not None:
+            self._api.session.close()
+            self._api = None
+        self._user_id = None
+        self._credentials = None
+        self._login_response = None
+        self._login_expiry = 0.0
+        self.invalidate()
+
+    def _fetch_plant_info(self, plant_id: str) -> Dict[str, Any]:
+        """Get plant info, reusing a response fetched in the last PLANT_INFO_TTL_SECONDS."""
+        key = ("plant_info", plant_id)
+        plant_info = self._cache_get(key)
+        if plant_info is None:
+            plant_info = self._api.plant_info(plant_id)
+            if plant_info:
+                self._cache_set(key, plant_info, self.PLANT_INFO_TTL_SECONDS)
+        return plant_info
 
     def _init_api(self, agent_identifier: str) -> None:
         """Initialize the Growatt API client."""
         self._api = growattServer.GrowattApi(agent_identifier=agent_identifier)
         self._api.server_url = self.server_url
+        # The client keeps one session (and its login cookies) for every call; give it
+        # a keep-alive pool without urllib3 retries, so retry_with_backoff is the only
+        # retry layer and sees each 429 (and its Retry-After) itself
+        make_pooled_session(self._api.session)
+        # growattServer decodes every response with response.json()
+        hooks = self._api.session.hooks.get("response", [])
+        if callable(hooks):
+            hooks = [hooks]
+        self._api.session.hooks["response"] = [*hooks, _json_response_hook]
+
+    def _session_valid(self) -> bool:
+        """Check whether the current login can still be used."""
+        return self._user_id is not None and time.monotonic() < self._login_expiry
+
+    def ensure_authenticated(self) -> None:
+        """
+        Make sure there is a usable login, logging in again if it has expired.
+
+        Raises:
+            GrowattAuthError: If login() was never called or the credentials are rejected
+            GrowattAPIError: If logging in again fails
+        """
+        if self._session_valid():
+            return
+        if self._credentials is None:
+            raise GrowattAuthError("Not logged in. Call login() first.")
+        logger.info("Growatt login expired, logging in again")
+        # Not the retrying login(): callers are retried already, and repeated
+        # failed logins can lock the account
+        self._login(*self._credentials)
 
     @retry_with_backoff(retries=3, backoff_in_seconds=2)
     def login(self, username: str, password: str) -> Dict[str, Any]:
         """
         Login to Growatt API with retry capability.
 
+        Logging in again with the same credentials while the previous login is
+        still valid returns the earlier response without a network round-trip.
+
         Args:
             username: Growatt username
             password: Growatt password
@@ -37,8 +199,19 @@ class GrowattAPI:
             Dict containing login response
 
         Raises:
-            GrowattAuthError: If login fails
+            GrowattAuthError: If the credentials are rejected (not retried)
+            GrowattAPIError: If the login request fails
         """
+        if (username, password) == self._credentials and self._session_valid():
+            return self._login_response
+        return self._login(username, password)
+
+    def _login(self, username: str, password: str) -> Dict[str, Any]:
+        """Send one login request and store the new session (no retries)."""
+        # A new session may belong to a different account
+        self.invalidate()
+        self._login_expiry = 0.0
+
         try:
             if not self._api:
                 self._init_api(username)  # Use username as agent identifier for consistency
@@ -51,10 +224,16 @@ class GrowattAPI:
                 )
 
             self._user_id = response["user"]["id"]
+            self._credentials = (username, password)
+            self._login_response = response
+            self._login_expiry = time.monotonic() + self.LOGIN_TTL_SECONDS
             return response
 
+        except GrowattAuthError:
+            raise
         except Exception as e:
-            raise GrowattAuthError(f"Login failed: {str(e)}")
+            # Network and server failures are worth retrying, unlike bad credentials
+            raise GrowattAPIError(f"Login failed: {e}") from e
 
     @retry_with_backoff(retries=3, backoff_in_seconds=2)
     def get_plant_list(self) -> Dict[str, Any]:
@@ -68,8 +247,12 @@ class GrowattAPI:
             GrowattAPIError: If API call fails
             GrowattAuthError: If not logged in
         """
-        if not self._user_id:
-            raise GrowattAuthError("Not logged in. Call login() first.")
+        self.ensure_authenticated()
+
+        key = ("plant_list", self._user_id)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
 
         try:
             response = self._api.plant_list(self._user_id)
@@ -77,10 +260,11 @@ class GrowattAPI:
             if "data" not in response or not response["data"]:
                 raise GrowattAPIError("No plant data returned from API")
 
+            self._cache_set(key, response, self.PLANT_TTL_SECONDS)
             return response
 
         except Exception as e:
-            raise GrowattAPIError(f"Failed to get plant list: {str(e)}")
+            raise GrowattAPIError(f"Failed to get plant list: {e}") from e
 
     @retry_with_backoff(retries=3, backoff_in_seconds=2)
     def get_plant_info(self, plant_id: str) -> Dict[str, Any]:
@@ -96,8 +280,10 @@ class GrowattAPI:
         Raises:
             GrowattAPIError: If API call fails
         """
+        self.ensure_authenticated()
+
         try:
-            response = self._api.plant_info(plant_id)
+            response = self._fetch_plant_info(plant_id)
 
             if not response:
                 raise GrowattAPIError(f"No information returned for plant {plant_id}")
@@ -105,7 +291,7 @@ class GrowattAPI:
             return response
 
         except Exception as e:
-            raise GrowattAPIError(f"Failed to get plant info: {str(e)}")
+            raise GrowattAPIError(f"Failed to get plant info: {e}") from e
 
     @retry_with_backoff(retries=3, backoff_in_seconds=2)
     def get_device_info(self) -> Dict[str, Any]:
@@ -119,6 +305,11 @@ class GrowattAPI:
             GrowattAPIError: If API calls fail
             GrowattDeviceError: If no valid device found
         """
+        key = ("device_info", self._user_id)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
         try:
             # Get plant list
             plant_list = self.get_plant_list()
@@ -137,10 +328,12 @@ class GrowattAPI:
             if not device_sn:
                 raise GrowattDeviceError("No valid inverter or storage device found")
 
-            return {"plant_id": plant_id, "device_sn": device_sn}
+            device_info = {"plant_id": plant_id, "device_sn": device_sn}
+            self._cache_set(key, device_info, self.PLANT_TTL_SECONDS)
+            return device_info
 
         except Exception as e:
-            raise GrowattAPIError(f"Failed to get device info: {str(e)}")
+            raise GrowattAPIError(f"Failed to get device info: {e}") from e
 
     @retry_with_backoff(retries=3, backoff_in_seconds=2)
     def get_system_status(self, device_sn: str, plant_id: str) -> Dict[str, Any]:
@@ -157,110 +350,90 @@ class GrowattAPI:
         Raises:
             GrowattAPIError: If API call fails
         """
+        self.ensure_authenticated()
+
         try:
-            try:
-                plant_info = self._api.plant_info(plant_id)
+            plant_info = self._fetch_plant_info(plant_id)
 
-                # Look for our device in the storage list
-                storage_list = plant_info.get("storageList", [])
-                device_info = next(
-                    (dev for dev in storage_list if dev.get("deviceSn", "").upper() == device_sn),
-                    None,
-                )
+            # Look for our device in the storage list
+            storage_list = plant_info.get("storageList", [])
+            device_info = next(
+                (dev for dev in storage_list if dev.get("deviceSn", "").upper() == device_sn),
+                None,
+            )
 
-                if device_info:
-                    # The capacity field in plant_info appears to be the current battery percentage
-                    capacity = device_info.get("capacity", "")
-                    if capacity:
-                        # Remove % if present and convert to number
-                        capacity = capacity.rstrip("%")
-                        try:
-                            capacity = float(capacity)
-                            device_info["SOC"] = capacity
-                            return device_info
-                        except (ValueError, TypeError):
-                            pass
-
-                # If we couldn't get battery info from plant_info, try direct device methods
-                response = None
-                error_message = None
-
-                # Try methods that we know should work for battery/inverter systems
+            if device_info:
+                # The capacity field in plant_info appears to be the current battery percentage
+                capacity = device_info.get("capacity", "")
+                if capacity:
+                    # Remove % if present and convert to number
+                    capacity = capacity.rstrip("%")
+                    try:
+                        capacity = float(capacity)
+                        device_info["SOC"] = capacity
+                        return device_info
+                    except (ValueError, TypeError):
+                        pass
+
+            # If we couldn't get battery info from plant_info, try direct device methods
+            fallbacks = {
+                "storage_detail": lambda: self._api.storage_detail(device_sn),
+                "mix_system_status": lambda: self._api.mix_system_status(device_sn, plant_id),
+            }
+
+            # Go straight to the method that gave this device's SOC last time
+            remembered = self._soc_methods.get(device_sn)
+            if remembered:
+                try:
+                    response = fallbacks[remembered]()
+                except Exception:
+                    response = None
+                if response and isinstance(response, dict):
+                    soc = find_soc(response)
+                    if soc is not None:
+                        response["SOC"] = soc
+                        return response
+                del self._soc_methods[device_sn]
+
+            response = None
+            answered = None
+            error_message = None
+
+            # Try methods that we know should work for battery/inverter systems, one at
+            # a time: mix_system_status is only requested if storage_detail fails
+            for name, call in fallbacks.items():
                 try:
-                    response = self._api.storage_detail(device_sn)
+                    response = call()
                     if not response:
                         raise Exception("Empty response")
+                    answered = name
+                    break
                 except Exception as e:
+                    response = None
                     error_message = str(e)
 
-                if not response:
-                    try:
-                        response = self._api.mix_system_status(device_sn, plant_id)
-                        if not response:
-                            raise Exception("Empty response")
-                    except Exception as e:
-                        error_message = str(e)
-
-                # If we got a response from direct methods, try to find SOC in it
-                if response:
-                    if isinstance(response, dict):
-                        # Common field names for battery percentage
-                        fields = [
-                            "SOC",
-                            "capacity",
-                            "soc",
-                            "batteryCapacity",
-                            "battery_capacity",
-                            "bat_capacity",
-                            "battery_soc",
-                            "bat_soc",
-                            "energy_soc",
-                            "capacityPercent",
-                        ]
-
-                        # Helper function to search for fields
-                        def find_soc(data):
-                            if isinstance(data, dict):
-                                # Check direct fields
-                                for field in fields:
-                                    value = data.get(field)
-                                    if value is not None:
-                                        try:
-                                            if isinstance(value, str) and "%" in value:
-                                                value = float(value.rstrip("%"))
-                                            else:
-                                                value = float(value)
-                                            return value
-                                        except (ValueError, TypeError):
-                                            continue
-
-                                # Check nested structures
-                                for key, value in data.items():
-                                    if isinstance(value, dict):
-                                        nested_soc = find_soc(value)
-                                        if nested_soc is not None:
-                                            return nested_soc
-                            return None
-
-                        # Search through response and its nested structures
-                        soc = find_soc(response)
-                        if soc is not None:
-                            response["SOC"] = soc
-                            return response
-
-                        print("DEBUG: No battery percentage found in response data")
-
-                # If we get here, we couldn't get valid data
-                error_msg = "Could not find battery percentage data"
-                if error_message:
-                    error_msg += f" (Last error: {error_message})"
-                raise GrowattAPIError(f"{error_msg} for device {device_sn}")
-
-            except Exception as e:
-                raise GrowattAPIError(f"Failed to get status for device {device_sn}: {str(e)}")
+            # If we got a response from direct methods, try to find SOC in it
+            if response:
+                if isinstance(response, dict):
+                    # Search through response and its nested structures
+                    soc = find_soc(response)
+                    if soc is not None:
+                        self._soc_methods[device_sn] = answered
+                        response["SOC"] = soc
+                        return response
+
+                    logger.debug("No battery percentage found in response data")
 
+            # If we get here, we couldn't get valid data
+            error_msg = "Could not find battery percentage data"
+            if error_message:
+                error_msg += f" (Last error: {error_message})"
+            raise GrowattAPIError(f"{error_msg} for device {device_sn}")
+
+        except GrowattAPIError:
+            raise
         except Exception as e:
-            raise GrowattAPIError(f"Failed to get system status: {str(e)}")
+            raise GrowattAPIError(f"Failed to get status for device {device_sn}: {e}") from e
 
     @retry_with_backoff(retries=3, backoff_in_seconds=2)
     def update_system_time(self, device_sn: str, timestamp: str) -> Dict[str, Any]:
@@ -277,6 +450,8 @@ class GrowattAPI:
         Raises:
             GrowattAPIError: If API call fails
         """
+        self.ensure_authenticated()
+
         try:
             response = self._api.update_mix_inverter_setting(
                 device_sn, "mix_time_setting", {"param1": timestamp}
@@ -289,7 +464,7 @@ class GrowattAPI:
             return response
 
         except Exception as e:
-            raise GrowattAPIError(f"Failed to update system time: {str(e)}")
+            raise GrowattAPIError(f"Failed to update system time: {e}") from e
 
     @retry_with_backoff(retries=3, backoff_in_seconds=2)
     def update_charge_settings(
@@ -323,60 +498,42 @@ class GrowattAPI:
         if not (0 <= target_soc <= 100):
             raise ValueError("target_soc must be between 0 and 100")
 
+        self.ensure_authenticated()
+
         try:
             # Update AC charging settings for SPA device
-            try:
-                # Format times as strings
-                # start_time = f"{schedule_start[0]:02d}:{schedule_start[1]:02d}"
-                # end_time = f"{schedule_end[0]:02d}:{schedule_end[1]:02d}"
-
-                # Format parameters for API call
-                params = {
-                    "param1": str(int(charge_rate)),  # Charge rate %
-                    "param2": str(int(target_soc)),  # Stop SOC
-                    "param3": f"{schedule_start[0]:02d}",  # Start hour (slot 1)
-                    "param4": f"{schedule_start[1]:02d}",  # Start minute (slot 1)
-                    "param5": f"{schedule_end[0]:02d}",  # End hour (slot 1)
-                    "param6": f"{schedule_end[1]:02d}",  # End minute (slot 1)
-                    "param7": "1",  # Enable slot 1
-                    "param8": "00",  # Start hour (slot 2)
-                    "param9": "00",  # Start minute (slot 2)
-                    "param10": "00",  # End hour (slot 2)
-                    "param11": "00",  # End minute (slot 2)
-                    "param12": "0",  # Disable slot 2
-                    "param13": "00",  # Start hour (slot 3)
-                    "param14": "00",  # Start minute (slot 3)
-                    "param15": "00",  # End hour (slot 3)
-                    "param16": "00",  # End minute (slot 3)
-                    "param17": "0",  # Disable slot 3
-                }
-
-                # Use the API's method to update settings
-                print(f"DEBUG: Updating AC inverter settings with params: {params}")
-                response = self._api.update_ac_inverter_setting(
-                    device_sn, "spa_ac_charge_time_period", params
-                )
-
-                print(f"DEBUG: API response: {response}")
-
-                # Check response
-                if not response or not response.get("success"):
-                    error_msg = response.get("msg", "Unknown error") if response else "No response"
-                    raise GrowattAPIError(f"Failed to update settings: {error_msg}")
+            # Format parameters for API call
+            # Slots 2 and 3 are sent disabled
+            params = {
+                "param1": str(int(charge_rate)),  # Charge rate %
+                "param2": str(int(target_soc)),  # Stop SOC
+                **_DISABLED_SLOT_PARAMS,
+                "param3": f"{schedule_start[0]:02d}",  # Start hour (slot 1)
+                "param4": f"{schedule_start[1]:02d}",  # Start minute (slot 1)
+                "param5": f"{schedule_end[0]:02d}",  # End hour (slot 1)
+                "param6": f"{schedule_end[1]:02d}",  # End minute (slot 1)
+                "param7": "1",  # Enable slot 1
+            }
 
-                return response
+            # Use the API's method to update settings
+            logger.debug("Updating AC inverter settings with params: %s", params)
+            response = self._api.update_ac_inverter_setting(
+                device_sn, "spa_ac_charge_time_period", params
+            )
 
-            except Exception as e:
-                raise GrowattAPIError(f"Failed to update settings: {str(e)}")
+            logger.debug("API response: %s", response)
 
-            if not response.get("success"):
-                msg = response.get("msg", "No error message provided")
-                raise GrowattAPIError(f"Failed to update charge settings: {msg}")
+            # Check response
+            if not response or not response.get("success"):
+                error_msg = response.get("msg", "Unknown error") if response else "No response"
+                raise GrowattAPIError(f"Failed to update settings: {error_msg}")
 
             return response
 
+        except GrowattAPIError:
+            raise
         except Exception as e:
-            raise GrowattAPIError(f"Failed to update charge settings: {str(e)}")
+            raise GrowattAPIError(f"Failed to update charge settings: {e}") from e
 
     @retry_with_backoff(retries=3, backoff_in_seconds=2)
     def update_charge_settings_with_slot(
@@ -430,12 +587,16 @@ class GrowattAPI:
         if not (0 <= target_soc <= 100):
             raise ValueError("target_soc must be between 0 and 100")
 
+        self.ensure_authenticated()
+
         try:
             # Build params for all three slots
             # The API requires complete param set (param3-17), but we only modify target slot
+            # Every slot starts disabled; only the ones we configure are overwritten
             params = {
                 "param1": str(int(charge_rate)),  # Charge rate %
                 "param2": str(int(target_soc)),  # Stop SOC
+                **_DISABLED_SLOT_PARAMS,
             }
 
             # Slots are configured as:
@@ -456,16 +617,6 @@ class GrowattAPI:
             start_idx = config["start_idx"]
             enable_idx = config["enable_idx"]
 
-            # Initialize all slots with disabled state (default for slots we're not updating)
-            for slot in range(3):
-                slot_cfg = slot_configs[slot]
-                # Set default disabled state for all slots
-                params[f'param{slot_cfg["start_idx"]}'] = "00"  # Start hour
-                params[f'param{slot_cfg["start_idx"] + 1}'] = "00"  # Start minute
-                params[f'param{slot_cfg["start_idx"] + 2}'] = "00"  # End hour
-                params[f'param{slot_cfg["start_idx"] + 3}'] = "00"  # End minute
-                params[f'param{slot_cfg["enable_idx"]}'] = "0"  # Disabled
-
             # If requested, preserve slot 0 with provided schedule
             if preserve_slot_0 and slot_number != 0:
                 slot_0_cfg = slot_configs[0]
@@ -492,9 +643,8 @@ class GrowattAPI:
             )
 
             # Debug: show what we're sending
-            logger.debug(f"Slot {slot_number} params being sent: {sorted(params.items())}")
-
-            print(f"DEBUG: Sending params for slot {slot_number}: {params}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Slot %s params being sent: %s", slot_number, sorted(params.items()))
 
             response = self._api.update_ac_inverter_setting(
                 device_sn, "spa_ac_charge_time_period", params
@@ -509,4 +659,4 @@ class GrowattAPI:
         except GrowattAPIError:
             raise
         except Exception as e:
-            raise GrowattAPIError(f"Failed to update charge settings with slot: {str(e)}")
+            raise GrowattAPIError(f"Failed to update charge settings with slot: {e}") from e
@@ -4,7 +4,7 @@ import asyncio
 import os
 import sys
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from modules.api_usage_tracker import get_global_tracker
 from modules.data_logger import DataLogger
@@ -18,9 +18,13 @@ from .config import ConfigManager
 from .utils import (
     GrowattAPIError,
     GrowattAuthError,
+    run_async,
     setup_logging,
 )
 
+# Checked once per process; the answer can't change while we run
+_IN_DOCKER = os.path.exists("/.dockerenv")
+
 
 class GrowattCharger:
     """Main application class for the Growatt Weather Based Charger."""
@@ -35,12 +39,8 @@ class GrowattCharger:
         # Set up logging first
         project_root = os.path.dirname(os.path.dirname(config_path))
 
-        # In a standard installation, use the project's logs directory
-        log_dir = os.path.join(project_root, "logs")
-
-        # Override for Docker environment
-        if os.path.exists("/.dockerenv"):
-            log_dir = "/opt/growatt-charger/logs"
+        # Docker has a fixed logs directory; otherwise use the project's logs directory
+        log_dir = "/opt/growatt-charger/logs" if _IN_DOCKER else os.path.join(project_root, "logs")
 
         self.logger = setup_logging(
             log_dir=log_dir,
@@ -66,26 +66,25 @@ class GrowattCharger:
             # Initialize forecast manager with multi-provider support
             providers_config = self.config.forecast_providers
             self.logger.info(
-                f"Initializing forecast providers: {', '.join(providers_config.providers)}"
+                "Initializing forecast providers: %s", ", ".join(providers_config.providers)
             )
             self.forecast_manager = ForecastManager(
                 self.config,
                 providers=providers_config.providers,
                 primary_provider=providers_config.primary_provider,
                 cache=self.forecast_cache,
+                prefetch=True,
             )
-            self.logger.info(f"Primary provider: {providers_config.primary_provider}")
+            self.logger.info("Primary provider: %s", providers_config.primary_provider)
 
             # Initialize forecast calculator (uses forecast manager)
             self.forecast_calculator = ForecastCalculator(self.forecast_manager, self.config)
 
             # Initialize data logger
-            project_root = os.path.dirname(os.path.dirname(config_path))
             output_dir = os.path.join(project_root, "output")
             self.data_logger = DataLogger(output_dir)
 
             # Run log maintenance (CSV retention + cache sweep)
-            cache_dir = os.path.join(project_root, self.config.cache.cache_dir)
             LogMaintenance(
                 output_dir=output_dir,
                 cache_dir=cache_dir,
@@ -98,11 +97,15 @@ class GrowattCharger:
             self.device_sn: Optional[str] = None
 
         except Exception as e:
-            self.logger.error(f"Failed to initialize application: {e}")
+            self.logger.error("Failed to initialize application: %s", e)
             raise
 
     async def run(self) -> None:
         """Run the main application logic."""
+        # One clock reading for the whole run, so every row agrees on the dates
+        now = datetime.now()
+        tomorrow = f"{now + timedelta(days=1):%Y-%m-%d}"
+
         try:
             # Login to Growatt API
             await self._login()
@@ -110,42 +113,44 @@ class GrowattCharger:
             # Get device information if not provided in config
             await self._get_device_info()
 
-            # Log yesterday's actual generation (if this is a new day)
-            self._log_previous_day_actual()
+            # Reading the inverter and fetching the provider comparison don't depend on
+            # each other, so their requests overlap instead of running back to back
+            (plant_info, current_charge), all_forecasts = await asyncio.gather(
+                self._read_inverter(),
+                self._get_all_forecasts(),
+            )
 
-            # Get current charge status
-            current_charge = await self._get_current_charge()
+            # Log yesterday's actual generation (if this is a new day)
+            if plant_info is not None:
+                self._log_previous_day_actual(plant_info, current_charge, now)
 
             # Calculate target charge using forecast
             charge_plan = await self._calculate_target_charge(current_charge)
 
-            # Get all provider forecasts if multi-provider mode enabled
-            all_forecasts = {}
             provider_used = self.forecast_manager.primary_provider_name
 
-            if self.config.forecast_providers.log_all_providers:
-                self.logger.info("Fetching forecasts from all providers for comparison...")
-                all_forecasts = self.forecast_calculator.get_all_tomorrow_forecasts()
-
+            if all_forecasts:
                 # Log provider comparison
-                tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
                 self.data_logger.log_provider_forecasts(tomorrow, all_forecasts, provider_used)
 
                 # Log comparison in main log
                 for prov, fc in all_forecasts.items():
                     if fc is not None:
-                        self.logger.info(f"  {prov}: {fc:.0f}Wh ({fc/1000:.2f}kWh)")
+                        self.logger.info("  %s: %.0fWh (%.2fkWh)", prov, fc, fc / 1000)
 
             # Log the prediction for tomorrow
-            self._log_prediction(current_charge, charge_plan, provider_used, all_forecasts)
+            self._log_prediction(
+                current_charge, charge_plan, tomorrow, provider_used, all_forecasts
+            )
 
             # Log the charging plan
             self.logger.info(
-                f"Charge plan calculated - "
-                f"Forecast: {charge_plan['forecast_wh']:.0f}Wh, "
-                f"Solar coverage: {charge_plan['solar_coverage_pct']:.1f}%, "
-                f"Target SOC: {charge_plan['target_soc']}%, "
-                f"Charge rate: {charge_plan['charge_rate_pct']}%"
+                "Charge plan calculated - Forecast: %.0fWh, Solar coverage: %.1f%%, "
+                "Target SOC: %s%%, Charge rate: %s%%",
+                charge_plan["forecast_wh"],
+                charge_plan["solar_coverage_pct"],
+                charge_plan["target_soc"],
+                charge_plan["charge_rate_pct"],
             )
 
             # Update charge settings if needed
@@ -153,8 +158,9 @@ class GrowattCharger:
                 await self._update_charge_settings(charge_plan)
             else:
                 self.logger.info(
-                    f"No update needed - current SOC ({current_charge:.1f}%) "
-                    f"is close to target ({charge_plan['target_soc']}%)"
+                    "No update needed - current SOC (%.1f%%) is close to target (%s%%)",
+                    current_charge,
+                    charge_plan["target_soc"],
                 )
 
             # Generate performance summary
@@ -162,23 +168,27 @@ class GrowattCharger:
             self.data_logger.print_recent_summary(days=7)
 
         except Exception as e:
-            self.logger.error(f"Application error: {e}")
+            self.logger.error("Application error: %s", e)
             raise
+        finally:
+            self.api.close()
+            self.data_logger.close()
 
     async def _login(self) -> None:
         """Login to Growatt API."""
         try:
             growatt_config = self.config.growatt
-            # response = self.api.login(growatt_config.username, growatt_config.password)
-            self.api.login(growatt_config.username, growatt_config.password)
+            await asyncio.to_thread(
+                self.api.login, growatt_config.username, growatt_config.password
+            )
             self.logger.info("Successfully logged in to Growatt API")
 
         except GrowattAuthError as e:
-            self.logger.error(f"Authentication failed: {e}")
+            self.logger.error("Authentication failed: %s", e)
             raise
 
         except Exception as e:
-            self.logger.error(f"Unexpected error during login: {e}")
+            self.logger.error("Unexpected error during login: %s", e)
             raise
 
     async def _get_device_info(self) -> None:
@@ -191,28 +201,70 @@ class GrowattCharger:
                 self.plant_id = growatt_config.plant_id
                 self.device_sn = growatt_config.device_sn
                 self.logger.info(
-                    f"Using configured plant_id: {self.plant_id}, " f"device_sn: {self.device_sn}"
+                    "Using configured plant_id: %s, device_sn: %s", self.plant_id, self.device_sn
                 )
                 return
 
             # Otherwise fetch from API
-            device_info = self.api.get_device_info()
+            device_info = await asyncio.to_thread(self.api.get_device_info)
             self.plant_id = device_info["plant_id"]
             self.device_sn = device_info["device_sn"]
 
             self.logger.info(
-                f"Retrieved device info - plant_id: {self.plant_id}, "
-                f"device_sn: {self.device_sn}"
+                "Retrieved device info - plant_id: %s, device_sn: %s",
+                self.plant_id,
+                self.device_sn,
             )
 
         except GrowattAPIError as e:
-            self.logger.error(f"Failed to get device info: {e}")
+            self.logger.error("Failed to get device info: %s", e)
             raise
 
         except Exception as e:
-            self.logger.error(f"Unexpected error getting device info: {e}")
+            self.logger.error("Unexpected error getting device info: %s", e)
             raise
 
+    async def _read_inverter(self) -> Tuple[Optional[Dict[str, Any]], float]:
+        """
+        Get today's plant totals, then the current battery charge.
+
+        The status lookup reuses the plant info response fetched just before it.
+
+        Returns:
+            Tuple of (plant info or None, current charge percentage)
+        """
+        plant_info = await self._get_plant_info()
+        current_charge = await self._get_current_charge()
+        return plant_info, current_charge
+
+    async def _get_plant_info(self) -> Optional[Dict[str, Any]]:
+        """
+        Get plant info with today's generation and charge totals.
+
+        Returns:
+            Plant info, or None if it couldn't be fetched
+        """
+        try:
+            return await asyncio.to_thread(self.api.get_plant_info, self.plant_id)
+
+        except Exception as e:
+            self.logger.warning("Could not log previous day actual: %s", e)
+            # Don't raise - this is only needed for optional logging
+            return None
+
+    async def _get_all_forecasts(self) -> Dict[str, float]:
+        """
+        Get tomorrow's forecast from every provider if multi-provider mode is enabled.
+
+        Returns:
+            Dictionary of provider name to forecast Wh (empty if disabled)
+        """
+        if not self.config.forecast_providers.log_all_providers:
+            return {}
+
+        self.logger.info("Fetching forecasts from all providers for comparison...")
+        return await asyncio.to_thread(self.forecast_calculator.get_all_tomorrow_forecasts)
+
     async def _get_current_charge(self) -> float:
         """
         Get current battery charge level.
@@ -221,14 +273,16 @@ class GrowattCharger:
             Current charge percentage
         """
         try:
-            status = self.api.get_system_status(self.device_sn, self.plant_id)
+            status = await asyncio.to_thread(
+                self.api.get_system_status, self.device_sn, self.plant_id
+            )
             current_charge = float(status["SOC"])
 
-            self.logger.info(f"Current battery charge: {current_charge}%")
+            self.logger.info("Current battery charge: %s%%", current_charge)
             return current_charge
 
         except Exception as e:
-            self.logger.error(f"Failed to get current charge: {e}")
+            self.logger.error("Failed to get current charge: %s", e)
             raise
 
     async def _calculate_target_charge(self, current_soc: float) -> Dict[str, Any]:
@@ -244,31 +298,26 @@ class GrowattCharger:
         try:
             # Get tomorrow's forecast and calculate optimal charge plan
             self.logger.info("Fetching tomorrow's solar forecast...")
-            charge_plan = self.forecast_calculator.calculate_optimal_charge_plan(
-                current_soc=current_soc
+            charge_plan = await asyncio.to_thread(
+                self.forecast_calculator.calculate_optimal_charge_plan, current_soc=current_soc
             )
 
             return charge_plan
 
         except Exception as e:
-            self.logger.error(f"Failed to calculate target charge: {e}")
+            self.logger.error("Failed to calculate target charge: %s", e)
             self.logger.warning("Falling back to maximum charge configuration")
 
             # Fallback to simple configuration-based approach
             growatt_config = self.config.growatt
             tariff_config = self.config.tariff
 
-            # Parse times for off-peak duration
-            start = datetime.strptime(tariff_config.off_peak_start_time, "%H:%M")
-            end = datetime.strptime(tariff_config.off_peak_end_time, "%H:%M")
-            off_peak_hours = (end - start).seconds / 3600
-
             return {
                 "target_soc": growatt_config.maximum_charge_pct,
                 "charge_rate_pct": 100,
                 "forecast_wh": 0,
                 "solar_coverage_pct": 0,
-                "off_peak_hours": off_peak_hours,
+                "off_peak_hours": tariff_config.off_peak_hours,
             }
 
     def _should_update_settings(self, current_charge: float, target_charge: float) -> bool:
@@ -283,14 +332,15 @@ class GrowattCharger:
             True if settings should be updated
         """
         # Update if target is higher than current (need to charge)
-        # or if there's a significant difference (more than 5%)
-        should_update = (target_charge > current_charge) or (
-            abs(current_charge - target_charge) > 5
-        )
+        # or if current is more than 5% above target
+        diff = target_charge - current_charge
+        should_update = diff > 0 or diff < -5
 
         if should_update:
             self.logger.info(
-                f"Settings update needed - current: {current_charge}%, " f"target: {target_charge}%"
+                "Settings update needed - current: %s%%, target: %s%%",
+                current_charge,
+                target_charge,
             )
         else:
             self.logger.info("No settings update needed")
@@ -308,24 +358,24 @@ class GrowattCharger:
             growatt_config = self.config.growatt
             tariff_config = self.config.tariff
 
-            # Parse time strings
-            start_hour, start_minute = map(int, tariff_config.off_peak_start_time.split(":"))
-            end_hour, end_minute = map(int, tariff_config.off_peak_end_time.split(":"))
+            start_hour, start_minute = tariff_config.off_peak_start
+            end_hour, end_minute = tariff_config.off_peak_end
 
             # Get charge rate from plan with efficiency compensation
             # Based on collected data, actual charge is ~50-60% of expected
             # Apply 2x multiplier to compensate
-            max_rate_pct = (growatt_config.maximum_charge_rate_w / 3000.0) * 100
             charge_rate_pct = min(100, int(charge_plan["charge_rate_pct"] * 2.0))
-            charge_rate_pct = min(charge_rate_pct, max_rate_pct)
+            charge_rate_pct = min(charge_rate_pct, growatt_config.maximum_charge_rate_pct)
 
             self.logger.info(
-                f"Charge rate calculated: {charge_plan['charge_rate_pct']}%, "
-                f"adjusted to {charge_rate_pct}% (2x efficiency compensation)"
+                "Charge rate calculated: %s%%, adjusted to %s%% (2x efficiency compensation)",
+                charge_plan["charge_rate_pct"],
+                charge_rate_pct,
             )
 
             # Update charge settings
-            self.api.update_charge_settings(
+            await asyncio.to_thread(
+                self.api.update_charge_settings,
                 device_sn=self.device_sn,
                 charge_rate=int(charge_rate_pct),
                 target_soc=int(charge_plan["target_soc"]),
@@ -334,21 +384,32 @@ class GrowattCharger:
             )
 
             self.logger.info(
-                f"Successfully updated charge settings - "
-                f"Rate: {charge_rate_pct:.0f}%, SOC: {charge_plan['target_soc']}%, "
-                f"Schedule: {start_hour:02d}:{start_minute:02d} to {end_hour:02d}:{end_minute:02d}"
+                "Successfully updated charge settings - Rate: %.0f%%, SOC: %s%%, "
+                "Schedule: %02d:%02d to %02d:%02d",
+                charge_rate_pct,
+                charge_plan["target_soc"],
+                start_hour,
+                start_minute,
+                end_hour,
+                end_minute,
             )
 
         except Exception as e:
-            self.logger.error(f"Failed to update charge settings: {e}")
+            self.logger.error("Failed to update charge settings: %s", e)
             raise
 
-    def _log_previous_day_actual(self) -> None:
-        """Log yesterday's actual generation data."""
-        try:
-            # Get plant info which contains today's generation and charge data
-            plant_info = self.api.get_plant_info(self.plant_id)
+    def _log_previous_day_actual(
+        self, plant_info: Dict[str, Any], evening_soc: float, now: datetime
+    ) -> None:
+        """
+        Log yesterday's actual generation data.
 
+        Args:
+            plant_info: Plant info containing today's generation and charge data
+            evening_soc: Current battery SOC, read this run
+            now: Time this run started
+        """
+        try:
             # todayEnergy is in kWh as a string
             today_energy_kwh = float(plant_info.get("todayEnergy", 0))
             today_energy_wh = today_energy_kwh * 1000
@@ -362,11 +423,7 @@ class GrowattCharger:
             charge_energy_wh = charge_energy_kwh * 1000
 
             # We run at 22:00, so "today" in the API is the day we're logging actuals for
-            today = datetime.now().strftime("%Y-%m-%d")
-
-            # Get current SOC as "evening SOC"
-            status = self.api.get_system_status(self.device_sn, self.plant_id)
-            evening_soc = float(status.get("SOC", 0))
+            today = f"{now:%Y-%m-%d}"
 
             # Try to get morning SOC from yesterday's prediction
             # The morning SOC should be close to current evening SOC
@@ -376,20 +433,12 @@ class GrowattCharger:
             actual_soc_increase = None
 
             try:
-                import csv
-
-                if os.path.isfile(self.data_logger.predictions_file):
-                    with open(self.data_logger.predictions_file, "r", encoding="utf-8") as f:
-                        reader = csv.DictReader(f)
-                        for row in reader:
-                            if row["Prediction Date"] == today:
-                                morning_soc = float(
-                                    row["Current SOC (%)"]
-                                )  # SOC when prediction was made (before charging)
-                                expected_soc = float(
-                                    row["Target SOC (%)"]
-                                )  # Expected SOC after charging
-                                break
+                prediction = self.data_logger.get_prediction(today)
+                if prediction is not None:
+                    # SOC when prediction was made (before charging)
+                    morning_soc = float(prediction["Current SOC (%)"])
+                    # Expected SOC after charging
+                    expected_soc = float(prediction["Target SOC (%)"])
 
                 # Now we need to estimate SOC after charging (this morning)
                 # We can calculate this from charge energy
@@ -402,17 +451,20 @@ class GrowattCharger:
                     )
 
                     self.logger.info(
-                        f"Charge analysis - Started: {morning_soc:.1f}%, "
-                        f"Charged {charge_energy_wh:.0f}Wh ({soc_from_charge:.1f}%), "
-                        f"Should be at: {estimated_morning_after_charge:.1f}%, "
-                        f"Target was: {expected_soc:.1f}%"
+                        "Charge analysis - Started: %.1f%%, Charged %.0fWh (%.1f%%), "
+                        "Should be at: %.1f%%, Target was: %.1f%%",
+                        morning_soc,
+                        charge_energy_wh,
+                        soc_from_charge,
+                        estimated_morning_after_charge,
+                        expected_soc,
                     )
 
             except Exception as e:
-                self.logger.debug(f"Could not calculate charge increase: {e}")
+                self.logger.debug("Could not calculate charge increase: %s", e)
 
             if today_energy_wh > 0:  # Only log if we have actual data
-                log_time = datetime.now().strftime("%H:%M")
+                log_time = f"{now:%H:%M}"
                 self.data_logger.log_actual(
                     actual_date=today,  # Log for TODAY, not yesterday
                     actual_generation_wh=today_energy_wh,
@@ -424,24 +476,24 @@ class GrowattCharger:
                 )
 
                 log_msg = (
-                    f"Logged yesterday's actuals - "
-                    f"Generated: {today_energy_wh:.0f}Wh, "
-                    f"Charged: {charge_energy_wh:.0f}Wh, "
-                    f"SOC: {evening_soc:.1f}%"
+                    "Logged yesterday's actuals - Generated: %.0fWh, Charged: %.0fWh, SOC: %.1f%%"
                 )
+                log_args = [today_energy_wh, charge_energy_wh, evening_soc]
                 if actual_soc_increase:
-                    log_msg += f" (increased {actual_soc_increase:.1f}%)"
+                    log_msg += " (increased %.1f%%)"
+                    log_args.append(actual_soc_increase)
 
-                self.logger.info(log_msg)
+                self.logger.info(log_msg, *log_args)
 
         except Exception as e:
-            self.logger.warning(f"Could not log previous day actual: {e}")
+            self.logger.warning("Could not log previous day actual: %s", e)
             # Don't raise - this is optional logging
 
     def _log_prediction(
         self,
         current_soc: float,
         charge_plan: Dict[str, Any],
+        prediction_date: str,
         provider_used: str = None,
         all_forecasts: Dict[str, float] = None,
     ) -> None:
@@ -451,16 +503,16 @@ class GrowattCharger:
         Args:
             current_soc: Current battery SOC
             charge_plan: Calculated charge plan
+            prediction_date: Tomorrow's date in YYYY-MM-DD format
             provider_used: Name of provider used for decision
             all_forecasts: All provider forecasts (if multi-provider mode)
         """
         try:
-            tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
             tariff_config = self.config.tariff
             growatt_config = self.config.growatt
 
             self.data_logger.log_prediction(
-                prediction_date=tomorrow,
+                prediction_date=prediction_date,
                 forecast_wh=charge_plan["forecast_wh"],
                 solar_coverage_pct=charge_plan["solar_coverage_pct"],
                 current_soc=current_soc,
@@ -474,10 +526,10 @@ class GrowattCharger:
                 all_provider_forecasts=all_forecasts,
             )
 
-            self.logger.info(f"Logged prediction for {tomorrow}")
+            self.logger.info("Logged prediction for %s", prediction_date)
 
         except Exception as e:
-            self.logger.warning(f"Could not log prediction: {e}")
+            self.logger.warning("Could not log prediction: %s", e)
             # Don't raise - this is optional logging
 
 
@@ -499,7 +551,7 @@ def main():
 
     try:
         app = GrowattCharger(config_path)
-        asyncio.run(app.run())
+        run_async(app.run())
 
     except Exception as e:
         print(f"Application failed: {e}")
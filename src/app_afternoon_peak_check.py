@@ -18,7 +18,10 @@ from modules.peak_window_boost import (
 
 from .api import GrowattAPI
 from .config import ConfigManager
-from .utils import GrowattAPIError, setup_logging
+from .utils import GrowattAPIError, run_async, setup_logging
+
+# Checked once per process; the answer can't change while we run
+_IN_DOCKER = os.path.exists("/.dockerenv")
 
 
 class AfternoonPeakChecker:
@@ -33,11 +36,9 @@ class AfternoonPeakChecker:
         """
         # Set up logging first
         project_root = os.path.dirname(os.path.dirname(config_path))
-        log_dir = os.path.join(project_root, "logs")
 
-        # Override for Docker
-        if os.path.exists("/.dockerenv"):
-            log_dir = "/opt/growatt-charger/logs"
+        # Docker has a fixed logs directory; otherwise use the project's logs directory
+        log_dir = "/opt/growatt-charger/logs" if _IN_DOCKER else os.path.join(project_root, "logs")
 
         self.logger = setup_logging(
             log_dir=log_dir,
@@ -70,6 +71,7 @@ class AfternoonPeakChecker:
                 providers=providers_config.providers,
                 primary_provider=providers_config.primary_provider,
                 cache=self.forecast_cache,
+                prefetch=True,
             )
 
             # Initialize data logger
@@ -182,12 +184,16 @@ class AfternoonPeakChecker:
         except Exception as e:
             self.logger.error(f"Afternoon peak check failed: {e}")
             raise
+        finally:
+            self.api.close()
 
     async def _login(self) -> None:
         """Login to Growatt API."""
         try:
             growatt_config = self.config.growatt
-            self.api.login(growatt_config.username, growatt_config.password)
+            await asyncio.to_thread(
+                self.api.login, growatt_config.username, growatt_config.password
+            )
             self.logger.info("Successfully logged in to Growatt API")
         except GrowattAPIError as e:
             self.logger.error(f"Authentication failed: {e}")
@@ -206,7 +212,7 @@ class AfternoonPeakChecker:
                 )
                 return
 
-            device_info = self.api.get_device_info()
+            device_info = await asyncio.to_thread(self.api.get_device_info)
             self.plant_id = device_info["plant_id"]
             self.device_sn = device_info["device_sn"]
 
@@ -222,7 +228,9 @@ class AfternoonPeakChecker:
     async def _get_current_soc(self) -> float:
         """Get current battery SOC at 14:00."""
         try:
-            status = self.api.get_system_status(self.device_sn, self.plant_id)
+            status = await asyncio.to_thread(
+                self.api.get_system_status, self.device_sn, self.plant_id
+            )
             current_soc = float(status["SOC"])
             self.logger.debug(f"Current battery SOC: {current_soc}%")
             return current_soc
@@ -246,7 +254,9 @@ class AfternoonPeakChecker:
             # Try primary provider (e.g., Solcast)
             today = datetime.now()
             try:
-                forecast_wh, provider_used = self.forecast_manager.get_forecast_for_date(today)
+                forecast_wh, provider_used = await asyncio.to_thread(
+                    self.forecast_manager.get_forecast_for_date, today
+                )
                 self.logger.info(
                     f"Remaining forecast: {forecast_wh/1000:.1f}kWh from {provider_used}"
                 )
@@ -310,8 +320,8 @@ class AfternoonPeakChecker:
             # Get hourly forecast from provider
             try:
                 today = datetime.now()
-                hourly_forecast, provider = self.forecast_manager.get_hourly_forecast_for_date(
-                    today
+                hourly_forecast, provider = await asyncio.to_thread(
+                    self.forecast_manager.get_hourly_forecast_for_date, today
                 )
 
                 # Sum up generation from now until peak window ends
@@ -427,15 +437,12 @@ class AfternoonPeakChecker:
 
             # Get off-peak schedule from config to preserve slot 0
             tariff_config = self.config.tariff
-            off_peak_start_hour, off_peak_start_min = map(
-                int, tariff_config.off_peak_start_time.split(":")
-            )
-            off_peak_end_hour, off_peak_end_min = map(
-                int, tariff_config.off_peak_end_time.split(":")
-            )
+            off_peak_start_hour, off_peak_start_min = tariff_config.off_peak_start
+            off_peak_end_hour, off_peak_end_min = tariff_config.off_peak_end
 
             # Call API with slot-specific parameters, preserving slot 0
-            self.api.update_charge_settings_with_slot(
+            await asyncio.to_thread(
+                self.api.update_charge_settings_with_slot,
                 device_sn=self.device_sn,
                 charge_rate=boost_charge_rate,
                 target_soc=int(target_soc),
@@ -472,14 +479,12 @@ class AfternoonPeakChecker:
         """Log the peak-window decision to file for analysis."""
         try:
             log_file = os.path.join(self.data_logger.output_dir, "peak_decisions.csv")
-            file_exists = os.path.isfile(log_file)
-
             import csv
 
             with open(log_file, "a", newline="", encoding="utf-8") as f:
                 writer = csv.writer(f)
 
-                if not file_exists:
+                if f.tell() == 0:
                     writer.writerow(
                         [
                             "Date",
@@ -543,4 +548,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_async(main())
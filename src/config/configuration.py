@@ -3,12 +3,34 @@
 import os
 import re
 from configparser import ConfigParser
-from dataclasses import dataclass
-from datetime import datetime
-from typing import List, Optional
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import List, Optional, Tuple
 
 from ..utils.exceptions import GrowattConfigError
 
+MINUTES_PER_DAY = 24 * 60
+
+# Charge power the inverter's 100% charge rate setting corresponds to
+FULL_CHARGE_RATE_W = 3000.0
+
+
+def _hhmm_to_minutes(value: str) -> int:
+    """
+    Convert a validated H:MM or HH:MM string to minutes past midnight.
+
+    Plain digit arithmetic on the fixed-position characters; much cheaper than
+    strptime for this trivially-shaped input.
+    """
+    if len(value) == 4:  # single-digit hour, e.g. "2:30"
+        value = "0" + value
+    return (
+        (ord(value[0]) - 48) * 600
+        + (ord(value[1]) - 48) * 60
+        + (ord(value[3]) - 48) * 10
+        + (ord(value[4]) - 48)
+    )
+
 
 @dataclass
 class GrowattConfig:
@@ -25,6 +47,9 @@ class GrowattConfig:
     maximum_charge_rate_w: int
     average_load_w: int
 
+    # Derived from maximum_charge_rate_w once validated
+    maximum_charge_rate_pct: float = field(init=False, repr=False)
+
     def __post_init__(self):
         """Validate configuration after initialization."""
         self._validate_percentage("statement_of_charge_pct")
@@ -41,6 +66,8 @@ class GrowattConfig:
                 f"maximum_charge_pct ({self.maximum_charge_pct})"
             )
 
+        self.maximum_charge_rate_pct = (self.maximum_charge_rate_w / FULL_CHARGE_RATE_W) * 100
+
     def _validate_percentage(self, field_name: str):
         """Validate that a field contains a valid percentage (0-100)."""
         value = getattr(self, field_name)
@@ -61,12 +88,29 @@ class TariffConfig:
     off_peak_start_time: str
     off_peak_end_time: str
 
+    # Derived from the times above once validated
+    off_peak_start_minutes: int = field(init=False, repr=False)
+    off_peak_end_minutes: int = field(init=False, repr=False)
+    off_peak_start: Tuple[int, int] = field(init=False, repr=False)  # (hour, minute)
+    off_peak_end: Tuple[int, int] = field(init=False, repr=False)  # (hour, minute)
+    off_peak_hours: float = field(init=False, repr=False)
+
     def __post_init__(self):
         """Validate configuration after initialization."""
         self._validate_time_format("off_peak_start_time")
         self._validate_time_format("off_peak_end_time")
+        self.off_peak_start_minutes = _hhmm_to_minutes(self.off_peak_start_time)
+        self.off_peak_end_minutes = _hhmm_to_minutes(self.off_peak_end_time)
+        self.off_peak_start = divmod(self.off_peak_start_minutes, 60)
+        self.off_peak_end = divmod(self.off_peak_end_minutes, 60)
         self._validate_time_order()
 
+        # Modulo keeps a window that wraps midnight (e.g. 23:30-05:30) positive
+        duration_minutes = (
+            self.off_peak_end_minutes - self.off_peak_start_minutes
+        ) % MINUTES_PER_DAY
+        self.off_peak_hours = duration_minutes / 60
+
     def _validate_time_format(self, field_name: str):
         """Validate time format (HH:MM)."""
         value = getattr(self, field_name)
@@ -75,9 +119,7 @@ class TariffConfig:
 
     def _validate_time_order(self):
         """Validate that start time is before end time."""
-        start = datetime.strptime(self.off_peak_start_time, "%H:%M")
-        end = datetime.strptime(self.off_peak_end_time, "%H:%M")
-        if start >= end:
+        if self.off_peak_start_minutes >= self.off_peak_end_minutes:
             raise GrowattConfigError(
                 f"off_peak_start_time ({self.off_peak_start_time}) must be before "
                 f"off_peak_end_time ({self.off_peak_end_time})"
@@ -111,9 +153,9 @@ class PeakWindowConfig:
 
     def _validate_time_order(self):
         """Validate that check time is before peak window."""
-        check = datetime.strptime(self.check_time, "%H:%M")
-        peak_start = datetime.strptime(self.peak_start_time, "%H:%M")
-        peak_end = datetime.strptime(self.peak_end_time, "%H:%M")
+        check = _hhmm_to_minutes(self.check_time)
+        peak_start = _hhmm_to_minutes(self.peak_start_time)
+        peak_end = _hhmm_to_minutes(self.peak_end_time)
 
         if peak_start >= peak_end:
             raise GrowattConfigError(
@@ -137,10 +179,9 @@ class PeakWindowConfig:
 
     def get_peak_window_duration_hours(self) -> float:
         """Calculate the duration of the peak window in hours."""
-        start = datetime.strptime(self.peak_start_time, "%H:%M")
-        end = datetime.strptime(self.peak_end_time, "%H:%M")
-        duration_seconds = (end - start).seconds
-        return duration_seconds / 3600
+        start = _hhmm_to_minutes(self.peak_start_time)
+        end = _hhmm_to_minutes(self.peak_end_time)
+        return ((end - start) % MINUTES_PER_DAY) / 60
 
 
 @dataclass
@@ -413,9 +454,9 @@ class ConfigManager:
 
         return SolcastConfig(api_key=api_key, resource_id=resource_id if resource_id else None)
 
-    @property
+    @cached_property
     def growatt(self) -> GrowattConfig:
-        """Get validated Growatt configuration."""
+        """Get validated Growatt configuration (parsed on first use)."""
         section = self.config["growatt"]
 
         return GrowattConfig(
@@ -431,9 +472,9 @@ class ConfigManager:
             average_load_w=section.getint("average_load_w"),
         )
 
-    @property
+    @cached_property
     def tariff(self) -> TariffConfig:
-        """Get validated tariff configuration."""
+        """Get validated tariff configuration (parsed on first use)."""
         section = self.config["tariff"]
 
         return TariffConfig(
@@ -1,5 +1,6 @@
 """Utility modules for the Growatt Weather Based Charger."""
 
+from .event_loop import run_async
 from .exceptions import (
     GrowattAPIError,
     GrowattAuthError,
@@ -17,6 +18,7 @@ __all__ = [
     "GrowattConfigError",
     "GrowattDeviceError",
     "retry_with_backoff",
+    "run_async",
     "setup_logging",
     "get_logger",
     "JSONFormatter",
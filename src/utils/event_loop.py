@@ -0,0 +1,29 @@
+"""Event loop helpers for the application entry points."""
+
+import asyncio
+from typing import Any, Coroutine, TypeVar
+
+try:  # Optional: faster event loop (not available on Windows)
+    import uvloop
+except ImportError:
+    uvloop = None
+
+T = TypeVar("T")
+
+
+def run_async(main: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine to completion in a new event loop, like asyncio.run().
+
+    Uses uvloop when it is installed and falls back to the default loop otherwise.
+
+    Args:
+        main: Coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    if uvloop is None:
+        return asyncio.run(main)
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+        return runner.run(main)
@@ -1,29 +1,63 @@
 """Retry utilities for handling transient failures."""
 
 import logging
+import random
 import time
 from functools import wraps
-from typing import Callable, Tuple, Type, Union
+from typing import Callable, Optional, Tuple, Type, Union
 
-from .exceptions import GrowattError
+from modules.http_session import parse_retry_after
+
+from .exceptions import GrowattAuthError, GrowattError
 
 logger = logging.getLogger(__name__)
 
 
+def _retry_after(error: BaseException) -> Optional[float]:
+    """
+    Find how long a rate-limited (HTTP 429) request asked us to wait.
+
+    API errors wrap the underlying requests exception, so the whole chain
+    of causes is searched for a response carrying a Retry-After header,
+    given as delta-seconds or an HTTP-date.
+
+    Returns:
+        Seconds to wait, or None if no 429 response with a valid header is found
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        response = getattr(error, "response", None)
+        if getattr(response, "status_code", None) == 429:
+            return parse_retry_after(response.headers.get("Retry-After"))
+        error = error.__cause__ or error.__context__
+    return None
+
+
 def retry_with_backoff(
     retries: int = 3,
     backoff_in_seconds: int = 1,
     max_backoff_in_seconds: int = 30,
     exceptions_to_check: Union[Type[Exception], Tuple[Type[Exception], ...]] = GrowattError,
+    exceptions_to_skip: Union[Type[Exception], Tuple[Type[Exception], ...]] = GrowattAuthError,
+    jitter_in_seconds: float = 1.0,
 ):
     """
-    Retry decorator with exponential backoff.
+    Retry decorator with jittered, truncated exponential backoff.
+
+    If the failure was an HTTP 429 with a Retry-After header, the next attempt
+    waits at least that long; a Retry-After beyond max_backoff_in_seconds is
+    raised straight away rather than retried early into the same rate limit.
 
     Args:
         retries: Number of times to retry the wrapped function
         backoff_in_seconds: Initial backoff time in seconds
         max_backoff_in_seconds: Maximum backoff time in seconds
         exceptions_to_check: Exception or tuple of exceptions to catch
+        exceptions_to_skip: Exceptions (e.g. bad credentials) that fail the same way
+            every time, so are raised without retrying even if in exceptions_to_check
+        jitter_in_seconds: Random delay of up to this many seconds added to each
+            backoff, so clients that failed together don't all retry together
     """
 
     def decorator(func: Callable):
@@ -36,6 +70,8 @@ def retry_with_backoff(
             while attempt < retries:
                 try:
                     return func(*args, **kwargs)
+                except exceptions_to_skip:
+                    raise
                 except exceptions_to_check as e:
                     attempt += 1
 
@@ -48,13 +84,25 @@ def retry_with_backoff(
 
                     # Calculate next backoff
                     backoff = min(backoff * 2, max_backoff_in_seconds)
+                    delay = min(
+                        backoff + random.uniform(0, jitter_in_seconds), max_backoff_in_seconds
+                    )
+                    retry_after = _retry_after(e)
+                    if retry_after is not None:
+                        if retry_after > max_backoff_in_seconds:
+                            logger.error(
+                                f"{func.__name__} rate limited; server asked to retry after "
+                                f"{retry_after:.0f} seconds. Error: {str(e)}"
+                            )
+                            raise
+                        delay = max(delay, retry_after)
 
                     logger.warning(
                         f"Attempt {attempt} failed for {func.__name__}. "
-                        f"Retrying in {backoff} seconds... Error: {str(e)}"
+                        f"Retrying in {delay:.1f} seconds... Error: {str(e)}"
                     )
 
-                    time.sleep(backoff)
+                    time.sleep(delay)
 
             return None  # Should never reach here due to raise in last attempt
 
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Test script for the GrowattCharger run sequence.
+
+Runs entirely offline: the Growatt API and forecasts are replaced with stubs.
+
+Usage:
+  python test_app.py
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import unittest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.app import GrowattCharger  # noqa: E402
+from src.config.configuration import TariffConfig  # noqa: E402
+from src.utils import event_loop, run_async  # noqa: E402
+
+PLANT_INFO = {"todayEnergy": "12.5", "storageList": [{"eChargeToday": "3.0"}]}
+
+
+class StubAPI:
+    """GrowattAPI answering with canned responses."""
+
+    def __init__(self, barrier):
+        self.barrier = barrier
+        self.calls = []
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+    def get_plant_info(self, plant_id):
+        self.calls.append("get_plant_info")
+        return PLANT_INFO
+
+    def get_system_status(self, device_sn, plant_id):
+        self.calls.append("get_system_status")
+        self.barrier.wait()
+        return {"SOC": 42}
+
+
+class StubForecastCalculator:
+    """ForecastCalculator returning fixed provider forecasts."""
+
+    def __init__(self, barrier):
+        self.barrier = barrier
+
+    def get_all_tomorrow_forecasts(self):
+        self.barrier.wait()
+        return {"solcast": 9000.0, "forecast.solar": 8000.0}
+
+
+def make_charger():
+    # Both the inverter read and the provider comparison wait here, so the
+    # barrier only trips when they run concurrently
+    barrier = threading.Barrier(2, timeout=5)
+
+    charger = GrowattCharger.__new__(GrowattCharger)
+    charger.logger = logging.getLogger("test_app")
+    charger.config = SimpleNamespace(forecast_providers=SimpleNamespace(log_all_providers=True))
+    charger.api = StubAPI(barrier)
+    charger.forecast_calculator = StubForecastCalculator(barrier)
+    charger.forecast_manager = SimpleNamespace(primary_provider_name="solcast")
+    charger.data_logger = MagicMock()
+    charger.plant_id = "1001"
+    charger.device_sn = "ABC123"
+    return charger
+
+
+class TestRun(unittest.TestCase):
+    """Tests for the order and overlap of requests in run()."""
+
+    def _run(self, charger):
+        plan = {
+            "target_soc": 40,
+            "charge_rate_pct": 50,
+            "forecast_wh": 9000.0,
+            "solar_coverage_pct": 100.0,
+        }
+        with patch.multiple(
+            charger,
+            _login=MagicMock(side_effect=lambda: asyncio.sleep(0)),
+            _get_device_info=MagicMock(side_effect=lambda: asyncio.sleep(0)),
+            _calculate_target_charge=MagicMock(side_effect=lambda soc: asyncio.sleep(0, plan)),
+            _log_previous_day_actual=MagicMock(),
+            _log_prediction=MagicMock(),
+            _should_update_settings=MagicMock(return_value=False),
+        ):
+            asyncio.run(charger.run())
+            return charger._log_previous_day_actual, charger._log_prediction
+
+    def test_inverter_read_overlaps_provider_comparison(self):
+        charger = make_charger()
+        log_actual, log_prediction = self._run(charger)
+
+        # Plant info comes first so the status lookup can reuse it
+        self.assertEqual(charger.api.calls, ["get_plant_info", "get_system_status"])
+        self.assertTrue(charger.api.closed)
+        plant_info, evening_soc, now = log_actual.call_args.args
+        self.assertEqual((plant_info, evening_soc), (PLANT_INFO, 42.0))
+        current_soc, _, prediction_date, _, all_forecasts = log_prediction.call_args.args
+        self.assertEqual(current_soc, 42.0)
+        self.assertEqual(all_forecasts, {"solcast": 9000.0, "forecast.solar": 8000.0})
+
+        # Every row is dated from the same clock reading
+        tomorrow = f"{now + timedelta(days=1):%Y-%m-%d}"
+        self.assertEqual(prediction_date, tomorrow)
+        self.assertEqual(charger.data_logger.log_provider_forecasts.call_args.args[0], tomorrow)
+
+
+class TestLogPreviousDayActual(unittest.TestCase):
+    """Tests for logging today's actuals from data already fetched this run."""
+
+    def test_actuals_logged_without_further_requests(self):
+        charger = make_charger()
+        charger.data_logger.get_prediction.return_value = None
+        charger.config.growatt = SimpleNamespace(battery_capacity_wh=10000)
+
+        charger._log_previous_day_actual(PLANT_INFO, 42.0, datetime(2025, 11, 2, 22, 0))
+
+        self.assertEqual(charger.api.calls, [])
+        charger.data_logger.get_prediction.assert_called_once_with("2025-11-02")
+        kwargs = charger.data_logger.log_actual.call_args.kwargs
+        self.assertEqual(kwargs["actual_date"], "2025-11-02")
+        self.assertEqual(kwargs["notes"], "Logged at 22:00")
+        self.assertEqual(kwargs["actual_generation_wh"], 12500.0)
+        self.assertEqual(kwargs["charge_energy_wh"], 3000.0)
+        self.assertEqual(kwargs["soc_at_sunset"], 42.0)
+
+
+class TestCalculateTargetCharge(unittest.TestCase):
+    """Tests for the configuration-based fallback charge plan."""
+
+    def test_fallback_plan_when_forecast_fails(self):
+        charger = make_charger()
+        charger.forecast_calculator.calculate_optimal_charge_plan = MagicMock(
+            side_effect=RuntimeError("no forecast")
+        )
+        charger.config.growatt = SimpleNamespace(maximum_charge_pct=95)
+        charger.config.tariff = TariffConfig(off_peak_start_time="02:00", off_peak_end_time="05:30")
+
+        plan = asyncio.run(charger._calculate_target_charge(42.0))
+
+        self.assertEqual(plan["target_soc"], 95)
+        self.assertEqual(plan["charge_rate_pct"], 100)
+        self.assertEqual(plan["off_peak_hours"], 3.5)
+
+
+class TestUpdateChargeSettings(unittest.TestCase):
+    """Tests for the settings written to the inverter."""
+
+    def test_rate_capped_by_configured_maximum(self):
+        charger = make_charger()
+        charger.api.update_charge_settings = MagicMock()
+        charger.config.growatt = SimpleNamespace(maximum_charge_rate_pct=60.0)
+        charger.config.tariff = TariffConfig(off_peak_start_time="2:00", off_peak_end_time="05:30")
+
+        plan = {"charge_rate_pct": 45, "target_soc": 80}
+        asyncio.run(charger._update_charge_settings(plan))
+
+        charger.api.update_charge_settings.assert_called_once_with(
+            device_sn="ABC123",
+            charge_rate=60,
+            target_soc=80,
+            schedule_start=(2, 0),
+            schedule_end=(5, 30),
+        )
+
+
+class TestShouldUpdateSettings(unittest.TestCase):
+    """Tests for deciding whether the inverter needs new settings."""
+
+    def test_update_when_charging_needed_or_well_above_target(self):
+        charger = make_charger()
+        expected = [(40, 50, True), (50, 50, False), (55, 50, False), (55.5, 50, True)]
+        for current, target, update in expected:
+            self.assertEqual(
+                charger._should_update_settings(current, target), update, msg=(current, target)
+            )
+
+
+class TestRunAsync(unittest.TestCase):
+    """Tests for the entry points' event loop runner."""
+
+    def test_result_returned_with_and_without_uvloop(self):
+        async def answer():
+            await asyncio.sleep(0)
+            return 42
+
+        self.assertEqual(run_async(answer()), 42)
+        with patch.object(event_loop, "uvloop", None):
+            self.assertEqual(run_async(answer()), 42)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Test script for DataLogger CSV logging.
+
+Tests:
+  1. Prediction/actual rows are appended by the background writer thread
+  2. Headers are written once, including for pre-created empty files
+  3. Performance summary joins predictions with actuals
+  4. Recent accuracy reads only the tail of the summary file
+  5. Prediction lookups read predictions.csv from the end
+
+Usage:
+  python test_data_logger.py
+"""
+
+import csv
+import io
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.data_logger import DataLogger  # noqa: E402
+
+
+def read_rows(path):
+    with open(path, mode="r", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+class TestDataLogger(unittest.TestCase):
+    """Tests for DataLogger file handling and summary generation."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.output_dir = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _log_prediction(self, logger, date, forecast_wh=8000.0):
+        logger.log_prediction(
+            prediction_date=date,
+            forecast_wh=forecast_wh,
+            solar_coverage_pct=40.0,
+            current_soc=30.0,
+            target_soc=70,
+            charge_rate_pct=50,
+            off_peak_start="02:00",
+            off_peak_end="05:00",
+            battery_capacity_wh=7000,
+            average_load_w=850,
+        )
+
+    def test_rows_appended_with_single_header(self):
+        with DataLogger(self.output_dir) as logger:
+            self._log_prediction(logger, "2025-11-01")
+            self._log_prediction(logger, "2025-11-02")
+
+        with DataLogger(self.output_dir) as logger:
+            self._log_prediction(logger, "2025-11-03")
+
+        rows = read_rows(os.path.join(self.output_dir, "predictions.csv"))
+        self.assertEqual(rows[0][0], "Prediction Date")
+        self.assertEqual([r[0] for r in rows[1:]], ["2025-11-01", "2025-11-02", "2025-11-03"])
+
+    def test_header_written_to_pre_created_empty_file(self):
+        open(os.path.join(self.output_dir, "actuals.csv"), "w").close()
+
+        with DataLogger(self.output_dir) as logger:
+            logger.log_actual("2025-11-01", 7600.0)
+
+        rows = read_rows(os.path.join(self.output_dir, "actuals.csv"))
+        self.assertEqual(rows[0][0], "Date")
+        self.assertEqual(rows[1][0], "2025-11-01")
+
+    def test_flush_makes_rows_visible_before_close(self):
+        logger = DataLogger(self.output_dir)
+        logger.log_actual("2025-11-01", 7600.0)
+        logger.flush()
+
+        rows = read_rows(logger.actuals_file)
+        self.assertEqual(len(rows), 2)
+        logger.close()
+
+    def test_writer_errors_surface_on_flush(self):
+        logger = DataLogger(self.output_dir)
+        os.mkdir(logger.actuals_file)  # opening a directory for append fails
+        logger.log_actual("2025-11-01", 7600.0)
+
+        with self.assertRaises(OSError):
+            logger.flush()
+        logger.close()
+
+    def test_summary_matches_predictions_with_actuals(self):
+        with DataLogger(self.output_dir) as logger:
+            self._log_prediction(logger, "2025-11-01")
+            self._log_prediction(logger, "2025-11-02")
+            logger.log_actual("2025-11-01", 7600.0)
+            logger.generate_performance_summary()
+
+            with open(logger.summary_file, mode="r", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+
+        self.assertEqual([r["Date"] for r in rows], ["2025-11-01", "2025-11-02"])
+        self.assertEqual(rows[0]["Accuracy (%)"], "95.0")
+        self.assertEqual(rows[0]["Performance"], "Excellent")
+        self.assertEqual(rows[1]["Performance"], "Pending")
+
+    def test_summary_keeps_last_rerun_and_skips_unpredicted_actuals(self):
+        with DataLogger(self.output_dir) as logger:
+            self._log_prediction(logger, "2025-11-02", forecast_wh=5000.0)
+            self._log_prediction(logger, "2025-11-02", forecast_wh=8000.0)
+            logger.log_actual("2025-11-01", 4000.0)
+            logger.log_actual("2025-11-02", 8000.0)
+            logger.generate_performance_summary()
+
+            with open(logger.summary_file, mode="r", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["Forecast (kWh)"], "8.0")
+        self.assertEqual(rows[0]["Accuracy (%)"], "100.0")
+
+    def test_summary_sorts_out_of_order_history(self):
+        with DataLogger(self.output_dir) as logger:
+            self._log_prediction(logger, "2025-11-03")
+            self._log_prediction(logger, "2025-11-01")
+            logger.log_actual("2025-11-01", 7600.0)
+            logger.generate_performance_summary()
+
+            with open(logger.summary_file, mode="r", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+
+        self.assertEqual([r["Date"] for r in rows], ["2025-11-01", "2025-11-03"])
+        self.assertEqual(rows[0]["Performance"], "Excellent")
+        self.assertFalse(os.path.exists(logger.summary_file + ".tmp"))
+
+    def test_recent_accuracy_reads_only_recent_rows(self):
+        today = datetime.now()
+        logger = DataLogger(self.output_dir)
+        with open(logger.summary_file, mode="w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Date", "Forecast (kWh)", "Actual (kWh)", "Accuracy (%)"])
+            for days_ago, accuracy in [(30, 10.0), (3, 90.0), (2, 80.0), (0, "N/A")]:
+                date = (today - timedelta(days=days_ago)).strftime("%Y-%m-%d")
+                writer.writerow([date, 8.0, 7.0, accuracy])
+
+        self.assertAlmostEqual(logger.get_recent_accuracy(days=7), 85.0)
+        self.assertIsNone(logger.get_recent_accuracy(days=1))
+
+    def test_prediction_lookup_returns_latest_rerun(self):
+        with DataLogger(self.output_dir) as logger:
+            self._log_prediction(logger, "2025-11-01", forecast_wh=6000.0)
+            self._log_prediction(logger, "2025-11-02", forecast_wh=7000.0)
+            self._log_prediction(logger, "2025-11-02", forecast_wh=9000.0)
+
+            self.assertEqual(logger.get_prediction("2025-11-02")["Forecast (Wh)"], "9000")
+            self.assertEqual(logger.get_prediction("2025-11-01")["Forecast (Wh)"], "6000")
+            self.assertIsNone(logger.get_prediction("2025-11-03"))
+
+    def test_iter_lines_reversed_across_chunks(self):
+        data = b"header\r\nfirst\r\nsecond line\r\nthird\r\n"
+        f = io.BytesIO(data)
+        lines = list(DataLogger._iter_lines_reversed(f, stop=len(b"header\r\n"), chunk_size=4))
+        self.assertEqual(lines, ["third", "second line", "first"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
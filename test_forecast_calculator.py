@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Test script for ForecastCalculator and SOC target calculations.
+
+Runs entirely offline using a stub forecast manager.
+
+Usage:
+  python test_forecast_calculator.py
+"""
+
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.forecast import (  # noqa: E402
+    ForecastCalculator,
+    get_scaled_soc_target,
+    get_scaled_soc_target_simple,
+)
+from src.config import TariffConfig  # noqa: E402
+from src.utils.exceptions import GrowattConfigError  # noqa: E402
+
+
+class StubForecastManager:
+    """Forecast manager returning fixed values and counting calls."""
+
+    def __init__(self, forecast_wh=8000.0):
+        self.forecast_wh = forecast_wh
+        self.daily_calls = 0
+        self.hourly_calls = 0
+
+    def get_forecast_for_date(self, date):
+        self.daily_calls += 1
+        return self.forecast_wh, "stub"
+
+    def get_hourly_forecast_for_date(self, date):
+        self.hourly_calls += 1
+        return {date.replace(hour=12, minute=0, second=0, microsecond=0): 2500.0}, "stub"
+
+
+def make_config(off_peak_start="02:00", off_peak_end="05:00"):
+    return SimpleNamespace(
+        growatt=SimpleNamespace(
+            battery_capacity_wh=7000,
+            maximum_charge_rate_w=3000,
+            average_load_w=850,
+            minimum_charge_pct=20,
+            maximum_charge_pct=100,
+        ),
+        tariff=TariffConfig(
+            off_peak_start_time=off_peak_start,
+            off_peak_end_time=off_peak_end,
+        ),
+        forecast=SimpleNamespace(confidence=0.8),
+        cache=SimpleNamespace(ttl_hours=4.0),
+    )
+
+
+class TestScaledSocTarget(unittest.TestCase):
+    """Tests for the SOC target threshold ladders."""
+
+    def test_coverage_band_boundaries(self):
+        # 850W load -> 20400Wh/day; confidence 1.0 so coverage == forecast / 204
+        expected = [
+            (0, 100),
+            (40, 90),
+            (59.9, 90),
+            (60, 70),
+            (80, 60),
+            (100, 50),
+            (120, 40),
+            (150, 30),
+            (400, 30),
+        ]
+        for coverage_pct, target in expected:
+            forecast_wh = coverage_pct * 204
+            self.assertEqual(
+                get_scaled_soc_target(forecast_wh, 7000, 20, 100, 850, confidence=1.0),
+                target,
+                msg=f"coverage {coverage_pct}%",
+            )
+
+    def test_target_clamped_to_limits(self):
+        self.assertEqual(get_scaled_soc_target(0, 7000, 20, 80, 850), 80)
+        self.assertEqual(get_scaled_soc_target(40000, 7000, 85, 90, 850), 90)
+        # Overlapping limits: the minimum wins at both ends of the ladder
+        self.assertEqual(get_scaled_soc_target(0, 7000, 60, 50, 850), 60)
+        self.assertEqual(get_scaled_soc_target(40000, 7000, 60, 50, 850), 60)
+
+    def test_simple_ladder(self):
+        self.assertEqual(get_scaled_soc_target_simple(3999), 95)
+        self.assertEqual(get_scaled_soc_target_simple(4000), 80)
+        self.assertEqual(get_scaled_soc_target_simple(7500), 50)
+        self.assertEqual(get_scaled_soc_target_simple(10000), 30)
+
+
+class TestTariffConfig(unittest.TestCase):
+    """Tests for the precomputed off-peak window."""
+
+    def test_off_peak_hours_precomputed(self):
+        tariff = TariffConfig(off_peak_start_time="02:00", off_peak_end_time="04:59")
+        self.assertEqual(tariff.off_peak_start_minutes, 120)
+        self.assertEqual(tariff.off_peak_end_minutes, 299)
+        self.assertAlmostEqual(tariff.off_peak_hours, 179 / 60)
+
+    def test_single_digit_hour_accepted(self):
+        tariff = TariffConfig(off_peak_start_time="2:30", off_peak_end_time="5:00")
+        self.assertAlmostEqual(tariff.off_peak_hours, 2.5)
+
+    def test_start_after_end_rejected(self):
+        with self.assertRaises(GrowattConfigError):
+            TariffConfig(off_peak_start_time="05:00", off_peak_end_time="02:00")
+
+
+class TestForecastCalculator(unittest.TestCase):
+    """Tests for ForecastCalculator charge planning."""
+
+    def setUp(self):
+        self.manager = StubForecastManager()
+        self.calculator = ForecastCalculator(self.manager, make_config())
+
+    def test_tomorrow_forecast_is_memoized(self):
+        self.assertEqual(self.calculator.get_tomorrow_forecast(), 8000.0)
+        self.assertEqual(self.calculator.get_tomorrow_forecast(), 8000.0)
+        self.assertEqual(self.manager.daily_calls, 1)
+
+    def test_hourly_forecast_is_memoized(self):
+        first = self.calculator.get_tomorrow_hourly_forecast()
+        second = self.calculator.get_tomorrow_hourly_forecast()
+        self.assertEqual(first, second)
+        self.assertEqual(self.manager.hourly_calls, 1)
+
+    def test_charge_plan(self):
+        self.manager.forecast_wh = 20000.0
+        plan = self.calculator.calculate_optimal_charge_plan(current_soc=30.0)
+        self.assertEqual(plan["forecast_wh"], 20000.0)
+        self.assertEqual(plan["target_soc"], 70)
+        self.assertAlmostEqual(plan["off_peak_hours"], 3.0)
+        self.assertAlmostEqual(plan["solar_coverage_pct"], 20000 / 20400 * 100)
+        self.assertEqual(self.manager.daily_calls, 1)
+
+    def test_batch_matches_single_plans(self):
+        socs = [10.0, 30.0, 55.0, 90.0]
+        forecasts = [2000.0, 12000.0, 25000.0, 40000.0]
+        batch = self.calculator.calculate_optimal_charge_plan_batch(socs, forecasts)
+
+        self.assertEqual(len(batch), 4)
+        for plan, soc, forecast in zip(batch, socs, forecasts):
+            single = self.calculator.calculate_optimal_charge_plan(soc, forecast_wh=forecast)
+            self.assertEqual(plan, single)
+        self.assertEqual(self.manager.daily_calls, 0)
+
+    def test_batch_rejects_mismatched_lengths(self):
+        with self.assertRaises(ValueError):
+            self.calculator.calculate_optimal_charge_plan_batch([10.0], [])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
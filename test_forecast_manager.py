@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test script for ForecastManager provider orchestration.
+
+Runs entirely offline using stub providers.
+
+Usage:
+  python test_forecast_manager.py
+"""
+
+import os
+import sys
+import threading
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.forecast_providers import ForecastManager, ForecastProvider  # noqa: E402
+from modules.forecast_providers.base import NetworkError  # noqa: E402
+
+# Both stub providers wait here, so the barrier only trips when they run concurrently
+_barrier = threading.Barrier(2, timeout=5)
+
+
+class StubProvider(ForecastProvider):
+    """Provider returning a fixed forecast after meeting the other provider."""
+
+    forecast_wh = 8000.0
+
+    def __init__(self, config, cache=None):
+        super().__init__(config)
+
+    def get_forecast_for_date(self, target_date):
+        _barrier.wait()
+        return self.forecast_wh
+
+    def get_hourly_forecast_for_date(self, target_date):
+        return {}
+
+
+class OtherStubProvider(StubProvider):
+    forecast_wh = 6000.0
+
+
+class FailingProvider(StubProvider):
+    def get_forecast_for_date(self, target_date):
+        _barrier.wait()
+        raise NetworkError("offline", "Failing")
+
+
+class StubForecastManager(ForecastManager):
+    PROVIDERS = {
+        "stub": StubProvider,
+        "other": OtherStubProvider,
+        "failing": FailingProvider,
+    }
+
+
+class TestForecastManager(unittest.TestCase):
+    """Tests for querying all providers."""
+
+    def setUp(self):
+        _barrier.reset()
+
+    def _manager(self, providers):
+        return StubForecastManager(
+            SimpleNamespace(), providers=providers, primary_provider=providers[0]
+        )
+
+    def test_all_forecasts_fetched_concurrently(self):
+        manager = self._manager(["stub", "other"])
+        forecasts = manager.get_all_forecasts_for_date(None)
+        self.assertEqual(forecasts, {"stub": 8000.0, "other": 6000.0})
+
+    def test_failing_provider_maps_to_none(self):
+        manager = self._manager(["stub", "failing"])
+        forecasts = manager.get_all_forecasts_for_date(None)
+        self.assertEqual(list(forecasts), ["stub", "failing"])
+        self.assertEqual(forecasts["stub"], 8000.0)
+        self.assertIsNone(forecasts["failing"])
+
+    def test_fallback_provider_created_on_first_use(self):
+        class OfflineProvider(StubProvider):
+            def get_forecast_for_date(self, target_date):
+                raise NetworkError("offline", "Offline")
+
+        class OnlineProvider(StubProvider):
+            def get_forecast_for_date(self, target_date):
+                return 5000.0
+
+        class LazyManager(ForecastManager):
+            PROVIDERS = {"offline": OfflineProvider, "online": OnlineProvider}
+
+        manager = LazyManager(
+            SimpleNamespace(), providers=["offline", "online"], primary_provider="offline"
+        )
+        self.assertEqual(list(manager.providers), ["offline"])
+
+        self.assertEqual(manager.get_forecast_for_date(None), (5000.0, "online"))
+        self.assertEqual(list(manager.providers), ["offline", "online"])
+
+    def test_unavailable_primary_replaced_by_first_working_provider(self):
+        manager = self._manager(["missing", "stub", "other"])
+        self.assertEqual(manager.primary_provider_name, "stub")
+        self.assertEqual(list(manager.providers), ["stub"])
+
+    def test_all_providers_tested_concurrently(self):
+        manager = self._manager(["stub", "failing"])
+        self.assertEqual(manager.test_all_providers(), {"stub": True, "failing": False})
+
+    def test_prefetch_warms_primary_before_lookup(self):
+        calls = []
+
+        class RecordingProvider(StubProvider):
+            def get_forecast_for_date(self, target_date):
+                calls.append(target_date)
+                return self.forecast_wh
+
+        class RecordingManager(ForecastManager):
+            PROVIDERS = {"recording": RecordingProvider, "other": OtherStubProvider}
+
+        manager = RecordingManager(
+            SimpleNamespace(),
+            providers=["recording", "other"],
+            primary_provider="recording",
+            prefetch=True,
+        )
+        self.assertEqual(manager.get_forecast_for_date(None), (8000.0, "recording"))
+        # Today and tomorrow from the prefetch, then the lookup itself
+        self.assertEqual(len(calls), 3)
+        self.assertIsNone(calls[-1])
+
+    def test_provider_config_composed_from_forecast_settings(self):
+        config = SimpleNamespace(
+            forecast=SimpleNamespace(location="51.5,-0.1", kw_power=4.2),
+            solcast=SimpleNamespace(api_key="key", resource_id="abcd"),
+        )
+        manager = StubForecastManager(config, providers=["stub"], primary_provider="stub")
+
+        solcast_config = manager._get_provider_config("solcast")
+        self.assertEqual((solcast_config.latitude, solcast_config.longitude), (51.5, -0.1))
+        self.assertEqual(solcast_config.kwp, 4.2)
+        self.assertEqual(solcast_config.api_key, "key")
+        self.assertIs(manager._get_provider_config("solcast"), solcast_config)
+        self.assertFalse(hasattr(manager._get_provider_config("stub"), "api_key"))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
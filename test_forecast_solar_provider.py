@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Test script for Forecast.Solar response caching.
+
+Runs entirely offline: HTTP requests are replaced with a mock response.
+
+Usage:
+  python test_forecast_solar_provider.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.forecast_api import ForecastSolarAPI  # noqa: E402
+from modules.forecast_cache import ForecastCache, MemoryTTLCache  # noqa: E402
+from modules.forecast_providers import NetworkError, forecast_solar  # noqa: E402
+from modules.forecast_providers.forecast_solar import ForecastSolarProvider  # noqa: E402
+
+SAMPLE_RESPONSE = {
+    "result": {
+        "watts": {
+            "2025-11-01 11:00:00": 1500,
+            "2025-11-01 12:00:00": 2500,
+            "2025-11-02 12:00:00": 2000,
+        },
+        "watt_hours_day": {"2025-11-01": 9000, "2025-11-02": 7000},
+    },
+    "message": {"ratelimit": {"limit": 12, "remaining": 10}},
+}
+
+
+def make_provider_config(**overrides):
+    config = dict(
+        latitude=51.5,
+        longitude=-0.1,
+        declination=30,
+        azimuth=0,
+        kwp=5.8,
+        damping=0.1,
+        arrays=None,
+    )
+    config.update(overrides)
+    return SimpleNamespace(**config)
+
+
+def mock_response():
+    response = MagicMock()
+    response.status_code = 200
+    response.headers = {"X-Ratelimit-Limit": "12", "X-Ratelimit-Remaining": "10"}
+    response.json.return_value = SAMPLE_RESPONSE
+    response.content = json.dumps(SAMPLE_RESPONSE).encode()
+    return response
+
+
+class TestMemoryTTLCache(unittest.TestCase):
+    """Tests for the in-process TTL cache."""
+
+    def test_expired_entries_are_dropped(self):
+        cache = MemoryTTLCache(maxsize=2, ttl_seconds=0)
+        cache.set("a", 1)
+        with patch("modules.forecast_cache.time.monotonic", return_value=1e12):
+            self.assertIsNone(cache.get("a"))
+
+    def test_oldest_entry_evicted_when_full(self):
+        cache = MemoryTTLCache(maxsize=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("c"), 3)
+
+
+class TestForecastSolarCaching(unittest.TestCase):
+    """Tests that repeated forecast lookups reuse one API response."""
+
+    def setUp(self):
+        forecast_solar.FORECAST_MEMO.clear()
+        patcher = patch.object(forecast_solar, "record_api_call")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        forecast_solar.FORECAST_MEMO.clear()
+
+    def test_provider_daily_and_hourly_share_one_request(self):
+        provider = ForecastSolarProvider(make_provider_config())
+        with patch.object(forecast_solar.HTTP_SESSION, "get", return_value=mock_response()) as get:
+            daily = provider.get_forecast_for_date(datetime(2025, 11, 1))
+            hourly = provider.get_hourly_forecast_for_date(datetime(2025, 11, 1))
+
+        self.assertEqual(get.call_count, 1)
+        self.assertEqual(daily, 9000.0)
+        self.assertEqual(
+            hourly,
+            {datetime(2025, 11, 1, 11): 1500.0, datetime(2025, 11, 1, 12): 2500.0},
+        )
+
+    def test_hourly_index_reused_across_dates(self):
+        provider = ForecastSolarProvider(make_provider_config())
+        with patch.object(forecast_solar.HTTP_SESSION, "get", return_value=mock_response()):
+            first = provider.get_hourly_forecast_for_date(datetime(2025, 11, 1))
+            index = forecast_solar._watts_index[1]
+            second = provider.get_hourly_forecast_for_date(datetime(2025, 11, 2))
+            missing = provider.get_hourly_forecast_for_date(datetime(2025, 11, 5))
+
+        self.assertIs(forecast_solar._watts_index[1], index)
+        self.assertEqual(len(first), 2)
+        self.assertEqual(second, {datetime(2025, 11, 2, 12): 2000.0})
+        self.assertEqual(missing, {})
+
+    def test_day_summary_returns_total_and_hours(self):
+        provider = ForecastSolarProvider(make_provider_config())
+        with patch.object(forecast_solar.HTTP_SESSION, "get", return_value=mock_response()) as get:
+            total, hourly = provider.get_day_summary(datetime(2025, 11, 2))
+
+        self.assertEqual(get.call_count, 1)
+        self.assertEqual(total, 7000.0)
+        self.assertEqual(hourly, {datetime(2025, 11, 2, 12): 2000.0})
+
+    def test_different_site_parameters_fetch_separately(self):
+        first = ForecastSolarProvider(make_provider_config())
+        second = ForecastSolarProvider(make_provider_config(kwp=4.0))
+        with patch.object(forecast_solar.HTTP_SESSION, "get", return_value=mock_response()) as get:
+            first.get_forecast()
+            second.get_forecast()
+
+        self.assertEqual(get.call_count, 2)
+
+    def test_legacy_client_shares_provider_cache(self):
+        provider = ForecastSolarProvider(make_provider_config())
+        client = ForecastSolarAPI(lat=51.5, lon=-0.1, declination=30, azimuth=0, kwp=5.8)
+        with patch.object(forecast_solar.HTTP_SESSION, "get", return_value=mock_response()) as get:
+            provider.get_forecast()
+            self.assertEqual(client.get_forecast_for_date(datetime(2025, 11, 2)), 7000.0)
+
+        self.assertEqual(get.call_count, 1)
+
+    def test_force_refresh_bypasses_caches(self):
+        provider = ForecastSolarProvider(make_provider_config())
+        with patch.object(forecast_solar.HTTP_SESSION, "get", return_value=mock_response()) as get:
+            provider.get_forecast()
+            provider.get_forecast(force_refresh=True)
+
+        self.assertEqual(get.call_count, 2)
+
+    def test_soft_expired_data_reloaded_from_file_cache(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = ForecastCache(cache_dir=cache_dir)
+            provider = ForecastSolarProvider(make_provider_config(), cache=cache)
+            stale = {"result": {"watt_hours_day": {"2025-11-01": 1000}}}
+            cache.set("forecast.solar", datetime.now(), SAMPLE_RESPONSE)
+            forecast_solar.FORECAST_MEMO.set(provider._memo_key(), stale)
+
+            later = time.monotonic() + ForecastSolarProvider.SOFT_TTL_SECONDS + 1
+            with patch("modules.forecast_cache.time.monotonic", return_value=later):
+                with patch.object(forecast_solar.HTTP_SESSION, "get") as get:
+                    self.assertEqual(provider.get_forecast(), SAMPLE_RESPONSE)
+
+        get.assert_not_called()
+
+    def test_soft_expired_data_refetched_in_foreground_when_file_cache_expired(self):
+        provider = ForecastSolarProvider(make_provider_config())
+        stale = {"result": {"watt_hours_day": {"2025-11-01": 1000}}}
+        forecast_solar.FORECAST_MEMO.set(provider._memo_key(), stale)
+
+        later = time.monotonic() + ForecastSolarProvider.SOFT_TTL_SECONDS + 1
+        with patch("modules.forecast_cache.time.monotonic", return_value=later):
+            with patch.object(forecast_solar.HTTP_SESSION, "get", return_value=mock_response()):
+                self.assertEqual(provider.get_forecast_for_date(datetime(2025, 11, 1)), 9000.0)
+
+    def test_in_process_data_kept_when_reload_fails(self):
+        provider = ForecastSolarProvider(make_provider_config())
+        stale = {"result": {"watt_hours_day": {"2025-11-01": 1000}}}
+        forecast_solar.FORECAST_MEMO.set(provider._memo_key(), stale)
+        failure = forecast_solar.requests.exceptions.ConnectionError("offline")
+
+        later = time.monotonic() + ForecastSolarProvider.SOFT_TTL_SECONDS + 1
+        with patch("modules.forecast_cache.time.monotonic", return_value=later):
+            with patch.object(forecast_solar.HTTP_SESSION, "get", side_effect=failure) as get:
+                self.assertIs(provider.get_forecast(), stale)
+
+        get.assert_called()
+
+    def test_low_quota_stretches_soft_ttl(self):
+        provider = ForecastSolarProvider(make_provider_config())
+        forecast_solar.FORECAST_MEMO.set(provider._memo_key(), SAMPLE_RESPONSE)
+        status = {"quota_remaining": 1, "quota_limit": 12, "window_hours": 1}
+
+        later = time.monotonic() + ForecastSolarProvider.SOFT_TTL_SECONDS + 1
+        with patch.object(forecast_solar, "get_quota_status", return_value=status):
+            self.assertEqual(provider.get_provider_info()["soft_ttl_seconds"], 3600)
+            with patch("modules.forecast_cache.time.monotonic", return_value=later):
+                with patch.object(forecast_solar.HTTP_SESSION, "get") as get:
+                    self.assertIs(provider.get_forecast(), SAMPLE_RESPONSE)
+
+        get.assert_not_called()
+
+    def test_concurrent_misses_share_one_request(self):
+        provider = ForecastSolarProvider(make_provider_config())
+        release = threading.Event()
+
+        def fetch(*args, **kwargs):
+            release.wait(timeout=5)
+            return mock_response()
+
+        results = []
+        with patch.object(forecast_solar.HTTP_SESSION, "get", side_effect=fetch) as get:
+            threads = [
+                threading.Thread(target=lambda: results.append(provider.get_forecast()))
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            time.sleep(0.1)
+            release.set()
+            for thread in threads:
+                thread.join(timeout=5)
+
+        self.assertEqual(get.call_count, 1)
+        self.assertEqual(len(results), 4)
+
+    def test_invalid_json_raises_network_error(self):
+        response = mock_response()
+        response.json.side_effect = forecast_solar.requests.exceptions.JSONDecodeError(
+            "bad body", "<html>", 0
+        )
+        response.content = b"<html>"
+        provider = ForecastSolarProvider(make_provider_config())
+        with patch.object(forecast_solar.HTTP_SESSION, "get", return_value=response):
+            with self.assertRaises(NetworkError):
+                provider.get_forecast()
+
+    def test_session_retries_transient_server_errors(self):
+        adapter = forecast_solar.HTTP_SESSION.get_adapter(
+            forecast_solar.ForecastSolarProvider.BASE_URL
+        )
+        self.assertEqual(adapter.max_retries.total, 3)
+        self.assertIn(503, adapter.max_retries.status_forcelist)
+        self.assertNotIn(429, adapter.max_retries.status_forcelist)
+
+
+class TestForecastSolarStaleFallback(unittest.TestCase):
+    """Tests that a failed fetch falls back to the last cached response."""
+
+    def setUp(self):
+        forecast_solar.FORECAST_MEMO.clear()
+        patcher = patch.object(forecast_solar, "record_api_call")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+
+    def tearDown(self):
+        forecast_solar.FORECAST_MEMO.clear()
+
+    def test_network_error_serves_expired_cache_entry(self):
+        cache = ForecastCache(self._tmp.name, default_ttl_hours=0)
+        cache.set("forecast.solar", datetime(2025, 10, 31), SAMPLE_RESPONSE)
+        provider = ForecastSolarProvider(make_provider_config(), cache=cache)
+
+        failure = forecast_solar.requests.exceptions.ConnectionError("offline")
+        with patch.object(forecast_solar.HTTP_SESSION, "get", side_effect=failure):
+            self.assertEqual(provider.get_forecast_for_date(datetime(2025, 11, 1)), 9000.0)
+
+    def test_stale_cache_without_requested_date_is_raised(self):
+        cache = ForecastCache(self._tmp.name, default_ttl_hours=0)
+        cache.set("forecast.solar", datetime(2025, 10, 31), SAMPLE_RESPONSE)
+        provider = ForecastSolarProvider(make_provider_config(), cache=cache)
+
+        failure = forecast_solar.requests.exceptions.ConnectionError("offline")
+        with patch.object(forecast_solar.HTTP_SESSION, "get", side_effect=failure):
+            self.assertEqual(provider.get_forecast_for_date(datetime(2025, 11, 2)), 7000.0)
+            # Not 0 Wh: the caller must be able to fall back to another provider
+            with self.assertRaises(NetworkError):
+                provider.get_forecast_for_date(datetime(2025, 11, 3))
+            with self.assertRaises(NetworkError):
+                provider.get_day_summary(datetime(2025, 11, 3))
+
+    def test_cache_entries_past_stale_limit_not_served(self):
+        cache = ForecastCache(self._tmp.name, default_ttl_hours=0)
+        cache.set("forecast.solar", datetime(2025, 10, 31), SAMPLE_RESPONSE)
+        (cache_file,) = Path(self._tmp.name).glob("*.json")
+        entry = json.loads(cache_file.read_text(encoding="utf-8"))
+        entry["cached_at"] = (datetime.now() - timedelta(days=3)).isoformat()
+        cache_file.write_text(json.dumps(entry), encoding="utf-8")
+        provider = ForecastSolarProvider(make_provider_config(), cache=cache)
+
+        failure = forecast_solar.requests.exceptions.ConnectionError("offline")
+        with patch.object(forecast_solar.HTTP_SESSION, "get", side_effect=failure):
+            with self.assertRaises(NetworkError):
+                provider.get_forecast_for_date(datetime(2025, 11, 1))
+
+    def test_exhausted_quota_serves_cache_without_request(self):
+        cache = ForecastCache(self._tmp.name, default_ttl_hours=0)
+        cache.set("forecast.solar", datetime(2025, 10, 31), SAMPLE_RESPONSE)
+        provider = ForecastSolarProvider(make_provider_config(), cache=cache)
+
+        with patch.object(forecast_solar, "can_make_calls", return_value=(False, "exhausted")):
+            with patch.object(forecast_solar.HTTP_SESSION, "get") as get:
+                self.assertEqual(provider.get_forecast_for_date(datetime(2025, 11, 1)), 9000.0)
+
+        get.assert_not_called()
+
+    def test_connection_check_uses_cached_forecast(self):
+        cache = ForecastCache(self._tmp.name)
+        cache.set("forecast.solar", datetime.now(), SAMPLE_RESPONSE)
+        provider = ForecastSolarProvider(make_provider_config(), cache=cache)
+
+        with patch.object(provider, "get_forecast_for_date") as fetch:
+            self.assertTrue(provider.test_connection())
+            fetch.assert_not_called()
+
+            provider.test_connection(allow_cached=False)
+            fetch.assert_called_once()
+
+    def test_network_error_without_cache_is_raised(self):
+        provider = ForecastSolarProvider(make_provider_config())
+        failure = forecast_solar.requests.exceptions.ConnectionError("offline")
+        with patch.object(forecast_solar.HTTP_SESSION, "get", side_effect=failure):
+            with self.assertRaises(NetworkError):
+                provider.get_forecast()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Test script for the GrowattAPI wrapper.
+
+Runs entirely offline: the growattServer client is replaced with a stub, or
+pointed at a local HTTP server.
+
+Usage:
+  python test_growatt_api.py
+"""
+
+import os
+import sys
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import requests
+from requests.hooks import dispatch_hook
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.api import GrowattAPI  # noqa: E402
+from src.api.growatt import find_soc  # noqa: E402
+from src.utils import GrowattAPIError, GrowattAuthError, retry_with_backoff  # noqa: E402
+
+DEVICE_SN = "ABC123"
+PLANT_ID = "1001"
+
+
+class StubGrowattClient:
+    """growattServer client answering with canned responses."""
+
+    def __init__(self, capacity="", storage=None, mix=None):
+        self.capacity = capacity
+        self.calls = []
+        self.storage = storage
+        self.mix = mix
+
+    def login(self, username, password):
+        self.calls.append("login")
+        return {"success": True, "user": {"id": "user"}}
+
+    def plant_list(self, user_id):
+        self.calls.append("plant_list")
+        return {"data": [{"plantId": PLANT_ID}]}
+
+    def plant_info(self, plant_id):
+        self.calls.append("plant_info")
+        return {"storageList": [{"deviceSn": DEVICE_SN, "capacity": self.capacity}]}
+
+    def storage_detail(self, device_sn):
+        self.calls.append("storage_detail")
+        return self.storage
+
+    def mix_system_status(self, device_sn, plant_id):
+        self.calls.append("mix_system_status")
+        return self.mix
+
+
+def make_api(client):
+    api = GrowattAPI()
+    api._api = client
+    api._user_id = "user"
+    api._login_expiry = float("inf")
+    return api
+
+
+class TestSystemStatus(unittest.TestCase):
+    """Tests for reading the battery SOC."""
+
+    def test_soc_read_from_plant_info(self):
+        api = make_api(StubGrowattClient(capacity="64%"))
+        self.assertEqual(api.get_system_status(DEVICE_SN, PLANT_ID)["SOC"], 64.0)
+
+    def test_storage_detail_preferred_without_querying_mix_status(self):
+        client = StubGrowattClient(storage={"soc": "55"}, mix={"SOC": 70})
+        api = make_api(client)
+        self.assertEqual(api.get_system_status(DEVICE_SN, PLANT_ID)["SOC"], 55.0)
+        self.assertEqual(client.calls, ["plant_info", "storage_detail"])
+
+    def test_mix_status_used_when_storage_detail_empty(self):
+        client = StubGrowattClient(storage={}, mix={"data": {"capacityPercent": "48%"}})
+        api = make_api(client)
+        self.assertEqual(api.get_system_status(DEVICE_SN, PLANT_ID)["SOC"], 48.0)
+        self.assertEqual(client.calls, ["plant_info", "storage_detail", "mix_system_status"])
+
+    def test_working_fallback_remembered_per_device(self):
+        client = StubGrowattClient(storage={}, mix={"SOC": 70})
+        api = make_api(client)
+        api.get_system_status(DEVICE_SN, PLANT_ID)
+        client.calls.clear()
+
+        self.assertEqual(api.get_system_status(DEVICE_SN, PLANT_ID)["SOC"], 70.0)
+        self.assertEqual(client.calls, ["mix_system_status"])
+
+
+class TestLogin(unittest.TestCase):
+    """Tests for reusing a login until it expires."""
+
+    def setUp(self):
+        self.client = StubGrowattClient()
+        self.api = GrowattAPI()
+        self.api._api = self.client
+
+    def test_repeated_login_reuses_session(self):
+        first = self.api.login("user", "secret")
+        self.assertIs(self.api.login("user", "secret"), first)
+        self.assertEqual(self.client.calls, ["login"])
+
+        self.api.login("other", "secret")
+        self.assertEqual(self.client.calls, ["login", "login"])
+
+    def test_expired_login_renewed_before_next_call(self):
+        self.api.login("user", "secret")
+        self.api._login_expiry = 0.0
+
+        self.api.get_plant_list()
+        self.assertEqual(self.client.calls, ["login", "login", "plant_list"])
+
+    def test_failed_renewal_not_retried_inside_call_retries(self):
+        self.api.login("user", "secret")
+        self.api._login_expiry = 0.0
+
+        def unreachable(username, password):
+            self.client.calls.append("login")
+            raise requests.exceptions.ConnectionError("offline")
+
+        self.client.login = unreachable
+        with patch("src.utils.retry.time.sleep"):
+            with self.assertRaises(GrowattAPIError):
+                self.api.get_plant_list()
+
+        # One renewal attempt per try of get_plant_list, not a nested retry loop each
+        self.assertEqual(self.client.calls, ["login"] + ["login"] * 3)
+
+    def test_calls_before_login_rejected(self):
+        with self.assertRaises(GrowattAuthError):
+            self.api.get_plant_list()
+        self.assertEqual(self.client.calls, [])
+
+
+class TestSession(unittest.TestCase):
+    """Tests for the growattServer client's HTTP session."""
+
+    def test_client_session_pooled_without_urllib3_retries(self):
+        api = GrowattAPI()
+        api._init_api("test-agent")
+        session = api._api.session
+
+        # retry_with_backoff is the only retry layer
+        adapter = session.get_adapter(api.server_url)
+        self.assertEqual(adapter._pool_maxsize, 8)
+        self.assertEqual(adapter.max_retries.total, 0)
+        self.assertFalse(adapter.max_retries.is_retry("GET", 429))
+        self.assertFalse(adapter.max_retries.is_retry("GET", 503))
+
+    def test_client_responses_decoded_with_orjson(self):
+        api = GrowattAPI()
+        api._init_api("test-agent")
+
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'{"storageList": [{"capacity": "64%"}]}'
+        dispatch_hook("response", api._api.session.hooks, response)
+        self.assertEqual(response.json(), {"storageList": [{"capacity": "64%"}]})
+
+        response._content = b"<html>"
+        with self.assertRaises(requests.exceptions.JSONDecodeError):
+            response.json()
+
+        response.status_code = 500
+        with self.assertRaises(requests.exceptions.HTTPError):
+            dispatch_hook("response", api._api.session.hooks, response)
+
+    def test_close_ends_session_and_login(self):
+        api = GrowattAPI()
+        api._init_api("test-agent")
+        session = api._api.session
+        api._user_id = "user"
+        api._credentials = ("user", "secret")
+        api._login_expiry = float("inf")
+
+        with patch.object(session, "close") as close:
+            api.close()
+        close.assert_called_once()
+        self.assertIsNone(api._api)
+        with self.assertRaises(GrowattAuthError):
+            api.get_plant_list()
+
+    def test_missing_soc_reported_once(self):
+        api = make_api(StubGrowattClient(storage={}, mix={"status": 1}))
+        with patch("src.utils.retry.time.sleep"):
+            with self.assertRaises(GrowattAPIError) as raised:
+                api.get_system_status(DEVICE_SN, PLANT_ID)
+
+        self.assertEqual(
+            str(raised.exception),
+            f"Could not find battery percentage data (Last error: Empty response) "
+            f"for device {DEVICE_SN}",
+        )
+        self.assertIsNone(raised.exception.__context__)
+
+
+class TestRateLimit(unittest.TestCase):
+    """Tests for 429 responses sent through the client's own session."""
+
+    def setUp(self):
+        self.hits = 0
+        self.retry_after = "3600"
+        test = self
+
+        class RateLimited(BaseHTTPRequestHandler):
+            def do_GET(self):
+                test.hits += 1
+                self.send_response(429)
+                self.send_header("Retry-After", test.retry_after)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), RateLimited)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        self.api = GrowattAPI(f"http://127.0.0.1:{server.server_port}/")
+        self.api._init_api("test-agent")
+        session = self.api._api.session
+        # Send plain HTTP through the adapter _init_api mounted for the real server
+        session.mount("http://", session.get_adapter("https://server.growatt.com/"))
+        self.api._user_id = "user"
+        self.api._login_expiry = float("inf")
+
+        patcher = patch("src.utils.retry.time.sleep")
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_long_retry_after_raised_after_one_request(self):
+        with self.assertRaises(GrowattAPIError):
+            self.api.get_plant_info(PLANT_ID)
+
+        self.assertEqual(self.hits, 1)
+        self.sleep.assert_not_called()
+
+    def test_short_retry_after_waited_once_per_attempt(self):
+        self.retry_after = "4"
+        with self.assertRaises(GrowattAPIError):
+            self.api.get_plant_info(PLANT_ID)
+
+        self.assertEqual(self.hits, 3)
+        self.assertEqual([call.args[0] >= 4.0 for call in self.sleep.call_args_list], [True] * 2)
+
+
+class TestChargeSettings(unittest.TestCase):
+    """Tests for the spa_ac_charge_time_period params sent to the inverter."""
+
+    def setUp(self):
+        self.client = StubGrowattClient()
+        self.sent = []
+
+        def update_ac_inverter_setting(device_sn, setting_type, params):
+            self.sent.append(params)
+            return {"success": True}
+
+        self.client.update_ac_inverter_setting = update_ac_inverter_setting
+        self.api = make_api(self.client)
+
+    def test_only_first_slot_enabled(self):
+        self.api.update_charge_settings(DEVICE_SN, 50, 80, (2, 0), (5, 30))
+        params = self.sent[0]
+
+        self.assertEqual(
+            [params[f"param{i}"] for i in range(1, 8)], ["50", "80", "02", "00", "05", "30", "1"]
+        )
+        self.assertEqual(len(params), 17)
+        self.assertEqual((params["param12"], params["param17"]), ("0", "0"))
+
+    def test_rejected_update_reported_once(self):
+        self.client.update_ac_inverter_setting = lambda *args: {"success": False, "msg": "busy"}
+        with patch("src.utils.retry.time.sleep"):
+            with self.assertRaises(GrowattAPIError) as raised:
+                self.api.update_charge_settings(DEVICE_SN, 50, 80, (2, 0), (5, 30))
+
+        self.assertEqual(str(raised.exception), "Failed to update settings: busy")
+
+    def test_slot_update_preserves_slot_0_and_disables_others(self):
+        self.api.update_charge_settings_with_slot(
+            DEVICE_SN,
+            50,
+            80,
+            (13, 0),
+            (16, 0),
+            slot_number=1,
+            preserve_slot_0=True,
+            slot_0_start=(2, 0),
+            slot_0_end=(5, 30),
+        )
+        params = self.sent[0]
+
+        self.assertEqual(list(params), [f"param{i}" for i in range(1, 18)])
+        self.assertEqual([params[f"param{i}"] for i in range(3, 8)], ["02", "00", "05", "30", "1"])
+        self.assertEqual([params[f"param{i}"] for i in range(8, 13)], ["13", "00", "16", "00", "1"])
+        self.assertEqual(params["param17"], "0")
+
+
+class TestFindSoc(unittest.TestCase):
+    """Tests for locating the battery percentage in device responses."""
+
+    def test_field_priority_and_depth_first_order(self):
+        self.assertEqual(find_soc({"soc": "40", "SOC": "bad", "capacity": "55%"}), 55.0)
+        self.assertEqual(find_soc({"a": {"b": {"soc": 1}}, "c": {"soc": 2}, "x": 0}), 1.0)
+        self.assertEqual(find_soc({"bat_soc": 9, "nested": {"SOC": 3}}), 9.0)
+
+    def test_no_numeric_field_returns_none(self):
+        self.assertIsNone(find_soc({"data": {"soc": None, "capacity": "n/a"}, "status": 1}))
+
+
+class TestResponseCache(unittest.TestCase):
+    """Tests for reusing plant and device responses."""
+
+    def test_device_info_and_plant_info_reused(self):
+        client = StubGrowattClient(capacity="64%")
+        api = make_api(client)
+
+        device_info = api.get_device_info()
+        self.assertEqual(device_info, {"plant_id": PLANT_ID, "device_sn": DEVICE_SN})
+        self.assertEqual(api.get_device_info(), device_info)
+        api.get_system_status(DEVICE_SN, PLANT_ID)
+
+        self.assertEqual(client.calls, ["plant_list", "plant_info"])
+
+    def test_cached_responses_not_shared_with_callers(self):
+        client = StubGrowattClient(capacity="64%")
+        api = make_api(client)
+
+        api.get_plant_list()["data"].clear()
+        status = api.get_system_status(DEVICE_SN, PLANT_ID)
+        status["capacity"] = "0%"
+        api.get_plant_info(PLANT_ID)["storageList"].clear()
+
+        self.assertEqual(api.get_plant_list()["data"], [{"plantId": PLANT_ID}])
+        self.assertEqual(api.get_system_status(DEVICE_SN, PLANT_ID)["SOC"], 64.0)
+        self.assertNotIn("SOC", api.get_plant_info(PLANT_ID)["storageList"][0])
+        self.assertEqual(client.calls, ["plant_list", "plant_info"])
+
+    def test_plant_info_refetched_after_ttl(self):
+        client = StubGrowattClient(capacity="64%")
+        api = make_api(client)
+        api.get_plant_info(PLANT_ID)
+
+        later = api._cache[("plant_info", PLANT_ID)][0]
+        with patch("src.api.growatt.time.monotonic", return_value=later):
+            api.get_plant_info(PLANT_ID)
+
+        self.assertEqual(client.calls, ["plant_info", "plant_info"])
+
+    def test_invalidate_drops_cached_responses(self):
+        client = StubGrowattClient(capacity="64%")
+        api = make_api(client)
+        api.get_device_info()
+        api.invalidate()
+        api.get_device_info()
+
+        self.assertEqual(client.calls, ["plant_list", "plant_info"] * 2)
+
+
+class TestRetryWithBackoff(unittest.TestCase):
+    """Tests for the API retry decorator."""
+
+    def setUp(self):
+        patcher = patch("src.utils.retry.time.sleep")
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_transient_errors_retried_with_jittered_backoff(self):
+        calls = []
+
+        @retry_with_backoff(retries=3, backoff_in_seconds=2, max_backoff_in_seconds=5)
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise GrowattAPIError("timeout")
+            return "ok"
+
+        self.assertEqual(flaky(), "ok")
+        first, second = (call.args[0] for call in self.sleep.call_args_list)
+        self.assertTrue(4.0 <= first <= 5.0)
+        self.assertEqual(second, 5.0)  # truncated at max_backoff_in_seconds
+
+    def test_auth_errors_not_retried(self):
+        calls = []
+
+        @retry_with_backoff(retries=3)
+        def rejected():
+            calls.append(1)
+            raise GrowattAuthError("bad password")
+
+        with self.assertRaises(GrowattAuthError):
+            rejected()
+        self.assertEqual(len(calls), 1)
+        self.sleep.assert_not_called()
+
+    def test_retry_after_honoured_through_wrapped_errors(self):
+        rate_limited = SimpleNamespace(status_code=429, headers={"Retry-After": "12"})
+        calls = []
+
+        @retry_with_backoff(retries=2, backoff_in_seconds=1, max_backoff_in_seconds=20)
+        def throttled():
+            calls.append(1)
+            if len(calls) == 1:
+                try:
+                    raise requests.exceptions.HTTPError("429", response=rate_limited)
+                except requests.exceptions.HTTPError as e:
+                    raise GrowattAPIError(f"Failed to get plant list: {e}")
+            return "ok"
+
+        self.assertEqual(throttled(), "ok")
+        self.assertEqual(self.sleep.call_args.args[0], 12.0)
+
+    def test_long_retry_after_not_retried(self):
+        rate_limited = SimpleNamespace(status_code=429, headers={"Retry-After": "3600"})
+        calls = []
+
+        @retry_with_backoff(retries=3)
+        def throttled():
+            calls.append(1)
+            raise GrowattAPIError("rate limited", response=rate_limited)
+
+        with self.assertRaises(GrowattAPIError):
+            throttled()
+        self.assertEqual(len(calls), 1)
+        self.sleep.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
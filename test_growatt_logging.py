@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test script for CSV run logging.
+
+Usage:
+  python test_growatt_logging.py
+"""
+
+import csv
+import os
+import sys
+import tempfile
+import time
+import unittest
+from logging.handlers import QueueHandler
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules import growatt_logging  # noqa: E402
+from modules.growatt_logging import CSVAppender, get_csv_appender, log_run_to_csv  # noqa: E402
+
+
+def read_rows(path):
+    with open(path, mode="r", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+class TestCSVAppender(unittest.TestCase):
+    """Tests for appending rows through a kept-open CSV file."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = os.path.join(self._tmp.name, "rows.csv")
+
+    def test_header_written_once_across_appenders(self):
+        with CSVAppender(self.path, ["Date", "Value"]) as appender:
+            appender.append(["2025-11-01", 1])
+            appender.append(["2025-11-02", 2])
+        with CSVAppender(self.path, ["Date", "Value"]) as appender:
+            appender.append(["2025-11-03", 3])
+
+        rows = read_rows(self.path)
+        self.assertEqual(rows[0], ["Date", "Value"])
+        self.assertEqual([r[0] for r in rows[1:]], ["2025-11-01", "2025-11-02", "2025-11-03"])
+
+    def test_header_written_to_pre_created_empty_file(self):
+        open(self.path, "w").close()
+        with CSVAppender(self.path, ["Date"]) as appender:
+            appender.append(["2025-11-01"])
+
+        self.assertEqual(read_rows(self.path), [["Date"], ["2025-11-01"]])
+
+    def test_log_run_reuses_shared_appender(self):
+        for date in ("2025-11-01", "2025-11-02"):
+            log_run_to_csv(
+                date, 8000.0, 80, 60.0, 30.0, 1000.0, "10:30", 500.0, 50.0, csv_path=self.path
+            )
+            # Each logged run is visible without closing the file
+            self.assertEqual(read_rows(self.path)[-1][0], date)
+
+        appender = get_csv_appender(self.path, [])
+        self.assertIs(get_csv_appender(self.path, []), appender)
+        appender.close()
+        self.assertEqual(len(read_rows(self.path)), 3)
+
+
+class TestExitPrinting(unittest.TestCase):
+    """Tests for writing the latest run output."""
+
+    def test_latest_file_replaced_atomically(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            with patch.object(growatt_logging, "OUTPUT_DIR", output_dir):
+                growatt_logging.exit_printing(["first run"])
+                growatt_logging.exit_printing(["SOC: 55%", "Target: 80%"])
+
+            self.assertEqual(os.listdir(output_dir), ["latest.txt"])
+            with open(os.path.join(output_dir, "latest.txt"), encoding="utf-8") as f:
+                self.assertEqual(f.read(), "SOC: 55%\nTarget: 80%\n")
+
+            # Same permissions as any other file this process creates
+            reference = os.path.join(output_dir, "reference")
+            open(reference, "w").close()
+            self.assertEqual(
+                os.stat(os.path.join(output_dir, "latest.txt")).st_mode,
+                os.stat(reference).st_mode,
+            )
+
+    def test_temp_file_removed_when_replace_fails(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            with patch.object(growatt_logging, "OUTPUT_DIR", output_dir):
+                with patch.object(growatt_logging.os, "replace", side_effect=OSError("busy")):
+                    with self.assertRaises(OSError):
+                        growatt_logging.exit_printing(["SOC: 55%"])
+
+            self.assertEqual(os.listdir(output_dir), [])
+
+
+class TestSetupLogger(unittest.TestCase):
+    """Tests for the queue-backed run logger."""
+
+    def test_repeat_setup_adds_no_handlers_and_writes_via_queue(self):
+        with tempfile.TemporaryDirectory() as log_dir:
+            with patch.object(growatt_logging, "LOG_DIR", log_dir), patch.object(
+                growatt_logging, "OUTPUT_DIR", log_dir
+            ):
+                logger = growatt_logging.setup_logger("test-setup-logger")
+                self.assertIs(growatt_logging.setup_logger("test-setup-logger"), logger)
+
+            self.assertEqual([type(h) for h in logger.handlers], [QueueHandler])
+            logger.info("queued message")
+
+            log_path = os.path.join(log_dir, "test-setup-logger.log")
+            for _ in range(50):
+                with open(log_path, encoding="utf-8") as f:
+                    if "queued message" in f.read():
+                        break
+                time.sleep(0.05)
+            else:
+                self.fail("log record was not written by the listener")
+            logger.handlers.clear()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
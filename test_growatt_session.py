@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared Growatt HTTP session.
+
+Runs entirely offline: no requests are sent.
+
+Usage:
+  python test_growatt_session.py
+"""
+
+import json
+import os
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules import growatt_session, http_session  # noqa: E402
+
+
+class TestGrowattSession(unittest.TestCase):
+    """Tests for reusing one session across Growatt calls."""
+
+    def test_session_shared_across_calls_and_threads(self):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            sessions = list(executor.map(lambda _: growatt_session.get_session(), range(8)))
+
+        self.assertTrue(all(session is sessions[0] for session in sessions))
+        self.assertIs(growatt_session.get_session(), sessions[0])
+        self.assertEqual(sessions[0].headers["Accept"], "application/json")
+
+    def test_transient_errors_retried_for_idempotent_requests_only(self):
+        retry = growatt_session.get_session().get_adapter("https://server.growatt.com").max_retries
+        self.assertEqual(retry.total, 3)
+        self.assertIn(503, retry.status_forcelist)
+        self.assertTrue(retry.is_retry("GET", 503))
+        self.assertFalse(retry.is_retry("POST", 503))
+
+    def test_call_endpoint_decodes_json(self):
+        session = MagicMock()
+        session.request.return_value.content = b'{"soc": 55}'
+        self.assertEqual(growatt_session.call_endpoint(session, "/device/soc"), {"soc": 55})
+
+        session.request.return_value.content = b"<html>"
+        with self.assertRaises(growatt_session.requests.exceptions.JSONDecodeError) as raised:
+            growatt_session.call_endpoint(session, "/device/soc")
+        self.assertIsInstance(raised.exception.__cause__, json.JSONDecodeError)
+
+    def test_json_decoded_without_orjson(self):
+        with patch.object(http_session, "orjson", None):
+            self.assertEqual(http_session.loads_json(b'{"soc": 55}'), {"soc": 55})
+            with self.assertRaises(http_session.requests.exceptions.JSONDecodeError):
+                http_session.loads_json(b"<html>")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
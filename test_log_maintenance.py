@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test script for LogMaintenance CSV trimming and cache sweeping.
+
+Usage:
+  python test_log_maintenance.py
+"""
+
+import csv
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.log_maintenance import LogMaintenance  # noqa: E402
+
+
+class TestLogMaintenance(unittest.TestCase):
+    """Tests for retention trimming and stale cache removal."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.output_dir = os.path.join(self._tmp.name, "output")
+        self.cache_dir = os.path.join(self._tmp.name, "cache")
+        os.makedirs(self.output_dir)
+        os.makedirs(self.cache_dir)
+
+    def _touch(self, name, age_days=0):
+        path = os.path.join(self.cache_dir, name)
+        open(path, "w").close()
+        mtime = time.time() - age_days * 86400
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_stale_json_cache_files_removed(self):
+        stale = self._touch("old.json", age_days=10)
+        fresh = self._touch("new.json")
+        other = self._touch("notes.txt", age_days=10)
+        os.makedirs(os.path.join(self.cache_dir, "dir.json"))
+
+        LogMaintenance(self.output_dir, self.cache_dir, cache_max_age_days=7).run()
+
+        self.assertFalse(os.path.exists(stale))
+        self.assertTrue(os.path.exists(fresh))
+        self.assertTrue(os.path.exists(other))
+        self.assertTrue(os.path.isdir(os.path.join(self.cache_dir, "dir.json")))
+
+    def test_old_csv_rows_trimmed(self):
+        path = os.path.join(self.output_dir, "actuals.csv")
+        with open(path, mode="w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows([["Date", "Actual"], ["2000-01-01", 1], ["2999-01-01", 2]])
+
+        LogMaintenance(self.output_dir, self.cache_dir, retention_days=30).run()
+
+        with open(path, mode="r", encoding="utf-8") as f:
+            self.assertEqual([row[0] for row in csv.reader(f)], ["Date", "2999-01-01"])
+
+    def test_missing_directories_ignored(self):
+        missing = os.path.join(self._tmp.name, "missing")
+        LogMaintenance(missing, missing).run()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
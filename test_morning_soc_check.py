@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test script for the morning SOC check's prediction lookup.
+
+Usage:
+  python test_morning_soc_check.py
+"""
+
+import csv
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from morning_soc_check import get_last_night_prediction, variance_status  # noqa: E402
+
+
+class TestLastNightPrediction(unittest.TestCase):
+    """Tests for finding today's row in predictions.csv."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.predictions_file = os.path.join(self._tmp.name, "predictions.csv")
+
+    def _write_rows(self, header, rows):
+        with open(self.predictions_file, mode="w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+
+    def test_latest_row_for_date_returned(self):
+        self._write_rows(
+            ["Prediction Date", "Target SOC (%)", "Charge Rate Set (%)"],
+            [["2025-11-01", 60, 40], ["2025-11-02", 70, 50], ["2025-11-02", 80, 60]],
+        )
+
+        prediction = get_last_night_prediction(self.predictions_file, "2025-11-02")
+        self.assertEqual(
+            prediction,
+            {"Prediction Date": "2025-11-02", "Target SOC (%)": "80", "Charge Rate Set (%)": "60"},
+        )
+        self.assertEqual(
+            get_last_night_prediction(self.predictions_file, "2025-11-01")["Target SOC (%)"], "60"
+        )
+
+    def test_missing_date_or_file_returns_none(self):
+        self.assertIsNone(get_last_night_prediction(self.predictions_file, "2025-11-02"))
+
+        self._write_rows(["Prediction Date", "Target SOC (%)"], [["2025-11-01", 60]])
+        self.assertIsNone(get_last_night_prediction(self.predictions_file, "2025-11-02"))
+
+
+class TestVarianceStatus(unittest.TestCase):
+    """Tests for classifying the morning SOC variance."""
+
+    def test_status_bands(self):
+        expected = [
+            (0, "Excellent"),
+            (-5, "Excellent"),
+            (7.5, "Good"),
+            (-15, "Fair"),
+            (15.1, "Poor"),
+        ]
+        for variance, status in expected:
+            self.assertEqual(variance_status(variance)[1], status, msg=f"variance {variance}")
+        self.assertEqual(variance_status(-20), (None, "Poor", "✗"))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -50,7 +50,10 @@ def test_providers():
             providers=providers_config.providers,
             primary_provider=providers_config.primary_provider,
         )
-        print(f"   ✓ Initialized {len(manager.providers)} provider(s)")
+        print(
+            f"   ✓ Initialized primary provider {manager.primary_provider_name} "
+            f"({len(manager.provider_names)} configured)"
+        )
 
         # Test connections
         print("\n3. Testing provider connections...")
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Test script for Solcast forecast parsing.
+
+Runs entirely offline: get_forecast() is replaced with a canned response.
+
+Usage:
+  python test_solcast_provider.py
+"""
+
+import os
+import sys
+import threading
+import unittest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.forecast_providers import NetworkError, RateLimitError, solcast  # noqa: E402
+from modules.forecast_providers.solcast import SolcastProvider  # noqa: E402
+from modules.http_session import parse_retry_after  # noqa: E402
+
+SAMPLE_RESPONSE = {
+    "forecasts": [
+        {"period_end": "2025-11-01T23:30:00.0000000Z", "pv_estimate": 0.0},
+        {"period_end": "2025-11-02T11:30:00.0000000Z", "pv_estimate": 2.0},
+        {"period_end": "2025-11-02T12:00:00.0000000Z", "pv_estimate": 3.0},
+        {"period_end": "2025-11-03T12:00:00.0000000Z", "pv_estimate": 4.0},
+    ]
+}
+
+
+def make_provider():
+    config = SimpleNamespace(
+        api_key="test-key",
+        resource_id="abcd-1234",
+        latitude=51.5,
+        longitude=-0.1,
+        azimuth=0,
+        declination=30,
+        kwp=5.8,
+    )
+    return SolcastProvider(config)
+
+
+class TestSolcastParsing(unittest.TestCase):
+    """Tests for filtering Solcast periods by date."""
+
+    def setUp(self):
+        self.provider = make_provider()
+        patcher = patch.object(self.provider, "get_forecast", return_value=SAMPLE_RESPONSE)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_daily_total_sums_target_date_periods(self):
+        self.assertEqual(self.provider.get_forecast_for_date(datetime(2025, 11, 2)), 2500.0)
+
+    def test_hourly_forecast_averages_half_hours(self):
+        hourly = self.provider.get_hourly_forecast_for_date(datetime(2025, 11, 2))
+        self.assertEqual(
+            hourly,
+            {
+                datetime(2025, 11, 2, 11, tzinfo=timezone.utc): 2000.0,
+                datetime(2025, 11, 2, 12, tzinfo=timezone.utc): 3000.0,
+            },
+        )
+
+    def test_hourly_forecast_is_mean_of_all_periods(self):
+        response = {
+            "forecasts": [
+                {"period_end": "2025-11-02T12:00:00.0000000Z", "pv_estimate": 1.0},
+                {"period_end": "2025-11-02T12:20:00.0000000Z", "pv_estimate": 2.0},
+                {"period_end": "2025-11-02T12:40:00.0000000Z", "pv_estimate": 6.0},
+            ]
+        }
+        with patch.object(self.provider, "get_forecast", return_value=response):
+            hourly = self.provider.get_hourly_forecast_for_date(datetime(2025, 11, 2))
+            index = self.provider._indexed[1]
+            self.provider.get_forecast_for_date(datetime(2025, 11, 2))
+
+        self.assertIs(self.provider._indexed[1], index)
+        self.assertEqual(hourly, {datetime(2025, 11, 2, 12, tzinfo=timezone.utc): 3000.0})
+
+
+class TestSolcastCaching(unittest.TestCase):
+    """Tests that repeated lookups reuse one Solcast response."""
+
+    def setUp(self):
+        solcast.FORECAST_MEMO.clear()
+        self.addCleanup(solcast.FORECAST_MEMO.clear)
+
+    def test_daily_and_hourly_share_one_request(self):
+        provider = make_provider()
+        with patch.object(solcast, "can_make_calls", return_value=(True, "OK")):
+            with patch.object(provider, "_make_request", return_value=SAMPLE_RESPONSE) as request:
+                provider.get_forecast_for_date(datetime(2025, 11, 2))
+                provider.get_hourly_forecast_for_date(datetime(2025, 11, 2))
+                self.assertTrue(provider.has_cached_forecast())
+
+        request.assert_called_once()
+
+    def test_force_refresh_bypasses_memo(self):
+        provider = make_provider()
+        with patch.object(solcast, "can_make_calls", return_value=(True, "OK")):
+            with patch.object(provider, "_make_request", return_value=SAMPLE_RESPONSE) as request:
+                provider.get_forecast()
+                provider.get_forecast(force_refresh=True)
+                provider.get_forecast()
+
+        self.assertEqual(request.call_count, 2)
+
+
+class TestSolcastCombinedForecast(unittest.TestCase):
+    """Tests for fetching and combining multiple Solcast resources."""
+
+    def test_resources_fetched_concurrently_and_summed(self):
+        provider = make_provider()
+        provider.resource_ids = ["east", "west"]
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fetch(resource_id):
+            barrier.wait()  # only trips if both resources are in flight together
+            pv = 1.0 if resource_id == "east" else 2.0
+            return {
+                "forecasts": [{"period_end": "2025-11-02T12:00:00.0000000Z", "pv_estimate": pv}]
+            }
+
+        with patch.object(provider, "_get_resource_forecast", side_effect=fetch):
+            combined = provider._get_combined_forecast()
+
+        self.assertEqual(combined["forecasts"][0]["pv_estimate"], 3.0)
+
+    def test_misaligned_resources_merged_by_period(self):
+        provider = make_provider()
+        provider.resource_ids = ["east", "west"]
+        forecasts = {
+            "east": {"forecasts": SAMPLE_RESPONSE["forecasts"][1:3]},
+            "west": {"forecasts": SAMPLE_RESPONSE["forecasts"][2:4]},
+        }
+
+        with patch.object(provider, "_get_resource_forecast", side_effect=forecasts.get):
+            combined = provider._get_combined_forecast()["forecasts"]
+
+        self.assertEqual(
+            [(entry["period_end"][:16], entry["pv_estimate"]) for entry in combined],
+            [("2025-11-02T11:30", 2.0), ("2025-11-02T12:00", 6.0), ("2025-11-03T12:00", 4.0)],
+        )
+
+
+class TestSolcastRetry(unittest.TestCase):
+    """Tests for retrying transient Solcast request failures."""
+
+    def setUp(self):
+        self.provider = make_provider()
+        patcher = patch.object(solcast.time, "sleep")
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_transient_errors_retried_with_backoff(self):
+        failures = [NetworkError("timeout", "Solcast"), NetworkError("HTTP 503", "Solcast", 503)]
+        with patch.object(
+            self.provider, "_send_request", side_effect=failures + [SAMPLE_RESPONSE]
+        ) as send:
+            self.assertIs(
+                self.provider._make_request("rooftop_sites/abcd/forecasts"), SAMPLE_RESPONSE
+            )
+
+        self.assertEqual(send.call_count, 3)
+        first, second = (call.args[0] for call in self.sleep.call_args_list)
+        self.assertTrue(1.0 <= first < 2.0 and 2.0 <= second < 3.0)
+
+    def test_client_errors_and_exhausted_quota_not_retried(self):
+        for error in (
+            NetworkError("HTTP 404", "Solcast", 404),
+            RateLimitError("quota", "Solcast"),
+            RateLimitError("quota", "Solcast", retry_after=3600),
+        ):
+            with patch.object(self.provider, "_send_request", side_effect=error) as send:
+                with self.assertRaises(type(error)):
+                    self.provider._make_request("rooftop_sites/abcd/forecasts")
+            self.assertEqual(send.call_count, 1)
+        self.sleep.assert_not_called()
+
+    def test_short_retry_after_is_honoured(self):
+        error = RateLimitError("busy", "Solcast", retry_after=5)
+        with patch.object(self.provider, "_send_request", side_effect=[error, SAMPLE_RESPONSE]):
+            self.provider._make_request("rooftop_sites/abcd/forecasts")
+
+        self.assertTrue(5.0 <= self.sleep.call_args.args[0] < 6.0)
+
+    def test_invalid_json_raises_network_error(self):
+        response = MagicMock(status_code=200, headers={}, content=b"<html>")
+        response.json.side_effect = solcast.requests.exceptions.JSONDecodeError("bad", "<html>", 0)
+        with patch.object(solcast.HTTP_SESSION, "get", return_value=response):
+            with patch.object(solcast, "record_api_call"):
+                with self.assertRaises(NetworkError):
+                    self.provider._send_request("rooftop_sites/abcd/forecasts")
+
+    def test_retry_after_header_parsing(self):
+        parse = parse_retry_after
+        self.assertEqual(parse("30"), 30.0)
+        self.assertEqual(parse("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+        self.assertIsNone(parse("soon"))
+        self.assertIsNone(parse(None))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)